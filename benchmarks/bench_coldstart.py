@@ -0,0 +1,53 @@
+"""Measure the cold start of importing the parser and the first parse.
+
+Run with ``python benchmarks/bench_coldstart.py [runs]``. Each run starts a
+fresh interpreter, so nothing is cached in ``sys.modules``; the median of the
+runs is reported, along with the number of rootsy modules the parse imported.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+# Runs in the fresh interpreter; prints its timings as JSON.
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from rootsy.parser import parse_gedcom
+imported = time.perf_counter()
+parse_gedcom(b"0 HEAD\\n1 GEDC\\n2 VERS 5.5.1\\n0 @I1@ INDI\\n1 NAME A /B/\\n"
+             b"1 BIRT\\n2 DATE 1 JAN 1900\\n0 TRLR\\n")
+parsed = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "first_parse": parsed - imported,
+    "modules": sum(name.startswith("rootsy") for name in sys.modules),
+}))
+"""
+
+
+def run_once() -> dict[str, float]:
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", PROBE],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    results = [run_once() for _ in range(runs)]
+
+    for key in ("import", "first_parse"):
+        median = statistics.median(result[key] for result in results)
+        sys.stdout.write(f"{key:<12} {median * 1000:7.1f} ms\n")
+    total = statistics.median(r["import"] + r["first_parse"] for r in results)
+    sys.stdout.write(f"{'total':<12} {total * 1000:7.1f} ms\n")
+    sys.stdout.write(f"rootsy modules imported: {results[0]['modules']:g}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Compare the memory taken by a regular and a compact parse of a large tree.
+
+Run with ``python benchmarks/bench_memory.py [individuals]``. Allocations are
+traced with ``tracemalloc``, so parsing is several times slower than usual.
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from bench_parallel import synthetic_gedcom
+
+from rootsy.compact import measure_memory
+from rootsy.parser import parse_gedcom
+
+
+def main() -> None:
+    individuals = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    data = synthetic_gedcom(individuals)
+    sys.stdout.write(f"{individuals} individuals, {len(data) / 1e6:.1f} MB\n")
+    sys.stdout.write(
+        f"{'mode':<8} {'retained':>10} {'peak':>10} {'bytes/indi':>11} "
+        f"{'records/indi':>13}\n",
+    )
+
+    tracemalloc.start()
+    for compact in (False, True):
+        gc.collect()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+
+        structure = parse_gedcom(data, compact=compact)
+        retained, peak = tracemalloc.get_traced_memory()
+        retained -= before
+        peak -= before
+        report = measure_memory(structure)
+
+        sys.stdout.write(
+            f"{'compact' if compact else 'regular':<8} "
+            f"{retained / 1e6:8.1f}MB {peak / 1e6:8.1f}MB "
+            f"{retained / individuals:11.0f} {report.bytes_per_individual:13.0f}\n",
+        )
+        del structure, report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare serial, thread-pool and process-pool parsing of one large file.
+
+Run with ``python benchmarks/bench_parallel.py [individuals] [workers]``. Thread
+mode only scales on a free-threaded (3.13t) interpreter.
+"""
+
+import os
+import sys
+import sysconfig
+import time
+from collections.abc import Callable
+
+from rootsy.parallel import parse_gedcom_parallel
+from rootsy.parser import parse_gedcom
+
+
+def synthetic_gedcom(individuals: int) -> bytes:
+    lines = ["0 HEAD", "1 GEDC", "2 VERS 5.5.1", "1 CHAR UTF-8"]
+    for i in range(individuals):
+        lines += [
+            f"0 @I{i}@ INDI",
+            f"1 NAME Person{i} /Surname{i % 500}/",
+            f"2 GIVN Person{i}",
+            f"2 SURN Surname{i % 500}",
+            f"1 SEX {'MF'[i % 2]}",
+            "1 BIRT",
+            f"2 DATE {1 + i % 28} JAN {1800 + i % 200}",
+            "2 PLAC Springfield, Sangamon, Illinois, USA",
+            f"1 FAMC @F{i // 4}@",
+        ]
+    for f in range(individuals // 4):
+        lines += [f"0 @F{f}@ FAM", *(f"1 CHIL @I{4 * f + c}@" for c in range(4))]
+    lines.append("0 TRLR")
+    return "\n".join(lines).encode()
+
+
+def timed(label: str, parse: Callable[[], object], size: int) -> None:
+    started = time.perf_counter()
+    parse()
+    seconds = time.perf_counter() - started
+    sys.stdout.write(f"{label:<10} {seconds:7.2f}s {size / 1e6 / seconds:7.1f} MB/s\n")
+
+
+def main() -> None:
+    individuals = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.process_cpu_count()  # noqa: PLR2004
+    data = synthetic_gedcom(individuals)
+
+    gil = "disabled" if sysconfig.get_config_var("Py_GIL_DISABLED") else "enabled"
+    sys.stdout.write(
+        f"{individuals} individuals, {len(data) / 1e6:.1f} MB, "
+        f"{workers} workers, GIL {gil}\n",
+    )
+    timed("serial", lambda: parse_gedcom(data), len(data))
+    timed(
+        "thread",
+        lambda: parse_gedcom_parallel(data, mode="thread", workers=workers),
+        len(data),
+    )
+    timed(
+        "process",
+        lambda: parse_gedcom_parallel(data, mode="process", workers=workers),
+        len(data),
+    )
+
+
+if __name__ == "__main__":
+    main()
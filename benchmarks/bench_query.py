@@ -0,0 +1,57 @@
+"""Compare an indexed query with the equivalent handwritten loop.
+
+Run with ``python benchmarks/bench_query.py [individuals]``.
+"""
+
+import sys
+import time
+from collections.abc import Callable
+
+from rootsy.parser import parse_gedcom
+from rootsy.query import Born, StructureIndex, Surname, select
+
+
+def synthetic_gedcom(individuals: int) -> bytes:
+    lines = ["0 HEAD", "1 GEDC", "2 VERS 5.5.1"]
+    for i in range(individuals):
+        lines += [
+            f"0 @I{i}@ INDI",
+            f"1 NAME Person{i} /Surname{i % 5000}/",
+            f"1 SEX {'MF'[i % 2]}",
+            "1 BIRT",
+            f"2 DATE {1 + i % 28} JAN {1700 + i % 300}",
+        ]
+    lines.append("0 TRLR")
+    return "\n".join(lines).encode()
+
+
+def timed(label: str, query: Callable[[], list[object]]) -> None:
+    started = time.perf_counter()
+    found = query()
+    milliseconds = (time.perf_counter() - started) * 1000
+    sys.stdout.write(f"{label:<14} {milliseconds:9.2f} ms {len(found):7} found\n")
+
+
+def main() -> None:
+    individuals = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    structure = parse_gedcom(synthetic_gedcom(individuals))
+    index = StructureIndex(structure)
+    query = Surname("Surname42") & Born(1800, 1850)
+
+    timed(
+        "loop",
+        lambda: [
+            individual
+            for individual in structure.individuals.values()
+            if individual.name.endswith("/Surname42/")
+            and any(1800 <= event.date.year <= 1850 for event in individual.events)  # noqa: PLR2004
+        ],
+    )
+    timed("first query", lambda: list(select(index, query)))
+    timed(
+        "indexed", lambda: list(select(index, Surname("Surname7") & Born(1800, 1850)))
+    )
+
+
+if __name__ == "__main__":
+    main()
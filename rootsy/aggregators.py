@@ -0,0 +1,337 @@
+"""Summary statistics gathered in one streaming pass over a GEDCOM file.
+
+Each aggregator sees every level-0 record group once, as ``GedcomReader``
+yields it, and keeps only its own running state; no ``GedcomStructure`` is
+built. Aggregators with unbounded inputs, like surnames, use fixed-size
+sketches. Aggregators of separate shards of a file combine with ``merge``::
+
+    report = aggregate_gedcom("tree.ged")
+    report["surnames"]["top"]
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from typing import TYPE_CHECKING, Any, ClassVar, Protocol, Self
+
+from rootsy.dates import parse_date_range
+from rootsy.reader import GedcomReader
+from rootsy.registry import get_registry, is_extension_tag
+from rootsy.sketches import CountMinSketch, HyperLogLog
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from rootsy.reader import GedcomSource
+    from rootsy.types import GedcomLine
+
+
+class Aggregator(Protocol):
+    """One statistic, updated record by record."""
+
+    name: ClassVar[str]
+
+    def add(self, group: list[GedcomLine]) -> None:
+        """Update the statistic with a level-0 record group."""
+
+    def merge(self, other: Self) -> Self:
+        """Combine with the aggregator of another shard, leaving both as is."""
+        ...
+
+    def result(self) -> Any:  # noqa: ANN401
+        """Return the statistic as plain, JSON-serialisable values."""
+
+
+def _surname(group: list[GedcomLine]) -> str | None:
+    name = None
+    for line in group:
+        if line.tag == "SURN" and line.value:
+            return line.value
+        if line.tag == "NAME" and line.level == 1 and name is None:
+            name = line.value
+    if name and name.count("/") >= 2:  # noqa: PLR2004
+        return name.split("/")[1].strip() or None
+    return None
+
+
+class TagCounts:
+    """Number of records of each level-0 tag."""
+
+    name: ClassVar[str] = "records"
+
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+
+    def add(self, group: list[GedcomLine]) -> None:
+        self.counts[group[0].tag] += 1
+
+    def merge(self, other: TagCounts) -> TagCounts:
+        merged = TagCounts()
+        merged.counts = self.counts + other.counts
+        return merged
+
+    def result(self) -> dict[str, int]:
+        return dict(self.counts.most_common())
+
+
+class SurnameFrequencies:
+    """Most frequent surnames and the number of distinct ones, approximately.
+
+    Counts come from a count-min sketch, so they may be slightly high. The
+    ``capacity`` most frequent surnames seen so far are tracked as candidates
+    for the top list, with a min-heap to find the one a new surname may
+    replace; the distinct count comes from a HyperLogLog.
+    """
+
+    name: ClassVar[str] = "surnames"
+
+    def __init__(self, top: int = 20, capacity: int = 1000) -> None:
+        self.top = top
+        self.capacity = capacity
+        self.sketch = CountMinSketch()
+        self.distinct = HyperLogLog()
+        self.candidates: dict[str, int] = {}
+        # (estimate, surname) of the candidates. An entry is stale once its
+        # surname's estimate has grown or it was replaced; stale entries are
+        # skipped when they reach the top, and purged when they pile up.
+        self._heap: list[tuple[int, str]] = []
+
+    def _track(self, surname: str, estimate: int) -> None:
+        candidates, heap = self.candidates, self._heap
+        if surname not in candidates and len(candidates) >= self.capacity:
+            # Replace the least frequent candidate if the new surname beats it.
+            while candidates.get(heap[0][1]) != heap[0][0]:
+                heapq.heappop(heap)
+            if estimate <= heap[0][0]:
+                return
+            del candidates[heapq.heappop(heap)[1]]
+        candidates[surname] = estimate
+        heapq.heappush(heap, (estimate, surname))
+        if len(heap) > 4 * self.capacity:
+            self._heap = [(count, name) for name, count in candidates.items()]
+            heapq.heapify(self._heap)
+
+    def add(self, group: list[GedcomLine]) -> None:
+        if group[0].tag != "INDI" or (surname := _surname(group)) is None:
+            return
+        self.distinct.add(surname)
+        self._track(surname, self.sketch.add(surname))
+
+    def merge(self, other: SurnameFrequencies) -> SurnameFrequencies:
+        merged = SurnameFrequencies(self.top, self.capacity)
+        merged.sketch = self.sketch.merge(other.sketch)
+        merged.distinct = self.distinct.merge(other.distinct)
+        for surname in {*self.candidates, *other.candidates}:
+            merged._track(surname, merged.sketch.estimate(surname))
+        return merged
+
+    def result(self) -> dict[str, Any]:
+        return {
+            "total": self.sketch.total,
+            "distinct": self.distinct.count(),
+            "top": heapq.nlargest(
+                self.top,
+                self.candidates.items(),
+                key=lambda item: item[1],
+            ),
+        }
+
+
+class SexRatio:
+    """Individuals by SEX value, and males per 100 females."""
+
+    name: ClassVar[str] = "sex"
+
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+
+    def add(self, group: list[GedcomLine]) -> None:
+        if group[0].tag != "INDI":
+            return
+        sex = next(
+            (line.value for line in group if line.tag == "SEX" and line.level == 1),
+            "",
+        )
+        self.counts[sex.upper() or "U"] += 1
+
+    def merge(self, other: SexRatio) -> SexRatio:
+        merged = SexRatio()
+        merged.counts = self.counts + other.counts
+        return merged
+
+    def result(self) -> dict[str, Any]:
+        females = self.counts["F"]
+        return {
+            "counts": dict(self.counts),
+            "ratio": 100 * self.counts["M"] / females if females else None,
+        }
+
+
+class DateCoverage:
+    """How many events of each tag are dated, to the day or less precisely.
+
+    Also keeps the earliest and latest year seen.
+    """
+
+    name: ClassVar[str] = "dates"
+
+    EVENT_TAGS: ClassVar[frozenset[str]] = frozenset(
+        {"BIRT", "BAPM", "CHR", "DEAT", "BURI", "MARR", "DIV"},
+    )
+
+    def __init__(self) -> None:
+        # Per event tag: [events, dated, exact to the day]
+        self.counts: dict[str, list[int]] = {}
+        self.first_year: int | None = None
+        self.last_year: int | None = None
+
+    def add(self, group: list[GedcomLine]) -> None:
+        current = None
+        for line in group[1:]:
+            if line.level == 1:
+                current = None
+                if line.tag in self.EVENT_TAGS:
+                    current = self.counts.setdefault(line.tag, [0, 0, 0])
+                    current[0] += 1
+            elif current is not None and line.level == 2 and line.tag == "DATE":  # noqa: PLR2004
+                if (date_range := parse_date_range(line.value)) is None:
+                    continue
+                current[1] += 1
+                current[2] += date_range.is_exact
+                for packed in (date_range.start, date_range.end):
+                    if packed:
+                        self._see_year(packed // 10_000)
+
+    def _see_year(self, year: int) -> None:
+        if self.first_year is None or year < self.first_year:
+            self.first_year = year
+        if self.last_year is None or year > self.last_year:
+            self.last_year = year
+
+    def merge(self, other: DateCoverage) -> DateCoverage:
+        merged = DateCoverage()
+        for tag in {*self.counts, *other.counts}:
+            mine, theirs = self.counts.get(tag, [0] * 3), other.counts.get(tag, [0] * 3)
+            merged.counts[tag] = [a + b for a, b in zip(mine, theirs, strict=True)]
+        for year in (
+            self.first_year,
+            self.last_year,
+            other.first_year,
+            other.last_year,
+        ):
+            if year is not None:
+                merged._see_year(year)
+        return merged
+
+    def result(self) -> dict[str, Any]:
+        return {
+            "events": {
+                tag: {"total": total, "dated": dated, "exact": exact}
+                for tag, (total, dated, exact) in sorted(self.counts.items())
+            },
+            "first_year": self.first_year,
+            "last_year": self.last_year,
+        }
+
+
+class FamilySizes:
+    """Distribution of the number of children per family."""
+
+    name: ClassVar[str] = "family_sizes"
+
+    def __init__(self) -> None:
+        self.counts: Counter[int] = Counter()
+
+    def add(self, group: list[GedcomLine]) -> None:
+        if group[0].tag == "FAM":
+            self.counts[
+                sum(line.tag == "CHIL" and line.level == 1 for line in group)
+            ] += 1
+
+    def merge(self, other: FamilySizes) -> FamilySizes:
+        merged = FamilySizes()
+        merged.counts = self.counts + other.counts
+        return merged
+
+    def result(self) -> dict[str, Any]:
+        families = self.counts.total()
+        children = sum(size * count for size, count in self.counts.items())
+        return {
+            "distribution": dict(sorted(self.counts.items())),
+            "mean": children / families if families else None,
+        }
+
+
+class UnhandledTags:
+    """Records no parser handles, and extension tags anywhere, by tag."""
+
+    name: ClassVar[str] = "unhandled_tags"
+
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+
+    def add(self, group: list[GedcomLine]) -> None:
+        tag = group[0].tag
+        if tag not in ("HEAD", "TRLR") and (
+            get_registry().get_parser_class(tag) is None
+        ):
+            self.counts[tag] += 1
+        self.counts.update(line.tag for line in group[1:] if is_extension_tag(line.tag))
+
+    def merge(self, other: UnhandledTags) -> UnhandledTags:
+        merged = UnhandledTags()
+        merged.counts = self.counts + other.counts
+        return merged
+
+    def result(self) -> dict[str, int]:
+        return dict(self.counts.most_common())
+
+
+DEFAULT_AGGREGATORS: tuple[Callable[[], Aggregator], ...] = (
+    TagCounts,
+    SurnameFrequencies,
+    SexRatio,
+    DateCoverage,
+    FamilySizes,
+    UnhandledTags,
+)
+
+
+def aggregate(
+    groups: Iterable[list[GedcomLine]],
+    aggregators: Sequence[Aggregator] | None = None,
+) -> Sequence[Aggregator]:
+    """Feed every record group to every aggregator, in a single pass."""
+    if aggregators is None:
+        aggregators = [factory() for factory in DEFAULT_AGGREGATORS]
+    for group in groups:
+        for aggregator in aggregators:
+            aggregator.add(group)
+    return aggregators
+
+
+def merge_shards(shards: Iterable[Sequence[Aggregator]]) -> list[Aggregator]:
+    """Combine the aggregators of several shards, position by position."""
+    merged: list[Aggregator] | None = None
+    for shard in shards:
+        if merged is None:
+            merged = list(shard)
+        else:
+            merged = [
+                mine.merge(theirs) for mine, theirs in zip(merged, shard, strict=True)
+            ]
+    return merged or []
+
+
+def report(aggregators: Iterable[Aggregator]) -> dict[str, Any]:
+    """Collect the results of aggregators by name."""
+    return {aggregator.name: aggregator.result() for aggregator in aggregators}
+
+
+def aggregate_gedcom(
+    source: GedcomSource,
+    aggregators: Sequence[Aggregator] | None = None,
+) -> dict[str, Any]:
+    """Read a GEDCOM file once and report every aggregator's result."""
+    return report(aggregate(GedcomReader(source).line_groups(), aggregators))
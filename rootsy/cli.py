@@ -0,0 +1,364 @@
+"""``rootsy`` command-line tool for parsing batches of GEDCOM files."""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+import attrs
+
+from rootsy.models.stucture import serialize_value
+from rootsy.parser import add_record, parse_record
+from rootsy.probe import NotGedcomError
+from rootsy.reader import GedcomReader
+from rootsy.validation import LinkIndex, check_links
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from rootsy.models import GedcomStructure
+
+GEDCOM_SUFFIXES = (".ged", ".gdz", ".ged.gz", ".ged.bz2", ".ged.xz")
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class FileReport:
+    """Outcome of parsing one file."""
+
+    path: str
+    size_bytes: int = 0
+    seconds: float = 0.0
+    individuals: int = 0
+    families: int = 0
+    issues: int | None = None
+    error: str | None = None
+    # (tag, xref, JSON) rows, only collected when writing output.
+    records: tuple[tuple[str, str, str], ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def throughput(self) -> float:
+        """Megabytes parsed per second."""
+        return self.size_bytes / 1_000_000 / self.seconds if self.seconds else 0.0
+
+
+def _record_rows(structure: GedcomStructure) -> tuple[tuple[str, str, str], ...]:
+    records = [*structure.individuals.values(), *structure.families.values()]
+    return tuple(
+        (
+            record.tag,
+            record.id,
+            json.dumps(
+                attrs.asdict(record, value_serializer=serialize_value), default=str
+            ),
+        )
+        for record in records
+    )
+
+
+def _parse_file(
+    path: str,
+    links: LinkIndex | None,
+    deadline: float | None,
+) -> GedcomStructure:
+    """Parse a file, collecting its links on the way when ``links`` is given.
+
+    The deadline is checked between records, so it can be overrun by as long
+    as one record takes to read and parse.
+    """
+    structure = None
+    for group in GedcomReader(path).line_groups():
+        if deadline is not None and time.monotonic() >= deadline:
+            msg = "gave up before the end of the file"
+            raise TimeoutError(msg)
+        if group[0].tag == "TRLR":
+            break
+        if structure is None and group[0].tag != "HEAD":
+            raise NotGedcomError
+        if links is not None:
+            links.add_group(group)
+
+        schema = structure.header.schema if structure else None
+        if (record := parse_record(group, schema=schema)) is not None:
+            structure = add_record(structure, record)
+    if structure is None:
+        raise NotGedcomError
+    return structure
+
+
+def process_file(
+    path: str,
+    *,
+    validate: bool,
+    collect: bool,
+    timeout: float | None = None,
+) -> FileReport:
+    """Parse a single file; errors are reported rather than raised.
+
+    A file still being parsed ``timeout`` seconds after it was started is given
+    up on, and reported as a failure. The timeout is cooperative: it is checked
+    between records, not while one is being parsed.
+    """
+    started = time.perf_counter()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    links = LinkIndex() if validate else None
+    try:
+        structure = _parse_file(path, links, deadline)
+        issues = len(check_links(links)) if links is not None else None
+    except Exception as error:  # noqa: BLE001
+        return FileReport(
+            path=path,
+            seconds=time.perf_counter() - started,
+            error=f"{type(error).__name__}: {error}",
+        )
+
+    return FileReport(
+        path=path,
+        size_bytes=Path(path).stat().st_size,
+        seconds=time.perf_counter() - started,
+        individuals=len(structure.individuals),
+        families=len(structure.families),
+        issues=issues,
+        records=_record_rows(structure) if collect else (),
+    )
+
+
+def expand_inputs(inputs: Iterable[str]) -> list[str]:
+    """Resolve files, directories (searched recursively) and glob patterns."""
+    paths: list[str] = []
+    for item in inputs:
+        if glob.has_magic(item):
+            paths.extend(sorted(glob.glob(item, recursive=True)))  # noqa: PTH207
+        elif (path := Path(item)).is_dir():
+            paths.extend(
+                str(found)
+                for found in sorted(path.rglob("*"))
+                if found.is_file() and found.name.lower().endswith(GEDCOM_SUFFIXES)
+            )
+        else:
+            paths.append(item)
+    return list(dict.fromkeys(paths))
+
+
+class _SerialExecutor(Executor):
+    """Runs tasks in the calling process, for ``--jobs 1``."""
+
+    def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Future:  # noqa: ANN401
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as error:  # noqa: BLE001
+            future.set_exception(error)
+        return future
+
+
+def run_batch(
+    paths: Sequence[str],
+    *,
+    executor: Executor,
+    validate: bool = False,
+    collect: bool = False,
+    timeout: float | None = None,
+) -> Iterator[FileReport]:
+    """Parse files concurrently, yielding each report as its file finishes.
+
+    ``timeout`` bounds the time spent parsing each file, see ``process_file``.
+    """
+    futures = [
+        executor.submit(
+            process_file,
+            path,
+            validate=validate,
+            collect=collect,
+            timeout=timeout,
+        )
+        for path in paths
+    ]
+    for future in as_completed(futures):
+        yield future.result()
+
+
+def write_ndjson(reports: Iterable[FileReport], output: TextIO) -> None:
+    # Records were serialised in the workers; only the envelope is built here.
+    for report in reports:
+        output.writelines(
+            f'{{"file": {json.dumps(report.path)}, "tag": "{tag}", '
+            f'"xref": {json.dumps(xref)}, "data": {data}}}\n'
+            for tag, xref, data in report.records
+        )
+
+
+def write_sqlite(reports: Iterable[FileReport], path: Path) -> None:
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS records "
+            "(file TEXT, tag TEXT, xref TEXT, data TEXT)",
+        )
+        for report in reports:
+            connection.executemany(
+                "INSERT INTO records VALUES (?, ?, ?, ?)",
+                ((report.path, *record) for record in report.records),
+            )
+    connection.close()
+
+
+def _logged(
+    reports: Iterable[FileReport],
+    log: TextIO,
+    *,
+    each: bool,
+    finished: list[FileReport],
+) -> Iterator[FileReport]:
+    """Pass reports through, logging them and keeping them without records."""
+    for report in reports:
+        if each:
+            log.write(format_report(report) + "\n")
+        finished.append(attrs.evolve(report, records=()))
+        yield report
+
+
+def format_report(report: FileReport) -> str:
+    if not report.ok:
+        return f"{report.path}: FAILED {report.error}"
+
+    line = (
+        f"{report.path}: {report.individuals} individuals, "
+        f"{report.families} families in {report.seconds:.2f}s "
+        f"({report.throughput:.1f} MB/s)"
+    )
+    if report.issues is not None:
+        line += f", {report.issues} integrity issues"
+    return line
+
+
+def format_summary(reports: Sequence[FileReport], seconds: float) -> str:
+    parsed = [report for report in reports if report.ok]
+    size = sum(report.size_bytes for report in parsed)
+    return (
+        f"{len(parsed)} files parsed, {len(reports) - len(parsed)} failed: "
+        f"{sum(report.individuals for report in parsed)} individuals, "
+        f"{sum(report.families for report in parsed)} families, "
+        f"{size / 1_000_000:.1f} MB in {seconds:.2f}s "
+        f"({size / 1_000_000 / seconds if seconds else 0.0:.1f} MB/s)"
+    )
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="rootsy",
+        description="Parse GEDCOM files in parallel and report on them.",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="GEDCOM files, directories or glob patterns",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.process_cpu_count(),
+        help="number of workers (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--executor",
+        choices=("process", "thread"),
+        default="process",
+        help="run workers as processes, or as threads, which avoids pickling "
+        "and scales on free-threaded Python builds (default: process)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="write parsed records to an NDJSON file or, for .sqlite/.db, "
+        "an SQLite database; '-' writes NDJSON to stdout",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="check referential integrity of each file",
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="only print the totals, not a line per file",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="give up on each file not parsed within this many seconds; "
+        "checked between records",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_argument_parser().parse_args(argv)
+    paths = expand_inputs(args.inputs)
+    collect = args.output is not None
+    # Keep stdout for records when they are written there.
+    log = sys.stderr if str(args.output) == "-" else sys.stdout
+
+    started = time.perf_counter()
+    executor: Executor
+    if args.jobs == 1:
+        executor = _SerialExecutor()
+    elif args.executor == "thread":
+        executor = ThreadPoolExecutor(args.jobs)
+    else:
+        executor = ProcessPoolExecutor(args.jobs)
+    # Reports are written out as they arrive; only their counts are kept.
+    reports: list[FileReport] = []
+    try:
+        stream = _logged(
+            run_batch(
+                paths,
+                executor=executor,
+                validate=args.validate,
+                collect=collect,
+                timeout=args.timeout,
+            ),
+            log,
+            each=not args.summary,
+            finished=reports,
+        )
+        if not collect:
+            for _ in stream:
+                pass
+        elif str(args.output) == "-":
+            write_ndjson(stream, sys.stdout)
+        elif args.output.suffix.lower() in SQLITE_SUFFIXES:
+            write_sqlite(stream, args.output)
+        else:
+            with args.output.open("w", encoding="utf-8") as output:
+                write_ndjson(stream, output)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    seconds = time.perf_counter() - started
+
+    log.write(format_summary(reports, seconds) + "\n")
+
+    return 0 if all(report.ok for report in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
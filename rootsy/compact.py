@@ -0,0 +1,181 @@
+"""Memory-compact record storage for large trees."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING, Any
+
+import attrs
+
+from rootsy.models import Citation, Event, Family, Individual
+
+if TYPE_CHECKING:
+    from rootsy.models import GedcomStructure
+
+
+class StringPool:
+    """Hands out one shared instance for each distinct string value.
+
+    Unlike ``sys.intern`` the pool is owned by the caller, so its strings are
+    released together with the parsed tree.
+    """
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: str | None) -> str | None:
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def intern_all(self, values: Iterable[str]) -> tuple[str, ...]:
+        return tuple(self._strings.setdefault(value, value) for value in values)
+
+
+@attrs.define(slots=True)
+class Compactor:
+    """Turn freshly parsed records into their compact form.
+
+    Lists become tuples (every empty one being the shared ``()``), and the
+    strings that repeat across records (sex codes, name parts and xrefs, which
+    appear once as an id and again in every link) are interned. Equal
+    citations share one instance, however many records and events cite the
+    same source. Parsers given a compactor through ``ParsingContext`` build
+    their records in this form directly.
+    """
+
+    strings: StringPool = attrs.field(factory=StringPool)
+    _citations: dict[Citation, Citation] = attrs.field(factory=dict, init=False)
+
+    def citation(self, citation: Citation) -> Citation:
+        if (shared := self._citations.get(citation)) is None:
+            shared = self._citations[citation] = attrs.evolve(
+                citation,
+                xref=self.strings.intern(citation.xref),
+                page=self.strings.intern(citation.page),
+            )
+        return shared
+
+    def events(self, events: Iterable[Event]) -> tuple[Event, ...]:
+        return tuple(
+            attrs.evolve(event, citations=tuple(map(self.citation, event.citations)))
+            if event.citations
+            else event
+            for event in events
+        )
+
+    def individual_fields(self, fields: Mapping[str, Any]) -> dict[str, Any]:
+        """Compact the fields of an individual, before it is built from them."""
+        intern = self.strings.intern
+        return {
+            **fields,
+            "id": intern(fields["id"]),
+            "given_name": intern(fields.get("given_name")),
+            "surname": intern(fields.get("surname")),
+            "sex": intern(fields.get("sex")),
+            "events": self.events(fields.get("events", ())),
+            "families": self.strings.intern_all(fields.get("families", ())),
+            "parents": self.strings.intern_all(fields.get("parents", ())),
+            "citations": tuple(map(self.citation, fields.get("citations", ()))),
+            "extensions": tuple(fields.get("extensions", ())),
+        }
+
+    def family_fields(self, fields: Mapping[str, Any]) -> dict[str, Any]:
+        """Compact the fields of a family, before it is built from them."""
+        intern = self.strings.intern
+        return {
+            **fields,
+            "id": intern(fields["id"]),
+            "husband": intern(fields.get("husband")),
+            "wife": intern(fields.get("wife")),
+            "children": self.strings.intern_all(fields.get("children", ())),
+            "events": self.events(fields.get("events", ())),
+            "citations": tuple(map(self.citation, fields.get("citations", ()))),
+            "extensions": tuple(fields.get("extensions", ())),
+        }
+
+    def individual(self, individual: Individual) -> Individual:
+        return Individual(
+            **self.individual_fields(attrs.asdict(individual, recurse=False)),
+        )
+
+    def family(self, family: Family) -> Family:
+        return Family(**self.family_fields(attrs.asdict(family, recurse=False)))
+
+    def compact[Record](self, record: Record) -> Record:
+        match record:
+            case Individual():
+                return self.individual(record)
+            case Family():
+                return self.family(record)
+        return record
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class MemoryReport:
+    """Approximate resident size of a parsed tree."""
+
+    total_bytes: int
+    individual_bytes: int
+    family_bytes: int
+    individual_count: int
+    family_count: int
+
+    @property
+    def bytes_per_individual(self) -> float:
+        if not self.individual_count:
+            return 0.0
+        return self.individual_bytes / self.individual_count
+
+
+def deep_sizeof(obj: object, seen: set[int]) -> int:
+    """Size of an object and everything it references that isn't in ``seen``.
+
+    Objects are counted once, so shared strings and tuples only add to the
+    size of the first record that refers to them.
+    """
+    size = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+
+        if isinstance(current, str | bytes | int | float | bool | None):
+            continue
+        if isinstance(current, Mapping):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, list | tuple | set | frozenset):
+            stack.extend(current)
+        elif attrs.has(type(current)):
+            stack.extend(
+                getattr(current, field.name) for field in attrs.fields(type(current))
+            )
+    return size
+
+
+def measure_memory(structure: GedcomStructure) -> MemoryReport:
+    """Report how many bytes the records of a structure take up."""
+    seen: set[int] = set()
+    individual_bytes = sum(
+        deep_sizeof(individual, seen) for individual in structure.individuals.values()
+    )
+    family_bytes = sum(
+        deep_sizeof(family, seen) for family in structure.families.values()
+    )
+    containers = deep_sizeof(structure, seen)
+
+    return MemoryReport(
+        total_bytes=individual_bytes + family_bytes + containers,
+        individual_bytes=individual_bytes,
+        family_bytes=family_bytes,
+        individual_count=len(structure.individuals),
+        family_count=len(structure.families),
+    )
@@ -0,0 +1,603 @@
+"""Convert GEDCOM files between versions 5.5.1 and 7.0.
+
+Conversion streams through the file a block of records at a time, so memory
+use doesn't grow with the file. Blocks are scanned with a regex for lines
+that may change; only their records are tokenized and rewritten, and the
+rest is copied as text. Output is always UTF-8::
+
+    convert("tree-551.ged", "tree-70.ged", version="7.0")
+
+Going to 7.0, CONC lines are merged, shared notes become SNOTE records, CHAR,
+FILE and SUBN are dropped from the header and SUBN records removed, and
+calendar escapes, INT dates, age keywords and enumerations take their 7.0
+form. Going back to 5.5.1 reverses these, splits long values with CONC and
+keeps 7.0-only structures as extension tags, e.g. ``_UID``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import itertools
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, TextIO
+
+import attrs
+
+from rootsy.models.header import UnsupportedGedcomVersionError
+from rootsy.probe import NotGedcomError, read_header
+from rootsy.reader import GedcomReader, merge_continuations, tokenize
+from rootsy.types import GedcomLine, is_pointer
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable, Iterator, Sequence
+
+    from rootsy.reader import GedcomSource
+
+type Converter = Callable[[list[GedcomLine]], list[GedcomLine]]
+
+V551 = "5.5.1"
+V7 = "7.0"
+# The 7.0 pointer to no record.
+VOID = "@VOID@"
+# Longest line 5.5.1 allows, in characters; longer values are split with CONC.
+MAX_LINE_LENGTH = 255
+
+# HEAD substructures 7.0 doesn't have, as tag paths below HEAD.
+REMOVED_HEAD_PATHS = frozenset({("CHAR",), ("FILE",), ("SUBN",), ("GEDC", "FORM")})
+# Tags only 7.0 defines; 5.5.1 output keeps them as extension tags.
+V7_ONLY_TAGS = frozenset(
+    {
+        "CREA",
+        "CROP",
+        "EXID",
+        "HEIGHT",
+        "INIL",
+        "LEFT",
+        "MIME",
+        "NO",
+        "PHRASE",
+        "SDATE",
+        "TOP",
+        "TRAN",
+        "UID",
+        "WIDTH",
+    },
+)
+# Enumerations 7.0 writes in upper case and 5.5.1 in lower case.
+ENUMERATION_TAGS = frozenset({"PEDI", "MEDI", "RESN"})
+
+CALENDARS_V7 = {
+    "GREGORIAN": "GREGORIAN",
+    "JULIAN": "JULIAN",
+    "HEBREW": "HEBREW",
+    "FRENCH R": "FRENCH_R",
+}
+CALENDARS_V551 = {keyword: escape for escape, keyword in CALENDARS_V7.items()}
+
+# Age keywords of 5.5.1, and the age and phrase that replace them in 7.0.
+AGE_KEYWORDS = {
+    "CHILD": "< 8y",
+    "INFANT": "< 1y",
+    "STILLBORN": "0y",
+}
+
+MEDIA_TYPES = {
+    "bmp": "image/bmp",
+    "gif": "image/gif",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "tif": "image/tiff",
+    "tiff": "image/tiff",
+    "pdf": "application/pdf",
+    "mp3": "audio/mpeg",
+    "wav": "audio/wav",
+    "mp4": "video/mp4",
+    "htm": "text/html",
+    "html": "text/html",
+    "txt": "text/plain",
+}
+FILE_FORMATS = {media_type: form for form, media_type in reversed(MEDIA_TYPES.items())}
+
+_CALENDAR_ESCAPE = re.compile(r"@#D([A-Z ]+)@\s*")
+_CALENDAR_KEYWORD = re.compile(r"\b(GREGORIAN|JULIAN|HEBREW|FRENCH_R)\s+")
+_DUAL_YEAR = re.compile(r"\b(\d{1,4})/(\d{2})\b")
+_INTERPRETED = re.compile(r"INT\s+(.*?)\s*\((.*)\)")
+_PHRASE_ONLY = re.compile(r"\((.*)\)")
+_AGE_PART = re.compile(r"(\d+)\s*([ymwd])")
+
+# Lines that may need rewriting. Records without any are copied as they are,
+# which saves tokenizing most of them; false positives only cost the time to
+# rewrite a record unchanged. Separate patterns with literal prefixes scan
+# much faster than one with many alternatives.
+_REWRITTEN_V7 = (
+    re.compile(
+        r"\n(?:0 +@[^@\n]+@ +(?:NOTE|SUBN)\b|[0-9]+ +(?:"
+        r"(?:CONC|EMAI|SUBN|PEDI|MEDI|RESN|FORM)\b"
+        r"|NOTE +@"
+        r"|SOUR +(?!@)"
+        r"|DATE [^\n]*(?:@#D|INT|[(/a-z]|B\.C\.)"
+        r"|AGE +(?:CHILD|INFANT|STILLBORN)"
+        r"))",
+    ),
+    re.compile(r"@@"),
+)
+_REWRITTEN_V551 = (
+    re.compile(
+        r"\n[0-9]+ +(?:@[^@\n]+@ +)?(?:"
+        rf"(?:EMAIL|SNOTE|PEDI|MEDI|RESN|FORM|{'|'.join(sorted(V7_ONLY_TAGS))})\b"
+        r"|DATE [^\n]*(?:GREGORIAN|JULIAN|HEBREW|FRENCH_R|BCE)"
+        r"|AGE [^\n]*w"
+        r")"
+        rf"|\n[^\n]{{{MAX_LINE_LENGTH + 1}}}",
+    ),
+    re.compile(VOID),
+    # An "@" between two other characters, which isn't part of a pointer.
+    re.compile(r"@(?=[^\n ])(?<=[^\n ]@)"),
+)
+# Where each record starts, after the first.
+_RECORD_BREAK = "\n0 "
+
+
+def _line(level: int, tag: str, value: str = "", xref: str | None = None) -> GedcomLine:
+    return GedcomLine(level=level, tag=tag, value=value, xref=xref)
+
+
+def date_to_v7(value: str) -> tuple[str, str | None]:
+    """Convert a 5.5.1 DATE value to 7.0, with the text for a PHRASE if any.
+
+    Dates 7.0 can't express, such as dual years or unknown calendars, keep
+    the nearest 7.0 date and the original text as the phrase.
+    """
+    value = value.strip()
+    if match := _PHRASE_ONLY.fullmatch(value):
+        return "", match.group(1)
+    phrase = None
+    if match := _INTERPRETED.fullmatch(value):
+        value, phrase = match.groups()
+    if any(
+        escape.strip() not in CALENDARS_V7 for escape in _CALENDAR_ESCAPE.findall(value)
+    ):
+        return "", phrase or value
+
+    def calendar(match: re.Match[str]) -> str:
+        return CALENDARS_V7.get(match.group(1).strip(), "") + " "
+
+    date = _CALENDAR_ESCAPE.sub(calendar, value.upper()).replace("B.C.", "BCE")
+    if (dual := _DUAL_YEAR.sub(lambda m: str(int(m.group(1)) + 1), date)) != date:
+        date, phrase = dual, phrase or " ".join(date.split())
+    return " ".join(date.split()), phrase
+
+
+def date_to_v551(value: str, phrase: str | None) -> tuple[str, bool]:
+    """Convert a 7.0 DATE value to 5.5.1, and whether the phrase was used."""
+
+    def escape(match: re.Match[str]) -> str:
+        calendar = CALENDARS_V551[match.group(1)]
+        return "" if calendar == "GREGORIAN" else f"@#D{calendar}@ "
+
+    date = _CALENDAR_KEYWORD.sub(escape, value.strip()).replace("BCE", "B.C.")
+    if phrase is None:
+        return date, False
+    if not date:
+        return f"({phrase})", True
+    # Only a single date can be interpreted; ranges and periods lose it.
+    if not date.startswith(("ABT", "CAL", "EST", "BEF", "AFT", "BET", "FROM", "TO")):
+        return f"INT {date} ({phrase})", True
+    return date, False
+
+
+def age_to_v551(value: str, phrase: str | None) -> tuple[str, bool]:
+    """Convert a 7.0 AGE value to 5.5.1, and whether the phrase was used.
+
+    Weeks, which 5.5.1 doesn't have, are counted as days.
+    """
+    if phrase and AGE_KEYWORDS.get(phrase.upper()) == value.strip():
+        return phrase.upper(), True
+    parts = dict.fromkeys("ymd", 0)
+    for number, unit in _AGE_PART.findall(value):
+        if unit == "w":
+            parts["d"] += 7 * int(number)
+        else:
+            parts[unit] += int(number)
+    if "w" not in value:
+        return value, False
+    qualifier = value.strip()[0] if value.strip()[:1] in "<>" else ""
+    age = " ".join(f"{number}{unit}" for unit, number in parts.items() if number)
+    return f"{qualifier} {age}".strip(), False
+
+
+def _unescape_v7(value: str) -> str:
+    """Turn 5.5.1 "@@" escapes into 7.0's, which only escape a leading "@"."""
+    value = value.replace("@@", "@")
+    return f"@{value}" if value.startswith("@") else value
+
+
+def _escape_v551(value: str) -> str:
+    return (
+        value.removeprefix("@").replace("@", "@@")
+        if value.startswith("@@")
+        else value.replace("@", "@@")
+    )
+
+
+def _children(group: list[GedcomLine], index: int) -> Iterator[int]:
+    """Yield the indexes of the direct substructures of a line."""
+    level = group[index].level
+    for child in range(index + 1, len(group)):
+        if group[child].level <= level:
+            return
+        if group[child].level == level + 1:
+            yield child
+
+
+def _phrase_of(group: list[GedcomLine], index: int) -> int | None:
+    return next((i for i in _children(group, index) if group[i].tag == "PHRASE"), None)
+
+
+def _convert_v7(path: list[str], value: str) -> tuple[str, str, str | None]:
+    """Return the 7.0 tag, value and phrase of a 5.5.1 line at ``path``."""
+    tag = path[-1]
+    phrase = None
+    match tag:
+        case "EMAI":
+            tag = "EMAIL"
+        case "NOTE" if len(path) == 1 or is_pointer(value):
+            tag = "SNOTE"
+        case "DATE":
+            value, phrase = date_to_v7(value)
+        case "AGE" if value.strip().upper() in AGE_KEYWORDS:
+            phrase = value.strip().title()
+            value = AGE_KEYWORDS[value.strip().upper()]
+        case "FORM" if path[-2:-1] == ["FILE"]:
+            value = MEDIA_TYPES.get(value.strip().lower().lstrip("."), value)
+        case "TYPE" if path[-3:-1] == ["FILE", "FORM"]:
+            tag, value = "MEDI", value.upper()
+        case _ if tag in ENUMERATION_TAGS:
+            value = value.upper()
+
+    if "@" in value and not is_pointer(value):
+        value = _unescape_v7(value)
+    return tag, value, phrase
+
+
+def to_v7(group: list[GedcomLine]) -> list[GedcomLine]:
+    """Rewrite a 5.5.1 record group as 7.0."""
+    if group[0].tag == "SUBN":
+        return []
+    converted: list[GedcomLine] = []
+    path: list[str] = []
+    skip_below: int | None = None
+    # CONT lines of a citation text moved into a NOTE go one level deeper.
+    deepen: int | None = None
+
+    for line in group:
+        level, tag, value = line.level, line.tag, line.value
+        if skip_below is not None:
+            if level > skip_below:
+                continue
+            skip_below = None
+        if tag == "CONC":
+            if converted:
+                last = converted[-1]
+                value = value.replace("@@", "@")
+                converted[-1] = attrs.evolve(last, value=last.value + value)
+            continue
+        if tag == "CONT" and level == deepen:
+            converted.append(_line(level + 1, tag, value))
+            continue
+        deepen = None
+        del path[level:]
+        path.append(tag)
+
+        if path[0] == "HEAD":
+            if tuple(path[1:]) in REMOVED_HEAD_PATHS:
+                skip_below = level
+                continue
+            if path[1:] == ["GEDC", "VERS"]:
+                value = V7
+        elif tag == "SUBN":
+            skip_below = level
+            continue
+
+        if tag == "SOUR" and path[0] != "HEAD" and value and not is_pointer(value):
+            # 7.0 citations need a pointer; the text becomes a note.
+            converted.append(_line(level, tag, VOID))
+            converted.append(_line(level + 1, "NOTE", value))
+            deepen = level + 1
+            continue
+
+        tag, value, phrase = _convert_v7(path, value)
+        if (tag, value) != (line.tag, line.value):
+            line = _line(level, tag, value, line.xref)  # noqa: PLW2901
+        converted.append(line)
+        if phrase is not None:
+            converted.append(_line(level + 1, "PHRASE", phrase))
+    return converted
+
+
+def _split_long(line: GedcomLine) -> list[GedcomLine]:
+    """Split a value too long for 5.5.1 over CONC lines.
+
+    Splits avoid spaces, which some readers strip from the ends of lines.
+    """
+    # The level, xref and tag take at most a few dozen characters.
+    if (
+        len(line.value) <= MAX_LINE_LENGTH // 2
+        or len(line.to_string()) <= MAX_LINE_LENGTH
+    ):
+        return [line]
+    conc_level = line.level if line.tag in ("CONT", "CONC") else line.level + 1
+    value = line.value
+    room = MAX_LINE_LENGTH - len(line.to_string()) + len(value)
+    parts = []
+    while len(value) > room:
+        cut = room
+        while cut > 1 and " " in (value[cut - 1], value[cut]):
+            cut -= 1
+        cut = cut if cut > 1 else room
+        parts.append(value[:cut])
+        value = value[cut:]
+        room = MAX_LINE_LENGTH - len(f"{conc_level} CONC ")
+    parts.append(value)
+    first, *rest = parts
+    return [
+        attrs.evolve(line, value=first),
+        *(_line(conc_level, "CONC", part) for part in rest),
+    ]
+
+
+def _convert_v551(
+    group: list[GedcomLine],
+    index: int,
+    path: list[str],
+    value: str,
+) -> tuple[str, str, int | None]:
+    """Return the 5.5.1 tag and value of a 7.0 line, and the PHRASE it used."""
+    tag = path[-1]
+    phrase_index = None
+    match tag:
+        case "EMAIL":
+            tag = "EMAI"
+        case "SNOTE":
+            tag = "NOTE"
+        case "DATE" | "AGE":
+            phrase_index = _phrase_of(group, index)
+            phrase = None if phrase_index is None else group[phrase_index].value
+            convert_value = date_to_v551 if tag == "DATE" else age_to_v551
+            value, used_phrase = convert_value(value, phrase)
+            if not used_phrase:
+                phrase_index = None
+        case "FORM" if path[-2:-1] == ["FILE"]:
+            value = FILE_FORMATS.get(value.strip().lower(), value)
+        case "MEDI" if path[-3:-1] == ["FILE", "FORM"]:
+            tag, value = "TYPE", value.lower()
+        case _ if tag in ENUMERATION_TAGS:
+            value = value.lower()
+        case _ if tag in V7_ONLY_TAGS:
+            tag = f"_{tag}"
+
+    if "@" in value and not is_pointer(value) and tag != "DATE":
+        value = _escape_v551(value)
+    return tag, value, phrase_index
+
+
+def _inline_citation(
+    group: list[GedcomLine],
+    index: int,
+) -> tuple[list[GedcomLine], range] | None:
+    """Rewrite a ``SOUR @VOID@`` citation with its NOTE as the citation text.
+
+    Returns the new lines and the indexes of the note's lines they replace,
+    or None if there's no such note. This undoes what ``to_v7`` does to a
+    5.5.1 citation without a source record.
+    """
+    line = group[index]
+    note = next(
+        (
+            child
+            for child in _children(group, index)
+            if group[child].tag == "NOTE" and not is_pointer(group[child].value)
+        ),
+        None,
+    )
+    if line.tag != "SOUR" or note is None:
+        return None
+    end = note + 1
+    while end < len(group) and group[end].level > group[note].level:
+        end += 1
+    text = _line(line.level, line.tag, _escape_v551(group[note].value))
+    # The note's CONT lines continue the citation text instead.
+    continued = (
+        _line(line.level + 1, "CONT", _escape_v551(group[i].value))
+        for i in range(note + 1, end)
+        if group[i].tag == "CONT" and group[i].level == line.level + 2
+    )
+    return [*_split_long(text), *continued], range(note, end)
+
+
+def to_v551(group: list[GedcomLine]) -> list[GedcomLine]:
+    """Rewrite a 7.0 record group as 5.5.1.
+
+    ``SOUR @VOID@`` citations with a NOTE become citations with the note as
+    their text. Other pointers to ``@VOID@``, which 5.5.1 doesn't have, are
+    dropped with their substructures.
+    """
+    converted: list[GedcomLine] = []
+    path: list[str] = []
+    skip_below: int | None = None
+    # PHRASE lines folded into their DATE or AGE value, and notes into the
+    # citation they give the text of.
+    used: set[int] = set()
+
+    for index, line in enumerate(group):
+        level, value = line.level, line.value
+        if skip_below is not None:
+            if level > skip_below:
+                continue
+            skip_below = None
+        if index in used:
+            continue
+        del path[level:]
+        path.append(line.tag)
+
+        if value == VOID:
+            if (citation := _inline_citation(group, index)) is None:
+                skip_below = level
+            else:
+                converted.extend(citation[0])
+                used.update(citation[1])
+            continue
+
+        extra = []
+        if path[0] == "HEAD":
+            if path[1:] == ["SCHMA"]:
+                skip_below = level
+                continue
+            if path[1:] == ["GEDC", "VERS"]:
+                value = V551
+                extra.append(_line(level, "FORM", "LINEAGE-LINKED"))
+
+        tag, value, phrase_index = _convert_v551(group, index, path, value)
+        if phrase_index is not None:
+            used.add(phrase_index)
+        if (tag, value) != (line.tag, line.value):
+            line = _line(level, tag, value, line.xref)  # noqa: PLW2901
+        converted.extend(_split_long(line))
+        converted.extend(extra)
+
+    if group[0].tag == "HEAD":
+        converted.append(_line(1, "CHAR", "UTF-8"))
+    return converted
+
+
+def _normalise_charset(group: list[GedcomLine]) -> list[GedcomLine]:
+    """Keep a file in its version, declaring the UTF-8 it is now written in."""
+    if group[0].tag != "HEAD":
+        return group
+    return [
+        attrs.evolve(line, value="UTF-8")
+        if line.level == 1 and line.tag == "CHAR"
+        else line
+        for line in group
+    ]
+
+
+def _converter(
+    header: list[GedcomLine],
+    version: str,
+) -> tuple[Converter, Sequence[re.Pattern[str]]]:
+    """Pick the conversion for a file, and patterns of the lines it may rewrite.
+
+    No patterns means only the header changes.
+    """
+    parsed = read_header(list(merge_continuations(header)))
+    source = V7 if parsed.version.startswith("7.") else V551
+    if source == version:
+        return _normalise_charset, ()
+    if version == V7:
+        return to_v7, _REWRITTEN_V7
+    return to_v551, _REWRITTEN_V551
+
+
+def _record_blocks(blocks: Iterator[str]) -> Iterator[str]:
+    """Regroup text blocks to hold whole records.
+
+    Each block starts with the line break before its first record, so that
+    every line, the first included, follows a line break.
+    """
+    carry = "\n"
+    for block in blocks:
+        text = carry + block
+        if (cut := text.rfind(_RECORD_BREAK)) <= 0:
+            carry = text
+            continue
+        yield text[:cut]
+        carry = text[cut:]
+    yield carry
+
+
+def _rewrite(record: str, converter: Converter) -> str:
+    # Values are kept exactly, spaces included, as in records copied as text.
+    lines = [line for line in record.split("\n") if line and not line.isspace()]
+    converted = converter(tokenize(lines, merge=False))
+    return "".join(f"\n{line.to_string()}" for line in converted)
+
+
+def _convert_block(
+    block: str,
+    converter: Converter,
+    rewritten: Sequence[re.Pattern[str]],
+) -> Iterator[str]:
+    """Yield the parts of a block of records, rewriting those that may change."""
+    position = 0
+    matches = [pattern.search(block) for pattern in rewritten]
+    while found := [match for match in matches if match is not None]:
+        match = min(found, key=lambda match: match.start())
+        # A match can start at the line break before its record's level-0 line.
+        start = max(block.rfind(_RECORD_BREAK, 0, match.start() + 3), 0)
+        if (end := block.find(_RECORD_BREAK, match.start() + 1)) < 0:
+            end = len(block)
+        yield block[position:start]
+        yield _rewrite(block[start:end], converter)
+        position = end
+        matches = [
+            pattern.search(block, position)
+            if match is not None and match.start() < position
+            else match
+            for pattern, match in zip(rewritten, matches, strict=True)
+        ]
+    yield block[position:]
+
+
+@contextlib.contextmanager
+def _open_output(destination: str | os.PathLike[str] | BinaryIO) -> Iterator[TextIO]:
+    if not hasattr(destination, "write"):
+        with Path(destination).open(
+            "w", encoding="utf-8", newline="\n", buffering=1 << 20
+        ) as file:
+            yield file
+        return
+    text = io.TextIOWrapper(destination, encoding="utf-8", newline="\n")
+    try:
+        yield text
+        text.flush()
+    finally:
+        text.detach()
+
+
+def convert(
+    source: GedcomSource,
+    destination: str | os.PathLike[str] | BinaryIO,
+    *,
+    version: str = V7,
+    encoding: str | None = None,
+) -> None:
+    """Write ``source`` as GEDCOM ``version`` ("5.5.1" or "7.0") in UTF-8.
+
+    Files already in the target version are copied with only their charset
+    changed.
+    """
+    if version not in (V551, V7):
+        raise UnsupportedGedcomVersionError(version)
+    blocks = _record_blocks(GedcomReader(source, encoding).text_blocks())
+    first = next(blocks)
+    if (header_end := first.find(_RECORD_BREAK, 1)) < 0:
+        header_end = len(first)
+    header = tokenize(first[1:header_end].splitlines(), merge=False)
+    if not header:
+        raise NotGedcomError
+    converter, rewritten = _converter(header, version)
+
+    with _open_output(destination) as output:
+        output.write("\n".join(line.to_string() for line in converter(header)))
+        last = ""
+        for block in itertools.chain([first[header_end:]], blocks):
+            for part in _convert_block(block, converter, rewritten):
+                output.write(part)
+                last = part or last
+        if not last.endswith("\n"):
+            output.write("\n")
@@ -0,0 +1,125 @@
+"""Parsing of GEDCOM DATE values into packed, sortable date ranges.
+
+Dates are packed as ``yyyymmdd`` integers, so that they compare and subtract
+like numbers and fit in a 32-bit column. A value that is not known to the day
+becomes the range of days it covers: "JAN 1970" is 19700101-19700131 and "1970"
+is 19700101-19701231. 0 stands for an unknown bound, e.g. the start of
+"BEF 1900".
+"""
+
+from __future__ import annotations
+
+import calendar
+import datetime
+import re
+
+import attrs
+
+MONTHS = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12,
+}  # fmt: skip
+
+UNKNOWN = 0
+
+# [day] [month] year, where the year may be a dual year such as 1750/51.
+_DATE = re.compile(
+    r"^(?:(?P<day>\d{1,2})\s+)?(?:(?P<month>[A-Z]{3})\s+)?(?P<year>\d{1,4})(?:/\d+)?$",
+)
+# Calendar escapes (5.5.1) and calendar names (7.0) are dropped; other calendars
+# than the Gregorian are rare enough to be read as if they were Gregorian.
+_CALENDAR = re.compile(r"@#D[A-Z ]+@\s*|\b(?:GREGORIAN|JULIAN)\s+")
+_PHRASE = re.compile(r"\s*\(.*\)$")
+
+
+@attrs.frozen(slots=True)
+class DateRange:
+    """First and last day a DATE value can refer to, packed as ``yyyymmdd``."""
+
+    start: int = UNKNOWN
+    end: int = UNKNOWN
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether the value names a single, known day."""
+        return self.start == self.end != UNKNOWN
+
+    @property
+    def estimate(self) -> int:
+        """The best single-day guess: the start, or the end if it is unknown."""
+        return self.start or self.end
+
+
+def pack_date(year: int, month: int = 1, day: int = 1) -> int:
+    return year * 10_000 + month * 100 + day
+
+
+def unpack_date(packed: int) -> datetime.date | None:
+    """Turn a packed date back into a date, if it is a valid one."""
+    if packed == UNKNOWN:
+        return None
+    try:
+        return datetime.date(packed // 10_000, packed // 100 % 100, packed % 100)
+    except ValueError:
+        return None
+
+
+def _parse_single(text: str) -> DateRange | None:
+    if (match := _DATE.match(text)) is None:
+        return None
+
+    year = int(match["year"])
+    if match["month"] is None:
+        if match["day"] is not None:
+            return None
+        return DateRange(pack_date(year, 1, 1), pack_date(year, 12, 31))
+
+    if (month := MONTHS.get(match["month"])) is None:
+        return None
+    if match["day"] is None:
+        last_day = calendar.mdays[month] + (
+            month == calendar.FEBRUARY and calendar.isleap(year)
+        )
+        return DateRange(pack_date(year, month, 1), pack_date(year, month, last_day))
+    day = int(match["day"])
+    return DateRange(pack_date(year, month, day), pack_date(year, month, day))
+
+
+def parse_date_range(value: str | None) -> DateRange | None:  # noqa: PLR0911
+    """Parse a DATE value, or return None if it isn't understood.
+
+    Approximations (ABT, CAL, EST, INT) are read as the date they qualify, and
+    ranges and periods (BET/AND, FROM/TO, BEF, AFT) span their bounds.
+    """
+    if not value:
+        return None
+
+    text = _CALENDAR.sub("", _PHRASE.sub("", value.upper())).strip()
+    keyword, _, rest = text.partition(" ")
+
+    match keyword:
+        case "ABT" | "CAL" | "EST" | "INT":
+            return _parse_single(rest)
+        case "BEF" | "TO":
+            bound = _parse_single(rest)
+            return DateRange(UNKNOWN, bound.end) if bound else None
+        case "AFT":
+            bound = _parse_single(rest)
+            return DateRange(bound.start, UNKNOWN) if bound else None
+        case "BET" | "FROM":
+            first, separator, second = rest.partition(
+                " AND " if keyword == "BET" else " TO ",
+            )
+            start = _parse_single(first)
+            end = _parse_single(second) if separator else None
+            if start is None:
+                return None
+            return DateRange(start.start, end.end if end else UNKNOWN)
+    return _parse_single(text)
+
+
+def parse_exact_date(value: str | None) -> datetime.date | None:
+    """Parse a DATE value that names a single day, e.g. "1 JAN 1970"."""
+    if (date_range := parse_date_range(value)) is None or not date_range.is_exact:
+        return None
+    return unpack_date(date_range.start)
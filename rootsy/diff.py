@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+import attrs
+
+from rootsy.reader import GedcomReader
+from rootsy.types import ParsingContext
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from rootsy.reader import GedcomSource
+    from rootsy.types import GedcomLine
+
+# A field is identified by the tag path below its record, e.g. ("BIRT", "DATE").
+type FieldPath = tuple[str, ...]
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class RecordFingerprint:
+    """Compact summary of a level-0 record group."""
+
+    key: str
+    tag: str
+    digest: bytes
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class FieldChange:
+    """Values of a single field path before and after a change."""
+
+    path: FieldPath
+    old: tuple[str, ...]
+    new: tuple[str, ...]
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class RecordChange:
+    """A record present in both files whose content differs."""
+
+    key: str
+    tag: str
+    fields: tuple[FieldChange, ...]
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class GedcomDiff:
+    """Record-level differences between two GEDCOM files."""
+
+    added: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    modified: tuple[RecordChange, ...] = ()
+    # Records whose xref changed but whose content is identical (old -> new).
+    renamed: dict[str, str] = attrs.field(factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.modified or self.renamed)
+
+
+def record_key(group: list[GedcomLine], seen: dict[str, int]) -> str:
+    """Return a stable key for a record group.
+
+    Records are keyed by their xref. Records without one (HEAD, TRLR, ...) are
+    keyed by their tag and the number of times that tag was seen before.
+    """
+    first = group[0]
+    if first.xref:
+        return first.xref
+
+    index = seen[first.tag] = seen.get(first.tag, -1) + 1
+    return first.tag if index == 0 else f"{first.tag}#{index}"
+
+
+def fingerprint(group: list[GedcomLine], key: str) -> RecordFingerprint:
+    """Hash a record group, ignoring the xref of its level-0 line."""
+    digest = hashlib.blake2b(digest_size=16)
+    for line in group:
+        digest.update(f"{line.level} {line.tag} {line.value}\n".encode())
+    return RecordFingerprint(key=key, tag=group[0].tag, digest=digest.digest())
+
+
+def fingerprints(groups: Iterable[list[GedcomLine]]) -> Iterator[RecordFingerprint]:
+    """Fingerprint every record group of a stream."""
+    seen: dict[str, int] = {}
+    for group in groups:
+        yield fingerprint(group, record_key(group, seen))
+
+
+def record_fields(group: list[GedcomLine]) -> dict[FieldPath, tuple[str, ...]]:
+    """Flatten a record group into the values found at each tag path."""
+    context = ParsingContext()
+    fields: defaultdict[FieldPath, list[str]] = defaultdict(list)
+    for line in group:
+        context.enter_level(line)
+        fields[context.path[1:]].append(line.value)
+    return {path: tuple(values) for path, values in fields.items()}
+
+
+def field_changes(
+    old: dict[FieldPath, tuple[str, ...]],
+    new: dict[FieldPath, tuple[str, ...]],
+) -> tuple[FieldChange, ...]:
+    """Compare two flattened records field by field."""
+    return tuple(
+        FieldChange(path=path, old=old.get(path, ()), new=new.get(path, ()))
+        for path in sorted(old.keys() | new.keys())
+        if old.get(path, ()) != new.get(path, ())
+    )
+
+
+def _collect_fields(
+    groups: Iterable[list[GedcomLine]],
+    keys: set[str],
+) -> dict[str, dict[FieldPath, tuple[str, ...]]]:
+    seen: dict[str, int] = {}
+    found = {}
+    for group in groups:
+        if (key := record_key(group, seen)) in keys:
+            found[key] = record_fields(group)
+    return found
+
+
+def diff_gedcom(old: GedcomSource, new: GedcomSource) -> GedcomDiff:
+    """Compare two GEDCOM files record by record.
+
+    Each file is streamed once to fingerprint its records, so only one digest
+    per record is held in memory. Records are matched by xref first; unmatched
+    records with identical content are reported as renamed. Field values are
+    only materialised for modified records, which costs one extra pass over the
+    old file when there are any, so a file object given as ``old`` must be
+    seekable.
+    """
+    old_reader = GedcomReader(old)
+    new_reader = GedcomReader(new)
+
+    old_prints = {fp.key: fp for fp in fingerprints(old_reader.line_groups())}
+
+    added: dict[str, RecordFingerprint] = {}
+    changed_fields: dict[str, dict[FieldPath, tuple[str, ...]]] = {}
+    matched: set[str] = set()
+
+    seen: dict[str, int] = {}
+    for group in new_reader.line_groups():
+        key = record_key(group, seen)
+        new_print = fingerprint(group, key)
+        old_print = old_prints.get(key)
+
+        if old_print is None:
+            added[key] = new_print
+            continue
+
+        matched.add(key)
+        if old_print.digest != new_print.digest:
+            changed_fields[key] = record_fields(group)
+
+    removed = {key: fp for key, fp in old_prints.items() if key not in matched}
+
+    # Pair up added/removed records whose content is identical.
+    removed_by_digest = {fp.digest: key for key, fp in removed.items()}
+    renamed = {}
+    for key, fp in list(added.items()):
+        if (old_key := removed_by_digest.pop(fp.digest, None)) is not None:
+            renamed[old_key] = key
+            del added[key]
+            del removed[old_key]
+
+    modified = ()
+    if changed_fields:
+        old_fields = _collect_fields(old_reader.line_groups(), set(changed_fields))
+        modified = tuple(
+            RecordChange(
+                key=key,
+                tag=old_prints[key].tag,
+                fields=field_changes(old_fields[key], new_fields),
+            )
+            for key, new_fields in changed_fields.items()
+        )
+
+    return GedcomDiff(
+        added=tuple(added),
+        removed=tuple(removed),
+        modified=modified,
+        renamed=renamed,
+    )
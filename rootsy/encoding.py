@@ -0,0 +1,238 @@
+"""Character set detection and the ANSEL codec used by legacy GEDCOM files."""
+
+from __future__ import annotations
+
+import codecs
+import re
+import unicodedata
+
+ANSEL_CODEC_NAME = "ansel"
+
+# Non-spacing marks (0xE0-0xFE) precede their base character in ANSEL, while
+# Unicode puts combining characters after it.
+_ANSEL_COMBINING = {
+    0xE0: "\u0309",  # hook above
+    0xE1: "\u0300",  # grave
+    0xE2: "\u0301",  # acute
+    0xE3: "\u0302",  # circumflex
+    0xE4: "\u0303",  # tilde
+    0xE5: "\u0304",  # macron
+    0xE6: "\u0306",  # breve
+    0xE7: "\u0307",  # dot above
+    0xE8: "\u0308",  # diaeresis
+    0xE9: "\u030c",  # caron
+    0xEA: "\u030a",  # ring above
+    0xEB: "\ufe20",  # ligature, left half
+    0xEC: "\ufe21",  # ligature, right half
+    0xED: "\u0315",  # comma above right
+    0xEE: "\u030b",  # double acute
+    0xEF: "\u0310",  # candrabindu
+    0xF0: "\u0327",  # cedilla
+    0xF1: "\u0328",  # ogonek
+    0xF2: "\u0323",  # dot below
+    0xF3: "\u0324",  # diaeresis below
+    0xF4: "\u0325",  # ring below
+    0xF5: "\u0333",  # double underscore
+    0xF6: "\u0332",  # underscore
+    0xF7: "\u0326",  # comma below
+    0xF8: "\u031c",  # left half ring below
+    0xF9: "\u032e",  # breve below
+    0xFA: "\ufe22",  # double tilde, left half
+    0xFB: "\ufe23",  # double tilde, right half
+    0xFE: "\u0313",  # comma above
+}
+
+_ANSEL_SPACING = {
+    0xA1: "\u0141",  # Ł
+    0xA2: "\u00d8",  # Ø
+    0xA3: "\u0110",  # Đ
+    0xA4: "\u00de",  # Þ
+    0xA5: "\u00c6",  # Æ
+    0xA6: "\u0152",  # Œ
+    0xA7: "\u02b9",  # soft sign
+    0xA8: "\u00b7",  # middle dot
+    0xA9: "\u266d",  # music flat
+    0xAA: "\u00ae",  # registered
+    0xAB: "\u00b1",  # plus-minus
+    0xAC: "\u01a0",  # Ơ
+    0xAD: "\u01af",  # Ư
+    0xAE: "\u02bc",  # alif
+    0xB0: "\u02bb",  # ayn
+    0xB1: "\u0142",  # ł
+    0xB2: "\u00f8",  # ø
+    0xB3: "\u0111",  # đ
+    0xB4: "\u00fe",  # þ
+    0xB5: "\u00e6",  # æ
+    0xB6: "\u0153",  # œ
+    0xB7: "\u02ba",  # hard sign
+    0xB8: "\u0131",  # dotless i
+    0xB9: "\u00a3",  # £
+    0xBA: "\u00f0",  # ð
+    0xBC: "\u01a1",  # ơ
+    0xBD: "\u01b0",  # ư
+    0xBE: "\u25a1",  # empty box (GEDCOM extension)
+    0xBF: "\u25a0",  # black box (GEDCOM extension)
+    0xC0: "\u00b0",  # degree
+    0xC1: "\u2113",  # script l
+    0xC2: "\u2117",  # sound recording copyright
+    0xC3: "\u00a9",  # copyright
+    0xC4: "\u266f",  # music sharp
+    0xC5: "\u00bf",  # inverted question mark
+    0xC6: "\u00a1",  # inverted exclamation mark
+    0xC7: "\u00df",  # eszett (MARC-21)
+    0xC8: "\u20ac",  # euro
+    0xCF: "\u00df",  # eszett (GEDCOM extension)
+}
+
+# Applied with str.translate() to text decoded as latin-1, which maps every
+# byte to the code point of the same value.
+_DECODING_TABLE = {**_ANSEL_SPACING, **_ANSEL_COMBINING}
+_ENCODING_TABLE = {ord(char): byte for byte, char in reversed(_DECODING_TABLE.items())}
+
+_COMBINING_CHARS = "".join(_ANSEL_COMBINING.values())
+# One or more marks followed by the character they modify.
+_MARKS_BEFORE_BASE = re.compile(f"([{_COMBINING_CHARS}]+)(.)", re.DOTALL)
+_MARKS_AFTER_BASE = re.compile(r"(.)([\u0300-\u036f\ufe20-\ufe23]+)", re.DOTALL)
+
+_COMBINING_BYTES = frozenset(_ANSEL_COMBINING)
+_HIGH_BYTES = re.compile(rb"[\x80-\xff]")
+_UNDEFINED_BYTES = bytes(b for b in range(0x80, 0x100) if b not in _DECODING_TABLE)
+_UNDEFINED = re.compile(b"[" + re.escape(_UNDEFINED_BYTES) + b"]")
+
+_ERROR_TABLES = {
+    "strict": _DECODING_TABLE,
+    "replace": {**_DECODING_TABLE, **dict.fromkeys(_UNDEFINED_BYTES, "\ufffd")},
+    "ignore": {**_DECODING_TABLE, **dict.fromkeys(_UNDEFINED_BYTES)},
+}
+
+
+def _decode_ansel(data: bytes, errors: str = "strict") -> str:
+    # Most lines are plain ASCII, which needs no translation at all.
+    if not _HIGH_BYTES.search(data):
+        return data.decode("ascii")
+
+    if errors == "strict" and (bad := _UNDEFINED.search(data)):
+        msg = f"undefined ANSEL byte 0x{data[bad.start()]:02X}"
+        raise UnicodeDecodeError(ANSEL_CODEC_NAME, data, bad.start(), bad.end(), msg)
+
+    table = _ERROR_TABLES.get(errors, _ERROR_TABLES["replace"])
+    text = data.decode("latin-1").translate(table)
+    text = _MARKS_BEFORE_BASE.sub(r"\2\1", text)
+    return unicodedata.normalize("NFC", text)
+
+
+def ansel_encode(text: str, errors: str = "strict") -> tuple[bytes, int]:
+    """Encode text as ANSEL, moving combining marks before their base."""
+    decomposed = _MARKS_AFTER_BASE.sub(r"\2\1", unicodedata.normalize("NFD", text))
+    encoded = decomposed.translate(_ENCODING_TABLE)
+    return encoded.encode("latin-1", errors), len(text)
+
+
+def ansel_decode(data: bytes, errors: str = "strict") -> tuple[str, int]:
+    """Decode a complete ANSEL byte string."""
+    return _decode_ansel(bytes(data), errors), len(data)
+
+
+class AnselIncrementalDecoder(codecs.BufferedIncrementalDecoder):
+    """Streaming ANSEL decoder.
+
+    Combining marks at the end of a chunk are held back until the character
+    they modify arrives with the next chunk.
+    """
+
+    def _buffer_decode(
+        self,
+        data: bytes,
+        errors: str,
+        final: bool,  # noqa: FBT001
+    ) -> tuple[str, int]:
+        end = len(data)
+        if not final:
+            while end and data[end - 1] in _COMBINING_BYTES:
+                end -= 1
+        return _decode_ansel(bytes(data[:end]), errors), end
+
+
+class AnselIncrementalEncoder(codecs.IncrementalEncoder):
+    def encode(self, text: str, final: bool = False) -> bytes:  # noqa: ARG002, FBT001, FBT002
+        return ansel_encode(text, self.errors)[0]
+
+
+class AnselStreamReader(codecs.StreamReader):
+    def decode(self, data: bytes, errors: str = "strict") -> tuple[str, int]:
+        return ansel_decode(data, errors)
+
+
+class AnselStreamWriter(codecs.StreamWriter):
+    def encode(self, text: str, errors: str = "strict") -> tuple[bytes, int]:
+        return ansel_encode(text, errors)
+
+
+def _search_codec(name: str) -> codecs.CodecInfo | None:
+    if name.replace("-", "_") not in (ANSEL_CODEC_NAME, "gedcom_ansel"):
+        return None
+    return codecs.CodecInfo(
+        name=ANSEL_CODEC_NAME,
+        encode=ansel_encode,
+        decode=ansel_decode,
+        incrementalencoder=AnselIncrementalEncoder,
+        incrementaldecoder=AnselIncrementalDecoder,
+        streamreader=AnselStreamReader,
+        streamwriter=AnselStreamWriter,
+    )
+
+
+codecs.register(_search_codec)
+
+
+# HEAD.CHAR values mapped to Python codec names.
+CHARSET_CODECS = {
+    "UTF-8": "utf-8-sig",
+    "UTF8": "utf-8-sig",
+    "UNICODE": "utf-16",
+    "UTF-16": "utf-16",
+    "ANSEL": ANSEL_CODEC_NAME,
+    "ASCII": "ascii",
+    "ANSI": "cp1252",
+    "IBMPC": "cp437",
+    "IBM WINDOWS": "cp1252",
+    "MACINTOSH": "mac-roman",
+}
+
+DEFAULT_ENCODING = "utf-8-sig"
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+_HEAD_CHAR = re.compile(rb"^[ \t]*1[ \t]+CHAR[ \t]+([^\r\n]+)", re.MULTILINE)
+_NEXT_RECORD = re.compile(rb"[\r\n][ \t]*0[ \t]")
+
+
+def detect_encoding(prefix: bytes) -> str:
+    """Guess the codec of a GEDCOM file from its first bytes.
+
+    A byte order mark wins. UTF-16 without a BOM is recognised by the NUL byte
+    next to the leading level digit. Otherwise the HEAD.CHAR value is used,
+    defaulting to UTF-8.
+    """
+    for bom, encoding in _BOMS:
+        if prefix.startswith(bom):
+            return encoding
+
+    if prefix.startswith(b"0\x00"):
+        return "utf-16-le"
+    if prefix.startswith(b"\x000"):
+        return "utf-16-be"
+
+    # Only look inside the header record.
+    if head_end := _NEXT_RECORD.search(prefix):
+        prefix = prefix[: head_end.start()]
+
+    if match := _HEAD_CHAR.search(prefix):
+        charset = match.group(1).decode("ascii", "replace").strip().upper()
+        return CHARSET_CODECS.get(charset, DEFAULT_ENCODING)
+
+    return DEFAULT_ENCODING
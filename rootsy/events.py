@@ -0,0 +1,268 @@
+"""
+Columnar storage of events, with vectorised demographic statistics.
+
+Events are kept as parallel arrays rather than as one object each, which takes
+a few bytes per event and lets NumPy aggregate millions of them in one pass.
+NumPy is only needed for the statistics; install it with ``rootsy[stats]``.
+"""
+
+from __future__ import annotations
+
+import importlib
+from array import array
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, overload
+
+from rootsy.dates import UNKNOWN, pack_date, parse_date_range, unpack_date
+from rootsy.models import Event, EventType
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+    from rootsy.models import Citation, Family
+    from rootsy.places import PlaceTable
+
+# Place column value for events without a place.
+NO_PLACE = -1
+
+
+def _numpy() -> Any:  # noqa: ANN401
+    try:
+        return importlib.import_module("numpy")
+    except ImportError as error:
+        msg = "Event statistics need NumPy; install rootsy[stats]"
+        raise ImportError(msg) from error
+
+
+class EventTable:
+    """
+    Events of the individuals and families of a tree, one column per field.
+
+    Each event is a row of an event type code, the index of the record it
+    belongs to, the packed start and end of its date range (see
+    ``rootsy.dates``) and a place id from the tree's ``PlaceTable``. DATE
+    values that aren't a single day, citations and additional details, such as
+    the TYPE of generic events, are kept for the rows that have them.
+    ``Event`` objects are only built when rows are accessed, and carry the
+    place id only; ``places.full_name`` gives its name.
+    """
+
+    def __init__(self, places: PlaceTable) -> None:
+        self.places = places
+        self.types = array("B")
+        self.records = array("I")
+        self.starts = array("i")
+        self.ends = array("i")
+        self.place_ids = array("i")
+        # DATE value as written of the rows without an exact date, and the
+        # citations and additional details of the rows that have any.
+        self.date_values: dict[int, str] = {}
+        self.citations: dict[int, Sequence[Citation]] = {}
+        self.details: dict[int, dict[str, Any]] = {}
+        # Xref of each record index, and the reverse lookup.
+        self.record_ids: list[str] = []
+        self._record_index: dict[str, int] = {}
+        # Rows of each record index; a record's events are added together.
+        self._rows: dict[int, range] = {}
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, row: int) -> Event:
+        start = self.starts[row]
+        place_id = self.place_ids[row]
+        return Event(
+            type=EventType(self.types[row]),
+            date=unpack_date(start) if row not in self.date_values else None,
+            date_value=self.date_values.get(row),
+            citations=self.citations.get(row, []),
+            additional_details=dict(self.details.get(row, {})),
+            place_id=place_id if place_id != NO_PLACE else None,
+        )
+
+    def __iter__(self) -> Iterator[Event]:
+        return (self[row] for row in range(len(self)))
+
+    def record_index(self, xref: str) -> int:
+        """Return the index of a record, assigning the next one if it is new."""
+        if (index := self._record_index.get(xref)) is None:
+            index = self._record_index[xref] = len(self.record_ids)
+            self.record_ids.append(xref)
+        return index
+
+    def append(self, xref: str, event: Event) -> RecordEvents:
+        return self.extend(xref, (event,))
+
+    def extend(self, xref: str, events: Iterable[Event]) -> RecordEvents:
+        """Add the events of a record, and return a view of all its events.
+
+        Adding a record's events again, other than right after its last ones,
+        replaces them in the view and ``events_of``, though the earlier rows
+        stay in the columns.
+        """
+        index = self.record_index(xref)
+        first = len(self)
+        for event in events:
+            self._append_row(index, event)
+        start = first
+        if (rows := self._rows.get(index)) is not None and rows.stop == first:
+            start = rows.start
+        rows = self._rows[index] = range(start, len(self))
+        return RecordEvents(self, rows)
+
+    def _append_row(self, index: int, event: Event) -> None:
+        if event.date is not None:
+            start = end = pack_date(event.date.year, event.date.month, event.date.day)
+        elif date_range := parse_date_range(event.date_value):
+            start, end = date_range.start, date_range.end
+        else:
+            start = end = UNKNOWN
+
+        place_id = event.place_id
+        if place_id is None:
+            place_id = self.places.intern(event.place)
+
+        if event.date_value is not None:
+            self.date_values[len(self)] = event.date_value
+        if event.citations:
+            self.citations[len(self)] = event.citations
+        if event.additional_details:
+            self.details[len(self)] = event.additional_details
+        self.types.append(event.type.value)
+        self.records.append(index)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.place_ids.append(NO_PLACE if place_id is None else place_id)
+
+    def events_of(self, xref: str) -> list[Event]:
+        """Materialise the events of one record."""
+        if (index := self._record_index.get(xref)) is None:
+            return []
+        return [self[row] for row in self._rows.get(index, ())]
+
+    def columns(self) -> dict[str, Any]:
+        """
+        Return the columns as NumPy arrays, sharing memory with the table.
+
+        The table can't grow while these arrays are alive; appending raises
+        ``BufferError`` until they are released.
+        """
+        np = _numpy()
+        return {
+            "type": np.frombuffer(self.types, dtype=np.uint8),
+            "record": np.frombuffer(self.records, dtype=np.uint32),
+            "start": np.frombuffer(self.starts, dtype=np.int32),
+            "end": np.frombuffer(self.ends, dtype=np.int32),
+            "place": np.frombuffer(self.place_ids, dtype=np.int32),
+        }
+
+    def to_dict(self) -> dict[str, list[Any]]:
+        return {
+            "type": [EventType(code).name for code in self.types],
+            "record": [self.record_ids[index] for index in self.records],
+            "start": self.starts.tolist(),
+            "end": self.ends.tolist(),
+            "place": self.place_ids.tolist(),
+        }
+
+    def _dates_by_record(self, event_type: EventType) -> Any:  # noqa: ANN401
+        """
+        Estimated date of one event type per record index, 0 if unknown.
+
+        When a record has several events of the type, the last one wins.
+        """
+        np = _numpy()
+        columns = self.columns()
+        rows = columns["type"] == event_type.value
+        # The start of the range, or its end when only that is known.
+        estimates = np.where(
+            columns["start"] != UNKNOWN, columns["start"], columns["end"]
+        )
+        dates = np.zeros(len(self.record_ids), dtype=np.int32)
+        dates[columns["record"][rows]] = estimates[rows]
+        return dates
+
+    def lifespans(self) -> Any:  # noqa: ANN401
+        """
+        Age at death in whole years of everyone with a dated birth and death.
+
+        Returns ``(record indexes, ages)``; see ``record_ids`` for the xrefs.
+        """
+        np = _numpy()
+        births = self._dates_by_record(EventType.BIRTH)
+        deaths = self._dates_by_record(EventType.DEATH)
+        known = np.flatnonzero((births != UNKNOWN) & (deaths != UNKNOWN))
+        return known, _age_in_years(births[known], deaths[known])
+
+    def births_per_decade(self) -> dict[int, int]:
+        """Count the dated births of each decade, keyed by its first year."""
+        np = _numpy()
+        births = self._dates_by_record(EventType.BIRTH)
+        decades = births[births != UNKNOWN] // 100_000 * 10
+        values, counts = np.unique(decades, return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist(), strict=True))
+
+    def mean_age_at_marriage(self, families: Mapping[str, Family]) -> float | None:
+        """Mean age of spouses at their marriage, or None without any data."""
+        np = _numpy()
+        spouses, marriages = [], []
+        for xref, family in families.items():
+            if (family_index := self._record_index.get(xref)) is None:
+                continue
+            for spouse in (family.husband, family.wife):
+                if spouse is not None and spouse in self._record_index:
+                    spouses.append(self._record_index[spouse])
+                    marriages.append(family_index)
+
+        births = self._dates_by_record(EventType.BIRTH)[np.array(spouses, dtype=int)]
+        married = self._dates_by_record(EventType.MARRIAGE)[
+            np.array(marriages, dtype=int)
+        ]
+        known = (births != UNKNOWN) & (married != UNKNOWN)
+        if not known.any():
+            return None
+        return float(_age_in_years(births[known], married[known]).mean())
+
+
+class RecordEvents(Sequence[Event]):
+    """The events of one record, built from the table's rows when accessed.
+
+    Views are compared by the events they hold, so they compare equal to lists
+    and tuples of the same events.
+    """
+
+    __slots__ = ("_rows", "_table")
+
+    def __init__(self, table: EventTable, rows: range) -> None:
+        self._table = table
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @overload
+    def __getitem__(self, index: int) -> Event: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[Event]: ...
+    def __getitem__(self, index: int | slice) -> Event | list[Event]:
+        if isinstance(index, slice):
+            return [self._table[row] for row in self._rows[index]]
+        return self._table[self._rows[index]]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            mine == theirs for mine, theirs in zip(self, other, strict=True)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+
+def _age_in_years(born: Any, on: Any) -> Any:  # noqa: ANN401
+    # Whole years between packed dates: the difference in years, less one if
+    # the anniversary hadn't come yet.
+    return on // 10_000 - born // 10_000 - (on % 10_000 < born % 10_000)
@@ -0,0 +1,327 @@
+"""Extract part of a tree, such as someone's ancestors, into a new GEDCOM file.
+
+Extraction reads the source twice without parsing it into models: a first
+pass indexes the pointers between records, a walk over that index selects
+the records to keep, and a second pass copies their original bytes. Records
+are only rewritten where they point to a record left out, in which case the
+pointer line is dropped with its substructures::
+
+    extract("tree.ged", "ancestors.ged", ancestors_of=["@I1@"], generations=8)
+
+Since the bytes are copied as they are, the source must use an encoding in
+which ASCII characters are single bytes, i.e. anything but UTF-16.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+import attrs
+
+from rootsy.encoding import detect_encoding
+from rootsy.reader import GedcomReader, line_blocks
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Collection, Iterable, Iterator
+
+    from rootsy.reader import GedcomSource
+
+# Records that make up the family graph; pointers to them are only followed
+# by the ancestor and descendant walks, never by ``closure``.
+GRAPH_TAGS = frozenset({"INDI", "FAM"})
+# Level-1 HEAD substructures carried over into the new header.
+HEADER_TAGS = frozenset({"GEDC", "CHAR", "SCHMA", "LANG", "SUBM"})
+
+_BOM = b"\xef\xbb\xbf"
+_POINTER_LINE = re.compile(
+    rb"[ \t]*(\d+)[ \t]+([A-Za-z0-9_]+)[ \t]+(@[^@#\s][^@]*@)[ \t]*\r?\n?",
+)
+_LEVEL = re.compile(rb"[ \t]*(\d+)")
+# Record starts, and pointer lines below them.
+_SCAN = re.compile(
+    rb"^[ \t]*(?:0[ \t]+(?:(@[^@\r\n]+@)[ \t]+)?([A-Za-z0-9_]+)"
+    rb"|([1-9][0-9]*)[ \t]+([A-Za-z0-9_]+)[ \t]+(@[^@#\s][^@\r\n]*@)[ \t]*\r?$)",
+    re.MULTILINE,
+)
+_RECORD_START = re.compile(rb"^[ \t]*0[ \t]+(?:(@[^@\r\n]+@)[ \t]+)?", re.MULTILINE)
+_POINTER_TARGET = re.compile(
+    rb"^[ \t]*[1-9][0-9]*[ \t]+[A-Za-z0-9_]+[ \t]+(@[^@#\s][^@\r\n]*@)[ \t]*\r?$",
+    re.MULTILINE,
+)
+
+
+def _level(line: bytes) -> int | None:
+    return int(match.group(1)) if (match := _LEVEL.match(line)) else None
+
+
+@attrs.define
+class PointerIndex:
+    """The records of a file and the pointers between them.
+
+    ``pointers`` maps a record's xref to the ``(level, tag, target)`` of each
+    of its pointer lines.
+    """
+
+    records: dict[str, str] = attrs.field(factory=dict)
+    pointers: dict[str, list[tuple[int, str, str]]] = attrs.field(
+        factory=lambda: defaultdict(list),
+    )
+    header: list[bytes] = attrs.field(factory=list)
+    # Written before the first line and at the end of generated lines.
+    bom: bytes = b""
+    newline: bytes = b"\n"
+
+    @classmethod
+    def from_source(cls, source: GedcomSource) -> PointerIndex:
+        """Index the pointers of a file in one pass over its bytes."""
+        index = cls()
+        header: list[bytes] = []
+        xref: str | None = None
+        in_header = False
+
+        with _open_blocks(source) as (blocks, bom):
+            index.bom = bom
+            for block in blocks:
+                if not header and not index.records:
+                    line_end = block.find(b"\n")
+                    if line_end > 0 and block[line_end - 1] == ord("\r"):
+                        index.newline = b"\r\n"
+                start = 0
+                for match in _SCAN.finditer(block):
+                    record_xref, record_tag, level, tag, target = match.groups()
+                    if record_tag is None:
+                        if xref is not None:
+                            index.pointers[xref].append(
+                                (
+                                    int(level),
+                                    tag.decode("ascii"),
+                                    target.decode("ascii"),
+                                ),
+                            )
+                        continue
+                    if in_header:
+                        header.append(block[start : match.start()])
+                    in_header, start = record_tag == b"HEAD", match.start()
+                    xref = record_xref and record_xref.decode("ascii")
+                    if xref is not None:
+                        index.records[xref] = record_tag.decode("ascii")
+                if in_header:
+                    header.append(block[start:])
+        index.header = b"".join(header).splitlines(keepends=True)
+        return index
+
+    def targets(self, xref: str, *tags: str) -> Iterator[str]:
+        """Yield the level-1 pointers of a record with the given tags."""
+        for level, tag, target in self.pointers.get(xref, ()):
+            if level == 1 and tag in tags and target in self.records:
+                yield target
+
+    def ancestors(self, xref: str, generations: int | None = None) -> set[str]:
+        """Select an individual, their ancestors and the families linking them.
+
+        ``generations`` limits how many generations back the walk goes.
+        """
+        selected = {xref}
+        frontier = [xref]
+        generation = 0
+        while frontier and (generations is None or generation < generations):
+            parents = []
+            for person in frontier:
+                for family in self.targets(person, "FAMC"):
+                    selected.add(family)
+                    for parent in self.targets(family, "HUSB", "WIFE"):
+                        if parent not in selected:
+                            selected.add(parent)
+                            parents.append(parent)
+            frontier = parents
+            generation += 1
+        return selected
+
+    def descendants(self, xref: str, generations: int | None = None) -> set[str]:
+        """Select an individual, their descendants, and all their families.
+
+        Spouses are included, but without their own ancestry. ``generations`` limits
+        how many generations down the walk goes.
+        """
+        selected = {xref}
+        frontier = [xref]
+        generation = 0
+        while frontier and (generations is None or generation < generations):
+            children = []
+            for person in frontier:
+                for family in self.targets(person, "FAMS"):
+                    selected.add(family)
+                    selected.update(self.targets(family, "HUSB", "WIFE"))
+                    for child in self.targets(family, "CHIL"):
+                        if child not in selected:
+                            selected.add(child)
+                            children.append(child)
+            frontier = children
+            generation += 1
+        return selected
+
+    def closure(self, xrefs: Iterable[str]) -> set[str]:
+        """Add every source, note, repository etc. the records refer to.
+
+        References are followed transitively, so the repository of a cited
+        source is kept too, as is the submitter the header names. Individuals
+        and families are never added.
+        """
+        selected = set(xrefs)
+        pending = list(selected)
+        pending.extend(
+            target
+            for line in self.header
+            if (match := _POINTER_LINE.fullmatch(line))
+            and (target := match.group(3).decode("ascii")) in self.records
+        )
+        while pending:
+            xref = pending.pop()
+            selected.add(xref)
+            pending.extend(
+                target
+                for _, _, target in self.pointers.get(xref, ())
+                if target not in selected
+                and self.records.get(target, "INDI") not in GRAPH_TAGS
+            )
+        return selected
+
+    def new_header(self, selected: Collection[str]) -> bytes:
+        """Build a HEAD naming rootsy as its source, keeping version and charset.
+
+        Pointers to records not ``selected`` are left out.
+        """
+        kept = [b"0 HEAD" + self.newline, b"1 SOUR rootsy" + self.newline]
+        lines = _copy_lines(self.header[1:], selected, self.records)
+        keep = False
+        for line in lines:
+            level = _level(line)
+            if level == 1:
+                parts = line.split(maxsplit=2)
+                keep = (
+                    len(parts) > 1
+                    and parts[1].decode("ascii", "replace") in HEADER_TAGS
+                )
+            if keep and level is not None:
+                kept.append(line if line.endswith(b"\n") else line + self.newline)
+        return b"".join(kept)
+
+
+@contextlib.contextmanager
+def _open_blocks(source: GedcomSource) -> Iterator[tuple[Iterator[bytes], bytes]]:
+    """Open a file as blocks of whole lines, and the byte order mark it starts with."""
+    with GedcomReader(source).open_binary() as stream:
+        if detect_encoding(stream.peek(GedcomReader.SNIFF_SIZE)).startswith("utf-16"):
+            msg = "Records can only be copied from ASCII-compatible encodings"
+            raise ValueError(msg)
+        bom = _BOM if stream.peek(len(_BOM)).startswith(_BOM) else b""
+        stream.read(len(bom))
+        yield line_blocks(stream, GedcomReader.BUFFER_SIZE), bom
+
+
+def _copy_lines(
+    lines: Iterable[bytes],
+    selected: Collection[str],
+    records: Collection[str],
+) -> Iterator[bytes]:
+    """Yield the lines of a record, minus pointers to records not selected."""
+    skip_below: int | None = None
+    for line in lines:
+        if skip_below is not None:
+            if (level := _level(line)) is not None and level > skip_below:
+                continue
+            skip_below = None
+        if b"@" in line and (match := _POINTER_LINE.fullmatch(line)):
+            target = match.group(3).decode("ascii")
+            if target in records and target not in selected:
+                skip_below = int(match.group(1))
+                continue
+        yield line
+
+
+def _selected_records(
+    blocks: Iterable[bytes],
+    selected: Collection[str],
+) -> Iterator[bytes]:
+    """Yield the bytes of the selected records, found by scanning whole blocks."""
+    wanted = {xref.encode("ascii") for xref in selected}
+    parts: list[bytes] = []
+    keep = False
+    for block in blocks:
+        start = 0
+        for match in _RECORD_START.finditer(block):
+            if keep:
+                parts.append(block[start : match.start()])
+                yield b"".join(parts)
+                parts = []
+            keep, start = match.group(1) in wanted, match.start()
+        if keep:
+            parts.append(block[start:])
+    if keep:
+        yield b"".join(parts)
+
+
+def write_records(
+    source: GedcomSource,
+    xrefs: Collection[str],
+    destination: str | os.PathLike[str] | BinaryIO,
+    index: PointerIndex | None = None,
+) -> None:
+    """Write the given records of a file to a new one, with a fresh HEAD.
+
+    Records are copied in their original order. ``index`` is the
+    ``PointerIndex`` of the source, built when not given.
+    """
+    if index is None:
+        index = PointerIndex.from_source(source)
+    newline = index.newline
+
+    with contextlib.ExitStack() as stack:
+        if not hasattr(destination, "write"):
+            destination = stack.enter_context(Path(destination).open("wb"))
+        blocks, _ = stack.enter_context(_open_blocks(source))
+
+        destination.write(index.bom + index.new_header(xrefs))
+        for record in _selected_records(blocks, xrefs):
+            if any(
+                (target := match.group(1).decode("ascii")) in index.records
+                and target not in xrefs
+                for match in _POINTER_TARGET.finditer(record)
+            ):
+                lines = record.splitlines(keepends=True)
+                record = b"".join(_copy_lines(lines, xrefs, index.records))  # noqa: PLW2901
+            destination.write(record)
+            # The last record may end the file without a line terminator.
+            if not record.endswith(b"\n"):
+                destination.write(newline)
+        destination.write(b"0 TRLR" + newline)
+
+
+def extract(
+    source: GedcomSource,
+    destination: str | os.PathLike[str] | BinaryIO,
+    *,
+    ancestors_of: Iterable[str] = (),
+    descendants_of: Iterable[str] = (),
+    generations: int | None = None,
+) -> set[str]:
+    """Write the ancestors and/or descendants of some individuals to a new file.
+
+    The records they refer to, such as sources and notes, are included.
+    Returns the xrefs of the records written. The source is read twice, so a
+    file object must be seekable.
+    """
+    index = PointerIndex.from_source(source)
+    selected: set[str] = set()
+    for xref in ancestors_of:
+        selected |= index.ancestors(xref, generations)
+    for xref in descendants_of:
+        selected |= index.descendants(xref, generations)
+    selected = index.closure(xref for xref in selected if xref in index.records)
+    write_records(source, selected, destination, index)
+    return selected
@@ -0,0 +1,425 @@
+"""A flat, offset-based binary layout of a parsed tree, for sharing it.
+
+``export_tree`` writes the individuals, families and the links between them
+into one buffer that can be placed in shared memory or in a file. Worker
+processes attach to it with ``FlatTree`` and read records straight from the
+buffer: nothing is unpickled up front, and every process maps the same pages
+instead of holding its own copy.
+
+Layout, all integers little-endian unsigned 32-bit:
+
+- header: magic, version, then the offsets of the sections below and the
+  number of individuals and families;
+- strings: count, ``count + 1`` offsets into the UTF-8 blob that follows;
+- individuals: one row per individual of string ids (id, name, given name,
+  surname, sex, email), then the start and count of its families in the links;
+- families: one row per family of its id string, the husband and wife
+  individual indexes, then the start and count of its children in the links;
+- links: individual or family indexes, referenced from the rows above;
+- xref index: ``(string id, kind, index)`` rows sorted by xref, for lookups.
+
+``NONE`` marks a missing string or record. Links to records that aren't in
+the tree are left out.
+"""
+
+from __future__ import annotations
+
+import bisect
+import mmap
+import struct
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar, Self
+
+from rootsy.models import Family, Individual
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterator
+    from types import TracebackType
+
+    from rootsy.models import GedcomStructure
+
+MAGIC = b"RSYT"
+VERSION = 1
+NONE = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<4sI7I")
+_U32 = struct.Struct("<I")
+_INDIVIDUAL = struct.Struct("<8I")
+_FAMILY = struct.Struct("<5I")
+_XREF = struct.Struct("<3I")
+
+_INDIVIDUAL_KIND = 0
+_FAMILY_KIND = 1
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+
+    def add(self, value: str | None) -> int:
+        if value is None:
+            return NONE
+        return self.ids.setdefault(value, len(self.ids))
+
+    def pack(self) -> bytes:
+        encoded = [value.encode() for value in self.ids]
+        offsets = [0]
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        return struct.pack(
+            f"<{len(offsets) + 1}I",
+            len(encoded),
+            *offsets,
+        ) + b"".join(encoded)
+
+
+def _pad(data: bytearray) -> None:
+    # Keep every section 4-byte aligned.
+    data.extend(b"\x00" * (-len(data) % 4))
+
+
+def export_tree(structure: GedcomStructure) -> bytes:
+    """Write the individuals, families and their links into a flat buffer."""
+    strings = _StringTable()
+    individual_index = {xref: i for i, xref in enumerate(structure.individuals)}
+    family_index = {xref: i for i, xref in enumerate(structure.families)}
+    links: list[int] = []
+
+    individual_rows = []
+    for individual in structure.individuals.values():
+        families = [family_index[f] for f in individual.families if f in family_index]
+        individual_rows.append(
+            _INDIVIDUAL.pack(
+                strings.add(individual.id),
+                strings.add(individual.name),
+                strings.add(individual.given_name),
+                strings.add(individual.surname),
+                strings.add(individual.sex),
+                strings.add(individual.email),
+                len(links),
+                len(families),
+            ),
+        )
+        links.extend(families)
+
+    family_rows = []
+    for family in structure.families.values():
+        children = [
+            individual_index[child]
+            for child in family.children
+            if child in individual_index
+        ]
+        family_rows.append(
+            _FAMILY.pack(
+                strings.add(family.id),
+                individual_index.get(family.husband, NONE),
+                individual_index.get(family.wife, NONE),
+                len(links),
+                len(children),
+            ),
+        )
+        links.extend(children)
+
+    xrefs = sorted(
+        [(xref, _INDIVIDUAL_KIND, i) for xref, i in individual_index.items()]
+        + [(xref, _FAMILY_KIND, i) for xref, i in family_index.items()],
+        key=lambda row: row[0].encode(),
+    )
+    xref_rows = b"".join(
+        _XREF.pack(strings.ids[xref], kind, index) for xref, kind, index in xrefs
+    )
+
+    data = bytearray(_HEADER.size)
+    offsets = []
+    for section in (
+        strings.pack(),
+        b"".join(individual_rows),
+        b"".join(family_rows),
+        struct.pack(f"<{len(links)}I", *links),
+        xref_rows,
+    ):
+        _pad(data)
+        offsets.append(len(data))
+        data.extend(section)
+
+    _HEADER.pack_into(
+        data,
+        0,
+        MAGIC,
+        VERSION,
+        *offsets,
+        len(structure.individuals),
+        len(structure.families),
+    )
+    return bytes(data)
+
+
+def to_shared_memory(
+    structure: GedcomStructure,
+    name: str | None = None,
+) -> SharedMemory:
+    """Export a tree into a new shared memory block.
+
+    The caller owns the block: close and ``unlink`` it once workers are done.
+    Workers attach with ``FlatTree.from_shared_memory(block.name)``.
+    """
+    data = export_tree(structure)
+    block = SharedMemory(name=name, create=True, size=len(data))
+    block.buf[: len(data)] = data
+    return block
+
+
+def to_file(structure: GedcomStructure, path: str | os.PathLike[str]) -> None:
+    """Export a tree into a file, to be mapped with ``FlatTree.from_file``."""
+    Path(path).write_bytes(export_tree(structure))
+
+
+class FlatIndividual:
+    """Read-only view of an individual row; fields are read on access."""
+
+    __slots__ = ("index", "tree")
+
+    def __init__(self, tree: FlatTree, index: int) -> None:
+        self.tree = tree
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"FlatIndividual({self.id!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FlatIndividual):
+            return NotImplemented
+        return (self.tree, self.index) == (other.tree, other.index)
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    def _row(self) -> tuple[int, ...]:
+        return self.tree.individual_row(self.index)
+
+    @property
+    def id(self) -> str:
+        return self.tree.string(self._row()[0])
+
+    @property
+    def name(self) -> str | None:
+        return self.tree.string(self._row()[1])
+
+    @property
+    def given_name(self) -> str | None:
+        return self.tree.string(self._row()[2])
+
+    @property
+    def surname(self) -> str | None:
+        return self.tree.string(self._row()[3])
+
+    @property
+    def sex(self) -> str | None:
+        return self.tree.string(self._row()[4])
+
+    @property
+    def email(self) -> str | None:
+        return self.tree.string(self._row()[5])
+
+    @property
+    def families(self) -> tuple[FlatFamily, ...]:
+        """Families this individual is a child of."""
+        _, _, _, _, _, _, start, count = self._row()
+        return tuple(self.tree.family(i) for i in self.tree.links(start, count))
+
+    def to_record(self) -> Individual:
+        """Copy the row into a regular ``Individual``."""
+        string = self.tree.string
+        id_, name, given_name, surname, sex, email, start, count = self._row()
+        return Individual(
+            id=string(id_),
+            name=string(name),
+            given_name=string(given_name),
+            surname=string(surname),
+            sex=string(sex),
+            email=string(email),
+            families=[self.tree.family(i).id for i in self.tree.links(start, count)],
+        )
+
+
+class FlatFamily:
+    """Read-only view of a family row; fields are read on access."""
+
+    __slots__ = ("index", "tree")
+
+    def __init__(self, tree: FlatTree, index: int) -> None:
+        self.tree = tree
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"FlatFamily({self.id!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FlatFamily):
+            return NotImplemented
+        return (self.tree, self.index) == (other.tree, other.index)
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    def _row(self) -> tuple[int, ...]:
+        return self.tree.family_row(self.index)
+
+    @property
+    def id(self) -> str:
+        return self.tree.string(self._row()[0])
+
+    @property
+    def husband(self) -> FlatIndividual | None:
+        index = self._row()[1]
+        return None if index == NONE else self.tree.individual(index)
+
+    @property
+    def wife(self) -> FlatIndividual | None:
+        index = self._row()[2]
+        return None if index == NONE else self.tree.individual(index)
+
+    @property
+    def children(self) -> tuple[FlatIndividual, ...]:
+        _, _, _, start, count = self._row()
+        return tuple(self.tree.individual(i) for i in self.tree.links(start, count))
+
+    def to_record(self) -> Family:
+        """Copy the row into a regular ``Family``."""
+        husband, wife = self.husband, self.wife
+        return Family(
+            id=self.id,
+            husband=husband.id if husband else None,
+            wife=wife.id if wife else None,
+            children=[child.id for child in self.children],
+        )
+
+
+class FlatTree:
+    """Read-only accessors over a buffer written by ``export_tree``."""
+
+    HEADER_SIZE: ClassVar[int] = _HEADER.size
+
+    def __init__(self, buffer: bytes | memoryview | mmap.mmap) -> None:
+        self._owner: SharedMemory | mmap.mmap | None = None
+        self.buffer = memoryview(buffer).toreadonly()
+
+        magic, version, *offsets, individuals, families = _HEADER.unpack_from(
+            self.buffer,
+        )
+        if magic != MAGIC or version != VERSION:
+            msg = "Not a flat GEDCOM tree buffer"
+            raise ValueError(msg)
+        (
+            self._strings,
+            self._individuals,
+            self._families,
+            self._links,
+            self._xrefs,
+        ) = offsets
+        self.individual_count = individuals
+        self.family_count = families
+        (self._string_count,) = _U32.unpack_from(self.buffer, self._strings)
+        self._blob = self._strings + 4 * (self._string_count + 2)
+
+    @classmethod
+    def from_shared_memory(cls, name: str) -> Self:
+        """Attach to a block created by ``to_shared_memory``."""
+        block = SharedMemory(name=name, track=False)
+        tree = cls(block.buf)
+        tree._owner = block
+        return tree
+
+    @classmethod
+    def from_file(cls, path: str | os.PathLike[str]) -> Self:
+        """Map a file written by ``to_file``; pages are shared between processes."""
+        with Path(path).open("rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        tree = cls(mapped)
+        tree._owner = mapped
+        return tree
+
+    def close(self) -> None:
+        """Release the buffer, and the shared memory or mapping it came from."""
+        self.buffer.release()
+        if self._owner is not None:
+            self._owner.close()
+            self._owner = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def string(self, string_id: int) -> str | None:
+        if string_id == NONE:
+            return None
+        start, end = struct.unpack_from(
+            "<2I",
+            self.buffer,
+            self._strings + 4 * (string_id + 1),
+        )
+        return str(self.buffer[self._blob + start : self._blob + end], "utf-8")
+
+    def individual_row(self, index: int) -> tuple[int, ...]:
+        if not 0 <= index < self.individual_count:
+            raise IndexError(index)
+        return _INDIVIDUAL.unpack_from(
+            self.buffer,
+            self._individuals + index * _INDIVIDUAL.size,
+        )
+
+    def family_row(self, index: int) -> tuple[int, ...]:
+        if not 0 <= index < self.family_count:
+            raise IndexError(index)
+        return _FAMILY.unpack_from(self.buffer, self._families + index * _FAMILY.size)
+
+    def links(self, start: int, count: int) -> tuple[int, ...]:
+        return struct.unpack_from(f"<{count}I", self.buffer, self._links + 4 * start)
+
+    def individual(self, index: int) -> FlatIndividual:
+        self.individual_row(index)
+        return FlatIndividual(self, index)
+
+    def family(self, index: int) -> FlatFamily:
+        self.family_row(index)
+        return FlatFamily(self, index)
+
+    def individuals(self) -> Iterator[FlatIndividual]:
+        return (FlatIndividual(self, i) for i in range(self.individual_count))
+
+    def families(self) -> Iterator[FlatFamily]:
+        return (FlatFamily(self, i) for i in range(self.family_count))
+
+    def _xref_row(self, position: int) -> tuple[int, int, int]:
+        return _XREF.unpack_from(self.buffer, self._xrefs + position * _XREF.size)
+
+    def find(self, xref: str) -> FlatIndividual | FlatFamily | None:
+        """Look up a record by xref, by binary search over the xref index."""
+        count = self.individual_count + self.family_count
+        key = xref.encode()
+
+        def xref_at(position: int) -> bytes:
+            string_id, _, _ = self._xref_row(position)
+            start, end = struct.unpack_from(
+                "<2I",
+                self.buffer,
+                self._strings + 4 * (string_id + 1),
+            )
+            return bytes(self.buffer[self._blob + start : self._blob + end])
+
+        position = bisect.bisect_left(range(count), key, key=xref_at)
+        if position == count or xref_at(position) != key:
+            return None
+        _, kind, index = self._xref_row(position)
+        if kind == _INDIVIDUAL_KIND:
+            return FlatIndividual(self, index)
+        return FlatFamily(self, index)
@@ -0,0 +1,209 @@
+"""Inventory of the media files a tree references."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import unquote, urlsplit
+
+import attrs
+
+from rootsy.models import GedcomStructure, Multimedia
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable, Iterator
+
+    from rootsy.models import MultimediaFile
+
+# Bytes read at a time when hashing.
+CHUNK_SIZE = 1 << 20
+# Files hashed at once; hashing is I/O bound, so a few more than the CPUs.
+DEFAULT_WORKERS = 8
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class MediaEntry:
+    """One referenced file, as found on disk."""
+
+    xref: str
+    reference: str
+    # None for references that aren't local files, e.g. URLs.
+    path: Path | None = None
+    exists: bool = False
+    size: int | None = None
+    mtime_ns: int | None = None
+    sha256: str | None = None
+    error: str | None = None
+
+
+@attrs.frozen(slots=True)
+class _CachedDigest:
+    mtime_ns: int
+    size: int
+    sha256: str
+
+
+class ManifestCache:
+    """Content hashes by path, valid while the size and mtime don't change.
+
+    The cache can be saved to and loaded from a JSON file, so that re-runs of
+    a manifest only read the files that changed. It is safe to share between
+    threads.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, _CachedDigest] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: Path, mtime_ns: int, size: int) -> str | None:
+        cached = self._entries.get(str(path))
+        if cached is None or (cached.mtime_ns, cached.size) != (mtime_ns, size):
+            return None
+        return cached.sha256
+
+    def put(self, path: Path, mtime_ns: int, size: int, sha256: str) -> None:
+        with self._lock:
+            self._entries[str(path)] = _CachedDigest(mtime_ns, size, sha256)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> ManifestCache:
+        """Read a saved cache; a missing file gives an empty cache."""
+        cache = cls()
+        try:
+            entries = json.loads(Path(path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cache
+        for file_path, (mtime_ns, size, sha256) in entries.items():
+            cache._entries[file_path] = _CachedDigest(mtime_ns, size, sha256)
+        return cache
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        with self._lock:
+            entries = {
+                file_path: [cached.mtime_ns, cached.size, cached.sha256]
+                for file_path, cached in self._entries.items()
+            }
+        Path(path).write_text(json.dumps(entries), encoding="utf-8")
+
+
+def media_files(structure: GedcomStructure) -> Iterator[tuple[str, MultimediaFile]]:
+    """Yield the FILE references of every multimedia record, by record xref.
+
+    Only OBJE records are parsed, and they aren't added to the structure's
+    cache of resolved records.
+    """
+    shared = structure.shared
+    for xref in shared:
+        if shared.tag_of(xref) != Multimedia.tag:
+            continue
+        if isinstance(record := shared.resolve(xref, cache=False), Multimedia):
+            for file in record.files:
+                yield xref, file
+
+
+def local_path(reference: str, base_dir: Path) -> Path | None:
+    """Resolve a FILE reference to a local path, or None for remote URLs.
+
+    Relative paths are taken relative to ``base_dir``, usually the directory
+    of the GEDCOM file.
+    """
+    parts = urlsplit(reference)
+    if parts.scheme == "file":
+        return Path(unquote(parts.path))
+    # One-letter schemes are Windows drive letters, not URLs.
+    if len(parts.scheme) > 1:
+        return None
+    return base_dir / reference
+
+
+def hash_file(path: Path, chunk_size: int = CHUNK_SIZE) -> str:
+    """SHA-256 of a file, read in chunks into one reused buffer."""
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with path.open("rb", buffering=0) as file:
+        while read := file.readinto(buffer):
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def _inspect(
+    path: Path,
+    cache: ManifestCache | None,
+    chunk_size: int,
+) -> tuple[int | None, int | None, str | None, str | None]:
+    """Return the size, mtime, hash and error of a file."""
+    try:
+        stat = path.stat()
+        sha256 = cache.get(path, stat.st_mtime_ns, stat.st_size) if cache else None
+        if sha256 is None:
+            sha256 = hash_file(path, chunk_size)
+            if cache is not None:
+                cache.put(path, stat.st_mtime_ns, stat.st_size, sha256)
+    except FileNotFoundError:
+        return None, None, None, None
+    except OSError as error:
+        return None, None, None, f"{type(error).__name__}: {error}"
+    return stat.st_size, stat.st_mtime_ns, sha256, None
+
+
+def build_manifest(
+    references: GedcomStructure | Iterable[tuple[str, MultimediaFile]],
+    base_dir: str | os.PathLike[str] = ".",
+    *,
+    workers: int = DEFAULT_WORKERS,
+    cache: ManifestCache | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> list[MediaEntry]:
+    """Stat, size and hash the local files a tree references.
+
+    ``references`` is a parsed structure or ``(xref, MultimediaFile)`` pairs,
+    such as ``media_files`` yields. Files are hashed by a pool of ``workers``
+    threads, each file once however often it is referenced. Files whose size
+    and mtime match the ``cache`` aren't read again.
+    """
+    if isinstance(references, GedcomStructure):
+        references = media_files(references)
+    base = Path(base_dir)
+    pairs = [
+        (xref, file.reference, local_path(file.reference, base))
+        for xref, file in references
+    ]
+
+    paths = list(dict.fromkeys(path for _, _, path in pairs if path is not None))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = dict(
+            zip(
+                paths,
+                executor.map(lambda path: _inspect(path, cache, chunk_size), paths),
+                strict=True,
+            ),
+        )
+
+    entries = []
+    for xref, reference, path in pairs:
+        if path is None:
+            entries.append(MediaEntry(xref=xref, reference=reference))
+            continue
+        size, mtime_ns, sha256, error = results[path]
+        entries.append(
+            MediaEntry(
+                xref=xref,
+                reference=reference,
+                path=path,
+                exists=sha256 is not None,
+                size=size,
+                mtime_ns=mtime_ns,
+                sha256=sha256,
+                error=error,
+            ),
+        )
+    return entries
@@ -1,7 +1,11 @@
 from .address import Address
+from .citation import Citation
 from .event import Event, EventDetail, EventType
+from .extension import ExtensionRecord
 from .family import Family
 from .header import Header, HeaderSource, UnsupportedGedcomVersionError
 from .individual import Individual
-from .multimedia import Multimedia
+from .multimedia import Multimedia, MultimediaFile
+from .note import Note
+from .source import Source
 from .stucture import GedcomStructure
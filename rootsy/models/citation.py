@@ -0,0 +1,22 @@
+from typing import ClassVar
+
+import attrs
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class Citation:
+    """A pointer from a record to a shared NOTE, SOUR or OBJE record.
+
+    Only the xref is kept; the record it points to is resolved through the
+    structure, see ``GedcomStructure.resolve``. Equal citations are equal
+    values, so the compactor can share one instance between every record that
+    cites the same source.
+    """
+
+    # Tags whose level-1 pointers are stored as citations.
+    TAGS: ClassVar[frozenset[str]] = frozenset({"SOUR", "NOTE", "SNOTE", "OBJE"})
+
+    tag: str
+    xref: str
+    # SOUR.PAGE: where in the source the information was found.
+    page: str | None = None
@@ -1,10 +1,12 @@
 import datetime
+from collections.abc import Sequence
 from enum import Enum, auto
 from typing import Any, ClassVar
 
 import attrs
 
 from rootsy.adapters import GedcomRecord
+from rootsy.models import Citation
 
 
 class EventType(Enum):
@@ -15,6 +17,9 @@ class EventType(Enum):
     MARRIAGE = auto()
     DIVORCE = auto()
     BAPTISM = auto()
+    RESIDENCE = auto()
+    # Generic EVEN event, described by its TYPE
+    EVENT = auto()
 
 
 @attrs.frozen(slots=True, kw_only=True)
@@ -25,7 +30,15 @@ class Event(GedcomRecord):
 
     type: EventType
     date: datetime.date | None = None
+    # DATE value as written, e.g. "ABT 1850", when it isn't a single day
+    date_value: str | None = None
+    # PLAC value as parsed. Events of a GedcomStructure only keep place_id;
+    # see PlaceTable.full_name for its name.
     place: str | None = None
+    # Id of the place in the structure's PlaceTable
+    place_id: int | None = None
+    citations: Sequence[Citation] = attrs.field(factory=list)
+    # Other substructures, e.g. the TYPE describing a generic EVEN event
     additional_details: dict[str, Any] = attrs.field(factory=dict)
 
 
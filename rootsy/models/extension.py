@@ -0,0 +1,24 @@
+from typing import ClassVar
+
+import attrs
+
+from rootsy.adapters import GedcomRecord
+from rootsy.types import GedcomLine
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class ExtensionRecord(GedcomRecord):
+    """An extension (``_TAG``) structure that no plugin parser handles.
+
+    The substructure lines are kept as they were read, so the data is
+    preserved without interpreting it.
+    """
+
+    tag: ClassVar[str] = "_"
+
+    extension_tag: str
+    xref: str | None = None
+    value: str = ""
+    # Schema URI declared for the tag in HEAD.SCHMA, if any.
+    uri: str | None = None
+    substructures: tuple[GedcomLine, ...] = ()
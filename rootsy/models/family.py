@@ -1,9 +1,10 @@
+from collections.abc import Sequence
 from typing import ClassVar
 
 import attrs
 
 from rootsy.adapters import GedcomRecord
-from rootsy.models import Event
+from rootsy.models import Citation, Event, EventType
 
 
 @attrs.frozen(slots=True, kw_only=True)
@@ -21,6 +22,19 @@ class Family(GedcomRecord):
     id: str
     husband: str | None = None
     wife: str | None = None
-    children: list[str] = attrs.field(factory=list)
-    marriage_event: Event | None = None
-    divorce_event: Event | None = None
+    children: Sequence[str] = attrs.field(factory=list)
+    events: Sequence[Event] = attrs.field(factory=list)
+    citations: Sequence[Citation] = attrs.field(factory=list)
+    # Level-1 extension (_TAG) substructures.
+    extensions: Sequence[GedcomRecord] = attrs.field(factory=list)
+
+    @property
+    def marriage_event(self) -> Event | None:
+        return self._first_event(EventType.MARRIAGE)
+
+    @property
+    def divorce_event(self) -> Event | None:
+        return self._first_event(EventType.DIVORCE)
+
+    def _first_event(self, event_type: EventType) -> Event | None:
+        return next((event for event in self.events if event.type is event_type), None)
@@ -44,6 +44,8 @@ class Header(GedcomRecord):
     transmission_date: datetime.date | None = None
     language: str | None = None
     copyright: str | None = None
+    # Extension tags declared in HEAD.SCHMA, mapped to their URI.
+    schema: dict[str, str] = attrs.field(factory=dict)
 
     def validate_version(self, __: str, value: str) -> None:
         """Validate if this is a supported version."""
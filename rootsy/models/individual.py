@@ -1,9 +1,10 @@
+from collections.abc import Sequence
 from typing import ClassVar
 
 import attrs
 
 from rootsy.adapters import GedcomRecord
-from rootsy.models import Event, EventDetail
+from rootsy.models import Citation, Event, EventDetail
 
 
 @attrs.frozen(slots=True, kw_only=True)
@@ -17,10 +18,13 @@ class Individual(GedcomRecord):
     given_name: str | None = None
     surname: str | None = None
     sex: str | None = None
-    events: list[Event] = attrs.field(factory=list)
-    families: list[str] = attrs.field(factory=list)  # Family references
-    parents: list[str] = attrs.field(factory=list)
+    events: Sequence[Event] = attrs.field(factory=list)
+    families: Sequence[str] = attrs.field(factory=list)  # Family references
+    parents: Sequence[str] = attrs.field(factory=list)
+    citations: Sequence[Citation] = attrs.field(factory=list)
     email: str | None = None
+    # Level-1 extension (_TAG) substructures.
+    extensions: Sequence[GedcomRecord] = attrs.field(factory=list)
 
 
 class IndividualEventDetail(EventDetail):
@@ -1,7 +1,29 @@
+from collections.abc import Sequence
 from typing import ClassVar
 
+import attrs
+
 from rootsy.adapters import GedcomRecord
 
 
+@attrs.frozen(slots=True, kw_only=True)
+class MultimediaFile:
+    """A FILE reference of a multimedia record."""
+
+    # Path or URL, as written in the file.
+    reference: str
+    # FORM: a file extension in 5.5.1, a media type (e.g. image/jpeg) in 7.0.
+    format: str | None = None
+    # FORM.TYPE (5.5.1) or FORM.MEDI (7.0), e.g. PHOTO.
+    media_type: str | None = None
+    title: str | None = None
+
+
+@attrs.frozen(slots=True, kw_only=True)
 class Multimedia(GedcomRecord):
     tag: ClassVar[str] = "OBJE"
+
+    id: str
+    title: str | None = None
+    files: Sequence[MultimediaFile] = attrs.field(factory=list)
+    notes: Sequence[str] = attrs.field(factory=list)  # Note references
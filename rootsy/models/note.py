@@ -0,0 +1,17 @@
+from typing import ClassVar
+
+import attrs
+
+from rootsy.adapters import GedcomRecord
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class Note(GedcomRecord):
+    """A shared note record (NOTE in 5.5.1, SNOTE in 7.0)."""
+
+    tag: ClassVar[str] = "NOTE"
+
+    id: str
+    text: str = ""
+    language: str | None = None
+    mime_type: str | None = None
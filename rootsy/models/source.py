@@ -0,0 +1,22 @@
+from collections.abc import Sequence
+from typing import ClassVar
+
+import attrs
+
+from rootsy.adapters import GedcomRecord
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class Source(GedcomRecord):
+    """A source record, describing where cited information comes from."""
+
+    tag: ClassVar[str] = "SOUR"
+
+    id: str
+    title: str | None = None
+    author: str | None = None
+    abbreviation: str | None = None
+    publication: str | None = None
+    text: str | None = None
+    repositories: Sequence[str] = attrs.field(factory=list)  # Repository references
+    notes: Sequence[str] = attrs.field(factory=list)  # Note references
@@ -3,7 +3,35 @@ from typing import Any
 
 import attrs
 
-from rootsy.models import Family, Header, Individual
+from rootsy.adapters import GedcomRecord
+from rootsy.events import EventTable, RecordEvents
+from rootsy.models import Citation, ExtensionRecord, Family, Header, Individual
+from rootsy.places import PlaceTable
+from rootsy.references import DeferredRecord, SharedRecords
+
+
+def serialize_value(_: object, __: object, value: Any) -> Any:  # noqa: ANN401
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, PlaceTable):
+        return [attrs.asdict(place) for place in value]
+    if isinstance(value, EventTable | SharedRecords):
+        return value.to_dict()
+    if isinstance(value, RecordEvents):
+        return [
+            attrs.asdict(event, value_serializer=serialize_value) for event in value
+        ]
+    return value
+
+
+def _with_event_view[Record: (Individual, Family)](
+    record: Record,
+    table: EventTable,
+) -> Record:
+    # Records parsed for this structure already have their view of the table.
+    if not record.events or isinstance(record.events, RecordEvents):
+        return record
+    return attrs.evolve(record, events=table.extend(record.id, record.events))
 
 
 @attrs.define(slots=True, kw_only=True)
@@ -13,20 +41,44 @@ class GedcomStructure:
     header: Header
     individuals: dict[str, Individual] = attrs.field(factory=dict)
     families: dict[str, Family] = attrs.field(factory=dict)
+    places: PlaceTable = attrs.field(factory=PlaceTable, eq=False)
+    # Events of all individuals and families, stored column-wise.
+    events: EventTable = attrs.field(
+        default=attrs.Factory(lambda self: EventTable(self.places), takes_self=True),
+        eq=False,
+    )
+    # NOTE, SOUR and OBJE records, parsed when a citation is first resolved.
+    shared: SharedRecords = attrs.field(factory=SharedRecords, eq=False)
+    # Top-level extension records without a plugin parser.
+    extensions: list[ExtensionRecord] = attrs.field(factory=list)
 
     def add_individual(self, individual: Individual) -> None:
-        """Add an individual to the GedcomStructure."""
-        self.individuals[individual.id] = individual
+        """Add an individual to the GedcomStructure.
+
+        Its events move to the event table, and ``Individual.events`` becomes
+        a view that builds them from there when accessed.
+        """
+        self.individuals[individual.id] = _with_event_view(individual, self.events)
 
     def add_family(self, family: Family) -> None:
-        """Add a family to the GedcomStructure."""
-        self.families[family.id] = family
+        """Add a family to the GedcomStructure, its events as for individuals."""
+        self.families[family.id] = _with_event_view(family, self.events)
+
+    def add_shared(self, record: DeferredRecord) -> None:
+        """Add a shared record to the GedcomStructure, to be parsed on demand."""
+        self.shared.add(record)
+
+    def resolve(self, reference: Citation | str) -> GedcomRecord | None:
+        """Return the shared record a citation or xref points to."""
+        return self.shared.resolve(reference)
+
+    def add_extension(self, extension: ExtensionRecord) -> None:
+        """Add an unparsed extension record to the GedcomStructure."""
+        self.extensions.append(extension)
 
     def to_dict(self) -> dict[str, Any]:
         """Convert the GedcomStructure to a dictionary."""
         return attrs.asdict(
             self,
-            value_serializer=lambda _, __, value: value.isoformat()
-            if isinstance(value, datetime.datetime)
-            else value,
+            value_serializer=serialize_value,
         )
@@ -1,34 +1,102 @@
 from __future__ import annotations
 
-from pathlib import Path
+from typing import TYPE_CHECKING
 
-from rootsy.models import GedcomStructure
+from rootsy.compact import Compactor
+from rootsy.models import (
+    ExtensionRecord,
+    Family,
+    GedcomStructure,
+    Header,
+    Individual,
+)
 from rootsy.reader import GedcomReader
+from rootsy.references import DeferredRecord, is_shared
 from rootsy.registry import get_parser_for_tag
 from rootsy.types import ParsingContext
 
+if TYPE_CHECKING:
+    from collections.abc import Mapping
 
-def parse_gedcom(file_path: Path | str) -> GedcomStructure:
-    """Parse a complete GEDCOM file."""
-    reader = GedcomReader(Path(file_path))
-    structure = None
+    from rootsy.adapters import GedcomRecord
+    from rootsy.events import EventTable
+    from rootsy.projection import Projection
+    from rootsy.reader import GedcomSource
+    from rootsy.types import GedcomLine
 
-    for line_group in reader.line_groups():
-        first_line = line_group[0]
 
-        if first_line.tag == "TRLR":
-            break
+def parse_record(
+    group: list[GedcomLine],
+    compactor: Compactor | None = None,
+    schema: Mapping[str, str] | None = None,
+    events: EventTable | None = None,
+) -> GedcomRecord | None:
+    """Parse a level-0 record group, or return None if it has no parser.
+
+    ``schema`` maps extension tags to the URIs declared in HEAD.SCHMA. Events
+    are added to the ``events`` table of the structure the record is for, if
+    given, so the record is built with its view of them. Each call gets its own
+    ``ParsingContext``, so groups can be parsed from several threads at once,
+    as long as they don't share an event table.
+    """
+    # Shared records are only parsed once something resolves them.
+    if is_shared(group):
+        return DeferredRecord.from_group(group)
+    # Record types without a parser yet (SUBM, REPO, ...) are skipped.
+    if (parser := get_parser_for_tag(group[0].tag, schema)) is None:
+        return None
+
+    # Parsers compact the records they build, rather than building them twice.
+    result, _ = parser.parse(group, ParsingContext(compactor, schema, events))
+    return result
+
+
+def add_record(
+    structure: GedcomStructure | None,
+    record: GedcomRecord,
+) -> GedcomStructure | None:
+    """Store a parsed record, creating the structure from the header."""
+    match record:
+        case Header():
+            structure = GedcomStructure(header=record)
+        case Individual():
+            structure.add_individual(record)
+        case Family():
+            structure.add_family(record)
+        case DeferredRecord():
+            structure.add_shared(record)
+        case ExtensionRecord():
+            structure.add_extension(record)
+    return structure
+
 
-        parser = get_parser_for_tag(first_line.tag)
+def parse_gedcom(
+    source: GedcomSource,
+    *,
+    compact: bool = False,
+    projection: Projection | None = None,
+) -> GedcomStructure:
+    """Parse a complete GEDCOM file.
 
-        result, line_ = parser.parse(line_group, ParsingContext())
+    ``source`` is anything ``GedcomReader`` accepts: a path, an in-memory
+    payload or a binary file object.
+
+    With ``compact`` set, records are stored with tuples instead of lists and
+    with repeated strings shared, see ``rootsy.compact.Compactor``. A
+    ``projection`` limits parsing to the records and fields it keeps.
+    """
+    reader = GedcomReader(source, projection=projection)
+    compactor = Compactor() if compact else None
+    structure = None
+
+    for line_group in reader.line_groups():
+        if line_group[0].tag == "TRLR":
+            break
 
-        match first_line.tag:
-            case "HEAD":
-                structure = GedcomStructure(header=result)
-            case "INDI":
-                structure.add_individual(result)
-            case "FAM":
-                structure.add_family(result)
+        schema, events = (
+            (structure.header.schema, structure.events) if structure else (None, None)
+        )
+        if (record := parse_record(line_group, compactor, schema, events)) is not None:
+            structure = add_record(structure, record)
 
     return structure
@@ -1,14 +1,44 @@
-from .address import AddressParser
-from .family import FamilyParser
-from .header import HeaderParser, HeaderSourceParser
-from .individual import IndividualParser
-from .multimedia import MultimediaParser
+import importlib
+from typing import Any
+
+# Parser modules are imported on first access, so that using one parser
+# doesn't import all of them.
+_PARSER_MODULES = {
+    "AddressParser": ".address",
+    "EventParser": ".event",
+    "ExtensionParser": ".extension",
+    "FamilyParser": ".family",
+    "HeaderParser": ".header",
+    "HeaderSourceParser": ".header",
+    "IndividualParser": ".individual",
+    "MultimediaParser": ".multimedia",
+    "NoteParser": ".note",
+    "SourceParser": ".source",
+}
 
 __all__ = [
     "AddressParser",
+    "EventParser",
+    "ExtensionParser",
     "FamilyParser",
     "HeaderParser",
     "HeaderSourceParser",
     "IndividualParser",
     "MultimediaParser",
+    "NoteParser",
+    "SourceParser",
 ]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    if (module_name := _PARSER_MODULES.get(name)) is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,79 @@
+from collections.abc import Sequence
+from typing import Any, ClassVar
+
+import attrs
+
+from rootsy.adapters import GedcomParser
+from rootsy.dates import parse_exact_date
+from rootsy.models import Citation, Event, EventType
+from rootsy.types import GedcomLine, ParsingContext, is_pointer
+
+# Event tags of individual and family records.
+EVENT_TAGS = {
+    "BIRT": EventType.BIRTH,
+    "DEAT": EventType.DEATH,
+    "BAPM": EventType.BAPTISM,
+    "RESI": EventType.RESIDENCE,
+    "MARR": EventType.MARRIAGE,
+    "DIV": EventType.DIVORCE,
+    "EVEN": EventType.EVENT,
+}
+
+
+@attrs.frozen
+class EventParser(GedcomParser[Event]):
+    """Parser for event structures such as BIRT or MARR."""
+
+    handles_tag: ClassVar[str] = Event.tag
+
+    def parse(
+        self,
+        lines: Sequence[GedcomLine],
+        context: ParsingContext,
+    ) -> tuple[Event, int]:
+        data: dict[str, Any] = {
+            "type": EVENT_TAGS[lines[0].tag],
+            "citations": [],
+            "additional_details": {},
+        }
+        lines_consumed = 0
+        level = lines[0].level
+        citing = False
+
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+
+            # If we've returned to the event's level or higher, we're done
+            if i > 0 and line.level <= lines[0].level:
+                break
+
+            context.enter_level(line)
+            lines_consumed += 1
+            if line.level == level + 1:
+                citing = False
+
+            match line.tag:
+                case "DATE" if line.level == level + 1:
+                    data["date"] = parse_exact_date(line.value)
+                    if data["date"] is None:
+                        data["date_value"] = line.value
+                case "PLAC" if line.level == level + 1:
+                    data["place"] = line.value
+                case "TYPE" if line.level == level + 1:
+                    data["additional_details"]["type"] = line.value
+                # Citations of the event, as for records.
+                case tag if (
+                    tag in Citation.TAGS
+                    and line.level == level + 1
+                    and is_pointer(line.value)
+                ):
+                    data["citations"].append(Citation(tag=tag, xref=line.value))
+                    citing = True
+                case "PAGE" if citing and line.level == level + 2:
+                    citation = data["citations"][-1]
+                    data["citations"][-1] = attrs.evolve(citation, page=line.value)
+
+            i += 1
+
+        return Event(**data), lines_consumed
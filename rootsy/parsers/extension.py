@@ -0,0 +1,39 @@
+from collections.abc import Sequence
+from typing import ClassVar
+
+import attrs
+
+from rootsy.adapters import GedcomParser
+from rootsy.models import ExtensionRecord
+from rootsy.types import GedcomLine, ParsingContext
+
+
+@attrs.frozen
+class ExtensionParser(GedcomParser[ExtensionRecord]):
+    """Fallback parser capturing the subtree of an unknown extension tag."""
+
+    handles_tag: ClassVar[str] = ExtensionRecord.tag
+
+    uri: str | None = None
+
+    def parse(
+        self,
+        lines: Sequence[GedcomLine],
+        context: ParsingContext,
+    ) -> tuple[ExtensionRecord, int]:
+        first = lines[0]
+        context.enter_level(first)
+
+        # The subtree ends at the first line back at the extension's level.
+        end = 1
+        while end < len(lines) and lines[end].level > first.level:
+            end += 1
+
+        record = ExtensionRecord(
+            extension_tag=first.tag,
+            xref=first.xref,
+            value=first.value,
+            uri=self.uri,
+            substructures=tuple(lines[1:end]),
+        )
+        return record, end
@@ -1,9 +1,12 @@
 from collections.abc import Sequence
 from typing import Any, ClassVar
 
+import attrs
+
 from rootsy.adapters import GedcomParser
-from rootsy.models import Family
-from rootsy.types import GedcomLine, ParsingContext
+from rootsy.models import Citation, Family
+from rootsy.registry import get_parser_for_tag, is_extension_tag
+from rootsy.types import GedcomLine, ParsingContext, is_pointer
 
 
 class FamilyParser(GedcomParser[Family]):
@@ -17,8 +20,12 @@ class FamilyParser(GedcomParser[Family]):
         """Parse record from GEDCOM lines."""
         data: dict[str, Any] = {
             "children": [],
+            "events": [],
+            "citations": [],
+            "extensions": [],
         }
         lines_consumed = 0
+        citing = False
 
         # Process each line
         i = 0
@@ -32,6 +39,9 @@ class FamilyParser(GedcomParser[Family]):
             # Update context
             context.enter_level(line)
             lines_consumed += 1
+            if line.level == 1:
+                # Whether this substructure is a citation, for its PAGE.
+                citing = False
 
             match line.tag:
                 case "FAM":
@@ -42,7 +52,35 @@ class FamilyParser(GedcomParser[Family]):
                     data["wife"] = line.value
                 case "CHIL":
                     data["children"].append(line.value)
+                case "MARR" | "DIV" | "EVEN" if line.level == 1:
+                    # Delegate to event parser
+                    if event_parser := get_parser_for_tag("EVEN", context.schema):
+                        event, event_lines = event_parser.parse(lines[i:], context)
+                        data["events"].append(event)
+                        lines_consumed += event_lines - 1
+                        i += event_lines - 1
+                # Extension substructures, parsed by a plugin or kept as is.
+                case tag if line.level == 1 and is_extension_tag(tag):
+                    if parser := get_parser_for_tag(tag, context.schema):
+                        extension, extension_lines = parser.parse(lines[i:], context)
+                        data["extensions"].append(extension)
+                        lines_consumed += extension_lines - 1
+                        i += extension_lines - 1
+                # Pointers to shared records; the records are resolved lazily.
+                case tag if (
+                    tag in Citation.TAGS and line.level == 1 and is_pointer(line.value)
+                ):
+                    data["citations"].append(Citation(tag=tag, xref=line.value))
+                    citing = True
+                case "PAGE" if line.level == 2 and context.path[-2] == "SOUR":  # noqa: PLR2004
+                    if citing:
+                        citation = data["citations"][-1]
+                        data["citations"][-1] = attrs.evolve(citation, page=line.value)
 
             i += 1
 
+        if compactor := context.compactor:
+            data = compactor.family_fields(data)
+        if context.events is not None and data["events"]:
+            data["events"] = context.events.extend(data["id"], data["events"])
         return Family(**data), lines_consumed
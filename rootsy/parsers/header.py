@@ -54,15 +54,19 @@ class HeaderParser(GedcomParser[Header]):
                     data["version"] = line.value
 
                 case "SOUR":
-                    # Delegate to source parser
-                    if source_parser := get_parser_for_tag("SOUR"):
-                        source_result, source_lines = source_parser.parse(
-                            lines[i:],
-                            context,
-                        )
-                        data["source"] = source_result
-                        lines_consumed += source_lines - 1
-                        i += source_lines - 1
+                    # Delegate to source parser. The registry's SOUR parser is
+                    # for level-0 source records, not the header's.
+                    source_result, source_lines = HeaderSourceParser().parse(
+                        lines[i:],
+                        context,
+                    )
+                    data["source"] = source_result
+                    lines_consumed += source_lines - 1
+                    i += source_lines - 1
+
+                case "TAG" if context.path[-2] == "SCHMA":
+                    tag, _, uri = line.value.partition(" ")
+                    data.setdefault("schema", {})[tag] = uri.strip()
 
                 case "CHAR":
                     data["encoding"] = line.value
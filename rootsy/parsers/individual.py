@@ -1,15 +1,18 @@
 from collections.abc import Sequence
 from typing import Any, ClassVar
 
+import attrs
+
 from rootsy.adapters import GedcomParser
-from rootsy.models import Individual
-from rootsy.types import GedcomLine, ParsingContext
+from rootsy.models import Citation, Individual
+from rootsy.registry import get_parser_for_tag, is_extension_tag
+from rootsy.types import GedcomLine, ParsingContext, is_pointer
 
 
 class IndividualParser(GedcomParser[Individual]):
     handles_tag: ClassVar[str] = "INDI"
 
-    def parse(
+    def parse(  # noqa: PLR0915
         self,
         lines: Sequence[GedcomLine],
         context: ParsingContext,
@@ -18,8 +21,11 @@ class IndividualParser(GedcomParser[Individual]):
             "events": [],
             "families": [],
             "parents": [],
+            "citations": [],
+            "extensions": [],
         }
         lines_consumed = 0
+        citing = False
 
         # Process each line
         i = 0
@@ -33,6 +39,9 @@ class IndividualParser(GedcomParser[Individual]):
             # Update context
             context.enter_level(line)
             lines_consumed += 1
+            if line.level == 1:
+                # Whether this substructure is a citation, for its PAGE.
+                citing = False
 
             match line.tag:
                 case "INDI":
@@ -45,12 +54,13 @@ class IndividualParser(GedcomParser[Individual]):
                     data["surname"] = line.value
                 case "SEX":
                     data["sex"] = line.value
-                case "BIRT":
-                    pass
-                case "DEAT":
-                    pass
-                case "RESI":
-                    pass
+                case "BIRT" | "DEAT" | "BAPM" | "RESI" | "EVEN" if line.level == 1:
+                    # Delegate to event parser
+                    if event_parser := get_parser_for_tag("EVEN", context.schema):
+                        event, event_lines = event_parser.parse(lines[i:], context)
+                        data["events"].append(event)
+                        lines_consumed += event_lines - 1
+                        i += event_lines - 1
                 case "EMAIL":
                     data["email"] = line.value
                 # FAMC tag points to a family where this person is a child.
@@ -59,6 +69,27 @@ class IndividualParser(GedcomParser[Individual]):
                 # FAMS tag points to a family where this person is a spouse or parent.
                 case "FAMS":
                     pass
+                # Extension substructures, parsed by a plugin or kept as is.
+                case tag if line.level == 1 and is_extension_tag(tag):
+                    if parser := get_parser_for_tag(tag, context.schema):
+                        extension, extension_lines = parser.parse(lines[i:], context)
+                        data["extensions"].append(extension)
+                        lines_consumed += extension_lines - 1
+                        i += extension_lines - 1
+                # Pointers to shared records; the records are resolved lazily.
+                case tag if (
+                    tag in Citation.TAGS and line.level == 1 and is_pointer(line.value)
+                ):
+                    data["citations"].append(Citation(tag=tag, xref=line.value))
+                    citing = True
+                case "PAGE" if line.level == 2 and context.path[-2] == "SOUR":  # noqa: PLR2004
+                    if citing:
+                        citation = data["citations"][-1]
+                        data["citations"][-1] = attrs.evolve(citation, page=line.value)
             i += 1
 
+        if compactor := context.compactor:
+            data = compactor.individual_fields(data)
+        if context.events is not None and data["events"]:
+            data["events"] = context.events.extend(data["id"], data["events"])
         return Individual(**data), lines_consumed
@@ -2,7 +2,7 @@ from collections.abc import Sequence
 from typing import Any, ClassVar
 
 from rootsy.adapters import GedcomParser
-from rootsy.models import Multimedia
+from rootsy.models import Multimedia, MultimediaFile
 from rootsy.types import GedcomLine, ParsingContext
 
 
@@ -14,7 +14,12 @@ class MultimediaParser(GedcomParser[Multimedia]):
         lines: Sequence[GedcomLine],
         context: ParsingContext,
     ) -> tuple[Multimedia, int]:
-        data: dict[str, Any] = {}
+        data: dict[str, Any] = {
+            "files": [],
+            "notes": [],
+        }
+        # Fields of the FILE being read, until the next level-1 line.
+        current_file: dict[str, Any] | None = None
         lines_consumed = 0
 
         # Process each line
@@ -30,8 +35,29 @@ class MultimediaParser(GedcomParser[Multimedia]):
             context.enter_level(line)
             lines_consumed += 1
 
+            if line.level == 1 and current_file is not None:
+                data["files"].append(MultimediaFile(**current_file))
+                current_file = None
+
             match line.tag:
                 case "OBJE":
-                    data["id"] = line.xref_id
-
+                    data["id"] = line.xref
+                case "FILE" if line.level == 1:
+                    current_file = {"reference": line.value}
+                case "FORM" if line.level == 2 and current_file is not None:  # noqa: PLR2004
+                    current_file["format"] = line.value
+                case "TYPE" | "MEDI" if context.path[-2] == "FORM":
+                    if current_file is not None:
+                        current_file["media_type"] = line.value
+                case "TITL" if line.level == 2 and current_file is not None:  # noqa: PLR2004
+                    current_file["title"] = line.value
+                case "TITL" if line.level == 1:
+                    data["title"] = line.value
+                case "NOTE" | "SNOTE" if line.level == 1:
+                    data["notes"].append(line.value)
+
+            i += 1
+
+        if current_file is not None:
+            data["files"].append(MultimediaFile(**current_file))
         return Multimedia(**data), lines_consumed
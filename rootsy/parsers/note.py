@@ -0,0 +1,52 @@
+from collections.abc import Sequence
+from typing import Any, ClassVar
+
+import attrs
+
+from rootsy.adapters import GedcomParser
+from rootsy.models import Note
+from rootsy.types import GedcomLine, ParsingContext
+
+
+@attrs.frozen
+class NoteParser(GedcomParser[Note]):
+    """Parser for shared note records."""
+
+    handles_tag: ClassVar[str] = Note.tag
+
+    def parse(
+        self,
+        lines: Sequence[GedcomLine],
+        context: ParsingContext,
+    ) -> tuple[Note, int]:
+        data: dict[str, Any] = {
+            "id": lines[0].xref,
+            "text": lines[0].value,
+        }
+        lines_consumed = 0
+
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+
+            # If we've hit another top-level record, we're done
+            if i > 0 and line.level == 0:
+                break
+
+            context.enter_level(line)
+            lines_consumed += 1
+
+            match line.tag:
+                # Only present when continuations weren't merged by the reader.
+                case "CONT":
+                    data["text"] += "\n" + line.value
+                case "CONC":
+                    data["text"] += line.value
+                case "LANG":
+                    data["language"] = line.value
+                case "MIME":
+                    data["mime_type"] = line.value
+
+            i += 1
+
+        return Note(**data), lines_consumed
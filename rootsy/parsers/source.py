@@ -0,0 +1,58 @@
+from collections.abc import Sequence
+from typing import Any, ClassVar
+
+import attrs
+
+from rootsy.adapters import GedcomParser
+from rootsy.models import Source
+from rootsy.types import GedcomLine, ParsingContext
+
+
+@attrs.frozen
+class SourceParser(GedcomParser[Source]):
+    """Parser for level-0 source records."""
+
+    handles_tag: ClassVar[str] = Source.tag
+
+    def parse(
+        self,
+        lines: Sequence[GedcomLine],
+        context: ParsingContext,
+    ) -> tuple[Source, int]:
+        data: dict[str, Any] = {
+            "id": lines[0].xref,
+            "repositories": [],
+            "notes": [],
+        }
+        lines_consumed = 0
+
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+
+            # If we've hit another top-level record, we're done
+            if i > 0 and line.level == 0:
+                break
+
+            context.enter_level(line)
+            lines_consumed += 1
+
+            match line.tag:
+                case "TITL" if line.level == 1:
+                    data["title"] = line.value
+                case "AUTH" if line.level == 1:
+                    data["author"] = line.value
+                case "ABBR" if line.level == 1:
+                    data["abbreviation"] = line.value
+                case "PUBL" if line.level == 1:
+                    data["publication"] = line.value
+                case "TEXT" if line.level == 1:
+                    data["text"] = line.value
+                case "REPO" if line.level == 1:
+                    data["repositories"].append(line.value)
+                case "NOTE" | "SNOTE" if line.level == 1:
+                    data["notes"].append(line.value)
+
+            i += 1
+
+        return Source(**data), lines_consumed
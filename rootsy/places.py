@@ -0,0 +1,139 @@
+"""Normalised, hierarchical storage for PLAC values."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+import attrs
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable, Iterator
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class Place:
+    """A single jurisdiction, e.g. a town within its county."""
+
+    id: int
+    name: str
+    parent_id: int | None = None
+    # 0 for the top-level jurisdiction (usually the country).
+    level: int = 0
+
+
+def split_place(text: str) -> list[str]:
+    """Split a PLAC value into jurisdictions, from the largest to the smallest.
+
+    Whitespace is collapsed and empty jurisdictions are dropped.
+    """
+    parts = (" ".join(part.split()) for part in reversed(text.split(",")))
+    return [part for part in parts if part]
+
+
+class PlaceTable:
+    """Interns PLAC values into a tree of places.
+
+    "Springfield, Sangamon, Illinois, USA" is stored as four places, each
+    pointing at its parent, so every event in Springfield shares the same id
+    and places can be grouped by any jurisdiction level. Names are matched
+    case-insensitively; the first spelling seen is kept.
+    """
+
+    # Most recent raw PLAC values remembered, so repeated ones skip
+    # normalisation without the cache growing with every distinct spelling.
+    TEXT_CACHE_SIZE = 4096
+
+    def __init__(self) -> None:
+        self._places: list[Place] = []
+        self._ids: dict[tuple[int | None, str], int] = {}
+        self._children: defaultdict[int, list[int]] = defaultdict(list)
+        # Raw PLAC value to id, oldest first.
+        self._by_text: dict[str, int | None] = {}
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+    def __iter__(self) -> Iterator[Place]:
+        return iter(self._places)
+
+    def __getitem__(self, place_id: int) -> Place:
+        return self._places[place_id]
+
+    def intern(self, text: str | None) -> int | None:
+        """Return the id of the smallest jurisdiction of a PLAC value."""
+        if text is None:
+            return None
+        if text in self._by_text:
+            return self._by_text[text]
+
+        place_id = None
+        for level, name in enumerate(split_place(text)):
+            key = (place_id, name.casefold())
+            if (child_id := self._ids.get(key)) is None:
+                child_id = self._ids[key] = len(self._places)
+                self._places.append(
+                    Place(id=child_id, name=name, parent_id=place_id, level=level),
+                )
+                if place_id is not None:
+                    self._children[place_id].append(child_id)
+            place_id = child_id
+
+        if len(self._by_text) >= self.TEXT_CACHE_SIZE:
+            del self._by_text[next(iter(self._by_text))]
+        self._by_text[text] = place_id
+        return place_id
+
+    def find(self, text: str) -> int | None:
+        """Return the id of a PLAC value without adding it to the table."""
+        place_id = None
+        for name in split_place(text):
+            if (place_id := self._ids.get((place_id, name.casefold()))) is None:
+                return None
+        return place_id
+
+    def full_name(self, place_id: int) -> str:
+        """Rebuild the normalised PLAC value of a place."""
+        names = []
+        current: int | None = place_id
+        while current is not None:
+            place = self._places[current]
+            names.append(place.name)
+            current = place.parent_id
+        return ", ".join(names)
+
+    def children(self, place_id: int) -> list[int]:
+        return self._children.get(place_id, [])
+
+    def descendants(self, place_id: int) -> Iterator[int]:
+        """Yield a place and every place within it."""
+        stack = [place_id]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(self._children.get(current, ()))
+
+
+class PlaceIndex[Item: Hashable]:
+    """Answers "everything in or under this place" for items tagged by place id."""
+
+    def __init__(self, table: PlaceTable) -> None:
+        self.table = table
+        self._items: defaultdict[int, list[Item]] = defaultdict(list)
+
+    def add(self, place_id: int | None, item: Item) -> None:
+        if place_id is not None:
+            self._items[place_id].append(item)
+
+    def update(self, items: Iterable[tuple[int | None, Item]]) -> None:
+        for place_id, item in items:
+            self.add(place_id, item)
+
+    def at(self, place_id: int) -> list[Item]:
+        """Items recorded at exactly this place."""
+        return self._items.get(place_id, [])
+
+    def under(self, place_id: int) -> Iterator[Item]:
+        """Items recorded at this place or any place within it."""
+        for descendant in self.table.descendants(place_id):
+            yield from self._items.get(descendant, ())
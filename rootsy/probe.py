@@ -0,0 +1,168 @@
+"""Quick look at a GEDCOM file: its header and how many records of each kind.
+
+Only the HEAD record is parsed. The remaining records are counted by scanning
+the raw bytes for level-0 lines, so no ``GedcomLine`` is built for them and a
+probe runs at about the speed the file can be read.
+"""
+
+from __future__ import annotations
+
+import codecs
+import re
+from collections import Counter
+from typing import TYPE_CHECKING
+
+import attrs
+
+from rootsy.encoding import detect_encoding
+from rootsy.parsers.header import HeaderParser
+from rootsy.reader import GedcomReader, line_blocks, tokenize
+from rootsy.types import ParsingContext
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from rootsy.models import Header
+    from rootsy.reader import GedcomSource
+    from rootsy.types import GedcomLine
+
+# The tag of each level-0 line but the first. Starting with a literal line
+# break rather than "^" lets the regex engine skip ahead to candidate lines,
+# which makes the scan more than twice as fast.
+_RECORD_TAG = r"\n[ \t]*0[ \t]+(?:@[^@\r\n]+@[ \t]+)?([A-Za-z0-9_]+)"
+_RECORD_BYTES = re.compile(_RECORD_TAG.encode("ascii"))
+_RECORD_TEXT = re.compile(_RECORD_TAG)
+
+
+class NotGedcomError(ValueError):
+    def __init__(self, reason: str = "it doesn't start with a HEAD record") -> None:
+        super().__init__(f"Not a GEDCOM file: {reason}")
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class ProbeResult:
+    """What a probe found out about a file."""
+
+    header: Header
+    # The codec the file is read with, detected from its first bytes.
+    codec: str
+    # Level-0 records by tag, including HEAD and TRLR.
+    records: dict[str, int]
+    # Bytes scanned, after decompression.
+    size: int
+
+    @property
+    def version(self) -> str:
+        return self.header.version
+
+    @property
+    def charset(self) -> str:
+        """The HEAD.CHAR value."""
+        return self.header.encoding
+
+    @property
+    def source_system(self) -> str | None:
+        return self.header.source.system_id if self.header.source else None
+
+    @property
+    def individuals(self) -> int:
+        return self.records.get("INDI", 0)
+
+    @property
+    def families(self) -> int:
+        return self.records.get("FAM", 0)
+
+    @property
+    def sources(self) -> int:
+        return self.records.get("SOUR", 0)
+
+
+def _decoded(blocks: Iterator[bytes], codec: str) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder(codec)(errors="replace")
+    for block in blocks:
+        yield decoder.decode(block)
+    yield decoder.decode(b"", final=True)
+
+
+def _split_header[T: (str, bytes)](
+    blocks: Iterator[T],
+    pattern: re.Pattern[T],
+) -> tuple[T, T]:
+    """Return the HEAD record and what follows it, up to the end of its block."""
+    buffer = None
+    for block in blocks:
+        buffer = block if buffer is None else buffer + block
+        if match := pattern.search(buffer):
+            return buffer[: match.start()], buffer[match.start() :]
+    if buffer is None:
+        raise NotGedcomError
+    return buffer, buffer[:0]
+
+
+def read_header(lines: Sequence[GedcomLine]) -> Header:
+    """Parse the lines of a HEAD record, with continuations merged.
+
+    Raises ``NotGedcomError`` unless they are a HEAD giving the GEDC.VERS.
+    """
+    if not lines or lines[0].level != 0 or lines[0].tag != "HEAD":
+        raise NotGedcomError
+    in_gedc = False
+    for line in lines[1:]:
+        if line.level == 1:
+            in_gedc = line.tag == "GEDC"
+        elif in_gedc and line.level == 2 and line.tag == "VERS":  # noqa: PLR2004
+            break
+    else:
+        msg = "its HEAD has no GEDC.VERS"
+        raise NotGedcomError(msg)
+    header, _ = HeaderParser().parse(lines, ParsingContext())
+    return header
+
+
+def _parse_header(text: str) -> Header:
+    return read_header(tokenize(line for line in text.splitlines() if line.strip()))
+
+
+def probe(source: GedcomSource) -> ProbeResult:
+    """Read a file's header and count its records without parsing them.
+
+    Raises ``UnsupportedGedcomVersionError`` for versions other than 5.5.x
+    and 7.0, as ``Header.validate_version`` does when parsing.
+    """
+    reader = GedcomReader(source)
+    records: Counter[str | bytes] = Counter()
+    with reader.open_binary() as stream:
+        codec = detect_encoding(stream.peek(reader.SNIFF_SIZE))
+        raw_blocks = line_blocks(stream, reader.BUFFER_SIZE)
+        size = 0
+
+        def measured() -> Iterator[bytes]:
+            nonlocal size
+            for block in raw_blocks:
+                size += len(block)
+                yield block
+
+        # Bytes are scanned as they are unless ASCII characters take more
+        # than one byte, as in UTF-16.
+        if codec.startswith("utf-16"):
+            blocks = _decoded(measured(), codec)
+            text, rest = _split_header(blocks, _RECORD_TEXT)
+            pattern, newline = _RECORD_TEXT, "\n"
+        else:
+            blocks = measured()
+            head, rest = _split_header(blocks, _RECORD_BYTES)
+            text = codecs.decode(head, codec, errors="replace")
+            pattern, newline = _RECORD_BYTES, b"\n"
+
+        header = _parse_header(text)
+        records.update(pattern.findall(rest))
+        # Blocks start at the beginning of a line, which the pattern expects
+        # to follow a line break.
+        for block in blocks:
+            records.update(pattern.findall(newline + block))
+
+    counts = {"HEAD": 1}
+    for tag, count in records.most_common():
+        key = tag if isinstance(tag, str) else tag.decode("ascii")
+        counts[key] = counts.get(key, 0) + count
+    return ProbeResult(header=header, codec=codec, records=counts, size=size)
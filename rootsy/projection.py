@@ -0,0 +1,84 @@
+"""Selective parsing: drop unneeded records and substructures early."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, ClassVar
+
+import attrs
+
+from rootsy.reader import CONTINUATION_TAGS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+
+def _tag_sets(tags: Mapping[str, Iterable[str]]) -> Mapping[str, frozenset[str]]:
+    return {record: frozenset(fields) for record, fields in tags.items()}
+
+
+def _optional_set(tags: Iterable[str] | None) -> frozenset[str] | None:
+    return None if tags is None else frozenset(tags)
+
+
+@attrs.frozen(kw_only=True)
+class Projection:
+    """Which records, and which of their substructures, to read.
+
+    ``records`` lists the level-0 tags to keep (all when ``None``); HEAD and
+    TRLR are always kept. ``tags`` maps a record tag to the level-1 tags to
+    keep for it, each with its whole subtree. Records missing from ``tags``
+    are kept whole.
+
+    Filtering runs on the raw text lines before they are tokenized, so skipped
+    lines never become ``GedcomLine`` objects.
+    """
+
+    ALWAYS_KEPT: ClassVar[frozenset[str]] = frozenset({"HEAD", "TRLR"})
+
+    records: frozenset[str] | None = attrs.field(default=None, converter=_optional_set)
+    tags: Mapping[str, frozenset[str]] = attrs.field(factory=dict, converter=_tag_sets)
+
+    def keeps_record(self, tag: str) -> bool:
+        return self.records is None or tag in self.records or tag in self.ALWAYS_KEPT
+
+    def filter(self, lines: Iterable[str]) -> Iterator[str]:
+        """Yield the stripped, non-empty lines the projection keeps."""
+        # Lines deeper than this level are dropped; 0 drops the whole record.
+        skip_below: int | None = None
+        fields: frozenset[str] | None = None
+
+        for line in lines:
+            level_end = line.find(" ")
+            if level_end < 0:
+                continue
+
+            if level_end == 1 and line[0] == "0":
+                tag = _record_tag(line)
+                if self.keeps_record(tag):
+                    skip_below, fields = None, self.tags.get(tag)
+                    yield line
+                else:
+                    skip_below, fields = 0, None
+                continue
+
+            if skip_below is not None:
+                # Skipped records need no parsing at all.
+                if skip_below == 0 or int(line[:level_end]) > skip_below:
+                    continue
+                skip_below = None
+
+            if fields is not None and line.startswith("1 "):
+                tag = line[2:].split(maxsplit=1)[0]
+                if tag not in fields and tag not in CONTINUATION_TAGS:
+                    skip_below = 1
+                    continue
+
+            yield line
+
+
+def _record_tag(line: str) -> str:
+    """Tag of a level-0 line, skipping its xref."""
+    parts = line.split(maxsplit=3)
+    if len(parts) > 2 and parts[1].startswith("@"):  # noqa: PLR2004
+        return parts[2]
+    return parts[1] if len(parts) > 1 else ""
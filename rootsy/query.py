@@ -0,0 +1,455 @@
+"""Composable queries over the individuals of a parsed tree.
+
+Predicates combine with ``&``, ``|`` and ``~``::
+
+    query = Surname("Doe") & Born(1850, 1900) & EventPlace("Illinois, USA")
+    for individual in select(structure, query):
+        ...
+
+Most predicates are answered from an index: surnames, sex, event dates, event
+places and family relations each get one, built the first time a query needs
+it and reused by later queries on the same ``StructureIndex``. The planner
+intersects the smallest candidate sets first and only checks what no index
+covers (``Name`` and ``Where``) record by record, on the remaining candidates
+or, when nothing narrows them down, on every individual.
+"""
+
+from __future__ import annotations
+
+import abc
+import bisect
+import functools
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+import attrs
+
+from rootsy.dates import pack_date
+from rootsy.models import EventType, Family, Individual
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from rootsy.models import GedcomStructure
+
+
+def surname_of(individual: Individual) -> str | None:
+    """Return the SURN value, or the part of the NAME between slashes."""
+    if individual.surname:
+        return individual.surname
+    if individual.name and individual.name.count("/") >= 2:  # noqa: PLR2004
+        return individual.name.split("/")[1].strip() or None
+    return None
+
+
+class StructureIndex:
+    """Indexes over a structure, each built on first use.
+
+    The indexes are a snapshot: create a new ``StructureIndex`` after adding
+    records to the structure.
+    """
+
+    def __init__(self, structure: GedcomStructure) -> None:
+        self.structure = structure
+        self._lookups: dict[Predicate, set[str] | frozenset[str] | None] = {}
+
+    def lookup(self, predicate: Predicate) -> set[str] | frozenset[str] | None:
+        """Answer a predicate from the indexes, remembering the answer."""
+        if predicate not in self._lookups:
+            self._lookups[predicate] = predicate.lookup(self)
+        return self._lookups[predicate]
+
+    @functools.cached_property
+    def positions(self) -> dict[str, int]:
+        """Position of each individual in the file."""
+        return {
+            xref: position for position, xref in enumerate(self.structure.individuals)
+        }
+
+    @functools.cached_property
+    def individual_ids(self) -> frozenset[str]:
+        return frozenset(self.structure.individuals)
+
+    @functools.cached_property
+    def surnames(self) -> dict[str, set[str]]:
+        index: defaultdict[str, set[str]] = defaultdict(set)
+        for xref, individual in self.structure.individuals.items():
+            if surname := surname_of(individual):
+                index[surname.casefold()].add(xref)
+        return dict(index)
+
+    @functools.cached_property
+    def sexes(self) -> dict[str, set[str]]:
+        index: defaultdict[str, set[str]] = defaultdict(set)
+        for xref, individual in self.structure.individuals.items():
+            if individual.sex:
+                index[individual.sex.upper()].add(xref)
+        return dict(index)
+
+    @functools.cached_property
+    def spouses(self) -> dict[str, tuple[str, ...]]:
+        """Spouses of each family."""
+        return {
+            xref: tuple(spouse for spouse in (family.husband, family.wife) if spouse)
+            for xref, family in self.structure.families.items()
+        }
+
+    @functools.cached_property
+    def parents(self) -> dict[str, set[str]]:
+        """Parents of each individual, through the families listing them."""
+        index: defaultdict[str, set[str]] = defaultdict(set)
+        for xref, family in self.structure.families.items():
+            for child in family.children:
+                index[child].update(self.spouses[xref])
+        return dict(index)
+
+    @functools.cached_property
+    def children(self) -> dict[str, set[str]]:
+        index: defaultdict[str, set[str]] = defaultdict(set)
+        for child, parents in self.parents.items():
+            for parent in parents:
+                index[parent].add(child)
+        return dict(index)
+
+    @functools.cached_property
+    def partners(self) -> dict[str, set[str]]:
+        index: defaultdict[str, set[str]] = defaultdict(set)
+        for spouses in self.spouses.values():
+            for spouse in spouses:
+                index[spouse].update(other for other in spouses if other != spouse)
+        return dict(index)
+
+    @functools.cached_property
+    def event_dates(self) -> dict[EventType, tuple[list[int], list[int]]]:
+        """Sorted estimated dates of each event type, with their event rows."""
+        events = self.structure.events
+        rows_by_type: defaultdict[EventType, list[tuple[int, int]]] = defaultdict(
+            list,
+        )
+        for row, code in enumerate(events.types):
+            if estimate := events.starts[row] or events.ends[row]:
+                rows_by_type[EventType(code)].append((estimate, row))
+
+        index = {}
+        for event_type, rows in rows_by_type.items():
+            rows.sort()
+            index[event_type] = ([date for date, _ in rows], [row for _, row in rows])
+        return index
+
+    @functools.cached_property
+    def event_places(self) -> dict[int, list[int]]:
+        """Event rows at each place id."""
+        index: defaultdict[int, list[int]] = defaultdict(list)
+        for row, place_id in enumerate(self.structure.events.place_ids):
+            if place_id >= 0:
+                index[place_id].append(row)
+        return dict(index)
+
+    def individuals_of_rows(
+        self,
+        rows: Iterable[int],
+        event_type: EventType | None = None,
+    ) -> set[str]:
+        """Individuals that events belong to, via the spouses for family events."""
+        events = self.structure.events
+        found: set[str] = set()
+        for row in rows:
+            if event_type is not None and events.types[row] != event_type.value:
+                continue
+            xref = events.record_ids[events.records[row]]
+            if xref in self.spouses:
+                found.update(self.spouses[xref])
+            else:
+                found.add(xref)
+        return found & self.individual_ids
+
+
+class Predicate(abc.ABC):
+    """Base class of query predicates."""
+
+    def lookup(self, index: StructureIndex) -> set[str] | frozenset[str] | None:  # noqa: ARG002
+        """Return the ids matching the predicate, or None if no index can tell."""
+        return None
+
+    @abc.abstractmethod
+    def matches(self, individual: Individual, index: StructureIndex) -> bool:
+        """Check one individual; only used when ``lookup`` returns None."""
+
+    def __and__(self, other: Predicate) -> Predicate:
+        return AllOf((self, other))
+
+    def __or__(self, other: Predicate) -> Predicate:
+        return AnyOf((self, other))
+
+    def __invert__(self) -> Predicate:
+        return Not(self)
+
+
+@attrs.frozen
+class AllOf(Predicate):
+    predicates: tuple[Predicate, ...]
+
+    def __and__(self, other: Predicate) -> Predicate:
+        return AllOf((*self.predicates, other))
+
+    def lookup(self, index: StructureIndex) -> set[str] | frozenset[str] | None:
+        plan = Plan.build(self, index)
+        return plan.candidates if plan.residual is None else None
+
+    def matches(self, individual: Individual, index: StructureIndex) -> bool:
+        return all(
+            _matches(predicate, individual, index) for predicate in self.predicates
+        )
+
+
+@attrs.frozen
+class AnyOf(Predicate):
+    predicates: tuple[Predicate, ...]
+
+    def __or__(self, other: Predicate) -> Predicate:
+        return AnyOf((*self.predicates, other))
+
+    def lookup(self, index: StructureIndex) -> set[str] | frozenset[str] | None:
+        found: set[str] = set()
+        for predicate in self.predicates:
+            if (matched := index.lookup(predicate)) is None:
+                return None
+            found |= matched
+        return found
+
+    def matches(self, individual: Individual, index: StructureIndex) -> bool:
+        return any(
+            _matches(predicate, individual, index) for predicate in self.predicates
+        )
+
+
+@attrs.frozen
+class Not(Predicate):
+    predicate: Predicate
+
+    def lookup(self, index: StructureIndex) -> set[str] | frozenset[str] | None:
+        if (matched := index.lookup(self.predicate)) is None:
+            return None
+        return index.individual_ids - matched
+
+    def matches(self, individual: Individual, index: StructureIndex) -> bool:
+        return not _matches(self.predicate, individual, index)
+
+
+def _matches(
+    predicate: Predicate, individual: Individual, index: StructureIndex
+) -> bool:
+    if (matched := index.lookup(predicate)) is not None:
+        return individual.id in matched
+    return predicate.matches(individual, index)
+
+
+class IndexedPredicate(Predicate):
+    """Base class of predicates that an index always answers."""
+
+    @abc.abstractmethod
+    def lookup(self, index: StructureIndex) -> set[str] | frozenset[str]:
+        """Return the ids matching the predicate."""
+
+    def matches(self, individual: Individual, index: StructureIndex) -> bool:
+        return individual.id in (index.lookup(self) or ())
+
+
+@attrs.frozen
+class Surname(IndexedPredicate):
+    """Individuals with this surname, ignoring case."""
+
+    surname: str
+
+    def lookup(self, index: StructureIndex) -> set[str]:
+        return index.surnames.get(self.surname.casefold(), set())
+
+
+@attrs.frozen
+class Name(Predicate):
+    """Individuals whose NAME contains some text, ignoring case (no index)."""
+
+    text: str
+
+    def matches(self, individual: Individual, index: StructureIndex) -> bool:  # noqa: ARG002
+        return self.text.casefold() in (individual.name or "").casefold()
+
+
+@attrs.frozen
+class Sex(IndexedPredicate):
+    sex: str
+
+    def lookup(self, index: StructureIndex) -> set[str]:
+        return index.sexes.get(self.sex.upper(), set())
+
+
+@attrs.frozen
+class EventDate(IndexedPredicate):
+    """Individuals with an event of a type between two years, inclusive.
+
+    Either bound may be left out. Dates that aren't known to the day are
+    compared by their earliest possible day. Family events (MARR, DIV) match
+    both spouses.
+    """
+
+    event_type: EventType
+    start_year: int | None = None
+    end_year: int | None = None
+
+    def lookup(self, index: StructureIndex) -> set[str]:
+        dates, rows = index.event_dates.get(self.event_type, ([], []))
+        low = 0
+        if self.start_year is not None:
+            low = bisect.bisect_left(dates, pack_date(self.start_year, 1, 1))
+        high = len(dates)
+        if self.end_year is not None:
+            high = bisect.bisect_right(dates, pack_date(self.end_year, 12, 31))
+        return index.individuals_of_rows(rows[low:high])
+
+
+@attrs.frozen
+class Born(EventDate):
+    event_type: EventType = attrs.field(default=EventType.BIRTH, init=False)
+
+
+@attrs.frozen
+class Died(EventDate):
+    event_type: EventType = attrs.field(default=EventType.DEATH, init=False)
+
+
+@attrs.frozen
+class EventPlace(IndexedPredicate):
+    """Individuals with an event in a place or anywhere within it.
+
+    ``place`` is a PLAC value such as "Illinois, USA"; matching follows the
+    structure's ``PlaceTable``.
+    """
+
+    place: str
+    event_type: EventType | None = None
+
+    def lookup(self, index: StructureIndex) -> set[str]:
+        places = index.structure.places
+        if (place_id := places.find(self.place)) is None:
+            return set()
+        rows = (
+            row
+            for descendant in places.descendants(place_id)
+            for row in index.event_places.get(descendant, ())
+        )
+        return index.individuals_of_rows(rows, self.event_type)
+
+
+@attrs.frozen
+class ChildOf(IndexedPredicate):
+    """Children of an individual."""
+
+    xref: str
+
+    def lookup(self, index: StructureIndex) -> set[str]:
+        return index.children.get(self.xref, set())
+
+
+@attrs.frozen
+class ParentOf(IndexedPredicate):
+    """Parents of an individual."""
+
+    xref: str
+
+    def lookup(self, index: StructureIndex) -> set[str]:
+        return index.parents.get(self.xref, set())
+
+
+@attrs.frozen
+class SpouseOf(IndexedPredicate):
+    """Individuals sharing a family with an individual as spouses."""
+
+    xref: str
+
+    def lookup(self, index: StructureIndex) -> set[str]:
+        return index.partners.get(self.xref, set())
+
+
+@attrs.frozen
+class InFamily(IndexedPredicate):
+    """Spouses and children of a family."""
+
+    xref: str
+
+    def lookup(self, index: StructureIndex) -> set[str]:
+        family: Family | None = index.structure.families.get(self.xref)
+        if family is None:
+            return set()
+        members = {*index.spouses[self.xref], *family.children}
+        return members & index.individual_ids
+
+
+@attrs.frozen
+class Where(Predicate):
+    """Individuals for which a function returns true (no index)."""
+
+    function: Callable[[Individual], bool]
+
+    def matches(self, individual: Individual, index: StructureIndex) -> bool:  # noqa: ARG002
+        return self.function(individual)
+
+
+@attrs.frozen(kw_only=True)
+class Plan:
+    """How a query runs: indexed candidates, then a check of the rest.
+
+    ``candidates`` is None when every individual has to be scanned, and
+    ``residual`` None when the candidates are the answer.
+    """
+
+    candidates: set[str] | frozenset[str] | None
+    residual: Predicate | None
+
+    @classmethod
+    def build(cls, predicate: Predicate, index: StructureIndex) -> Plan:
+        parts = predicate.predicates if isinstance(predicate, AllOf) else (predicate,)
+
+        looked_up = []
+        residual = []
+        for part in parts:
+            if (matched := index.lookup(part)) is None:
+                residual.append(part)
+            else:
+                looked_up.append(matched)
+
+        candidates = None
+        # Intersect from the smallest set, which bounds every later step.
+        for matched in sorted(looked_up, key=len):
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                break
+
+        if len(residual) > 1:
+            residual = [AllOf(tuple(residual))]
+        return cls(candidates=candidates, residual=residual[0] if residual else None)
+
+    def run(self, index: StructureIndex) -> Iterator[Individual]:
+        individuals = index.structure.individuals
+        records: Iterable[Individual]
+        if self.candidates is None:
+            records = individuals.values()
+        else:
+            # Sorting the candidates keeps file order without a full scan.
+            xrefs = sorted(self.candidates, key=index.positions.__getitem__)
+            records = (individuals[xref] for xref in xrefs)
+
+        for individual in records:
+            if self.residual is None or self.residual.matches(individual, index):
+                yield individual
+
+
+def select(
+    source: GedcomStructure | StructureIndex,
+    predicate: Predicate,
+) -> Iterator[Individual]:
+    """Lazily yield the individuals matching a predicate.
+
+    Pass a ``StructureIndex`` to reuse its indexes across queries.
+    """
+    index = source if isinstance(source, StructureIndex) else StructureIndex(source)
+    return Plan.build(predicate, index).run(index)
@@ -1,26 +1,222 @@
 from __future__ import annotations
 
+import bz2
+import codecs
+import contextlib
+import gzip
+import io
+import lzma
+import zipfile
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, BinaryIO, ClassVar
 
+from rootsy.encoding import detect_encoding
 from rootsy.types import GedcomLine
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Buffer, Iterable, Iterator
+
+    from rootsy.projection import Projection
+
+# Anything the reader can parse: a path, an in-memory payload or an open
+# binary file object.
+type GedcomSource = str | Path | bytes | bytearray | memoryview | BinaryIO
+
+# GEDZIP archives (.gdz) keep the dataset in this member at the archive root.
+GEDZIP_MEMBER = "gedcom.ged"
+
+# Leading bytes of the compressed formats the reader can stream from.
+_DECOMPRESSORS = (
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+)
+_ZIP_MAGIC = b"PK\x03\x04"
+
+# Tags that continue the value of their parent line rather than adding data.
+CONTINUATION_TAGS = frozenset({"CONT", "CONC"})
+
+
+def merge_continuations(lines: Iterable[GedcomLine]) -> Iterator[GedcomLine]:
+    """Fold CONT/CONC lines into the value of the line they continue.
+
+    CONT starts a new line of text and CONC appends to the current one. The
+    parts of a value are collected and joined once, so long notes don't build
+    intermediate strings, and kept exactly, since CONC may split a value at a
+    space. Values without continuations are stripped of surrounding spaces.
+    """
+    pending: GedcomLine | None = None
+    parts: list[str] | None = None
+
+    for line in lines:
+        if (
+            pending is not None
+            and line.tag in CONTINUATION_TAGS
+            and line.level == pending.level + 1
+        ):
+            if parts is None:
+                parts = [pending.value]
+            if line.tag == "CONT":
+                parts.append("\n")
+            parts.append(line.value)
+            continue
+
+        if pending is not None:
+            yield _with_parts(pending, parts)
+        pending, parts = line, None
+
+    if pending is not None:
+        yield _with_parts(pending, parts)
+
+
+def tokenize(lines: Iterable[str], *, merge: bool = True) -> list[GedcomLine]:
+    """Parse the text lines of a record, as yielded by ``text_groups``."""
+    parsed = (line for text in lines if (line := GedcomLine.from_string(text)))
+    return list(merge_continuations(parsed) if merge else parsed)
+
+
+def line_blocks(stream: BinaryIO, size: int = 1 << 20) -> Iterator[bytes]:
+    """Yield blocks of about ``size`` bytes that end at a line break.
+
+    The last block holds whatever follows the last line break. Scanning whole
+    blocks with a regex is much faster than handling the lines one by one.
+    """
+    remainder = b""
+    while block := stream.read(size):
+        end = block.rfind(b"\n") + 1
+        if not end:
+            remainder += block
+            continue
+        yield remainder + block[:end]
+        remainder = block[end:]
+    if remainder:
+        yield remainder
+
+
+def _with_parts(line: GedcomLine, parts: list[str] | None) -> GedcomLine:
+    if parts is None:
+        if not (line.value[:1].isspace() or line.value[-1:].isspace()):
+            return line
+        value = line.value.strip()
+    else:
+        value = "".join(parts)
+    return GedcomLine(level=line.level, tag=line.tag, value=value, xref=line.xref)
+
+
+class _BufferStream(io.RawIOBase):
+    """Read-only raw stream over a bytes-like object, without copying it."""
+
+    def __init__(self, data: Buffer) -> None:
+        self._view = memoryview(data).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Buffer) -> int:
+        target = memoryview(buffer).cast("B")
+        chunk = self._view[self._position : self._position + len(target)]
+        target[: len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {
+            io.SEEK_SET: 0,
+            io.SEEK_CUR: self._position,
+            io.SEEK_END: len(self._view),
+        }
+        self._position = max(0, base[whence] + offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+class _FileObjectStream(io.RawIOBase):
+    """Raw stream over a caller's binary file object that leaves it open."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return getattr(self._file, "seekable", lambda: False)()
+
+    def readinto(self, buffer: Buffer) -> int:
+        if readinto := getattr(self._file, "readinto", None):
+            return readinto(buffer)
+        target = memoryview(buffer).cast("B")
+        data = self._file.read(len(target))
+        target[: len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
 
 
 class GedcomReader:
     """Reads and groups GEDCOM lines maintaining hierarchical structure."""
 
-    def __init__(self, file_path: str | Path) -> None:
-        """Initialize the reader with a file path."""
-        self.file_path = Path(file_path)
-        if not self.file_path.exists():
-            msg = f"GEDCOM file not found: {file_path}"
-            raise FileNotFoundError(msg)
-        if not self.file_path.is_file():
-            msg = f"Path is not a file: {file_path}"
-            raise ValueError(msg)
+    # Read in large blocks so decoding runs over big chunks at a time.
+    BUFFER_SIZE: ClassVar[int] = 1 << 20
+    # Bytes inspected to detect the character set (BOM, then HEAD.CHAR).
+    SNIFF_SIZE: ClassVar[int] = 1 << 16
+
+    def __init__(
+        self,
+        source: GedcomSource,
+        encoding: str | None = None,
+        *,
+        merge_continuations: bool = True,
+        projection: Projection | None = None,
+    ) -> None:
+        """Initialize the reader with a file path, payload or binary file object.
+
+        In-memory payloads (``bytes``, ``bytearray``, ``memoryview``) are read in
+        place. File objects are read from their current position and left open;
+        they can only be read more than once if they are seekable.
+
+        Files compressed with gzip, bzip2 or xz and GEDZIP archives are
+        decompressed on the fly, based on their leading bytes. The encoding is
+        detected from the file when not given explicitly. CONT and CONC lines
+        are folded into the value they continue unless ``merge_continuations``
+        is false. A ``projection`` drops unneeded records and substructures
+        before their lines are parsed.
+        """
+        self.source = source
+        self.file_path: Path | None = None
+        # Where reading starts in a seekable file object.
+        self._start: int | None = None
+        self.encoding = encoding
+        self.merge_continuations = merge_continuations
+        self.projection = projection
+
+        match source:
+            case str() | Path():
+                self.file_path = Path(source)
+                if not self.file_path.exists():
+                    msg = f"GEDCOM file not found: {source}"
+                    raise FileNotFoundError(msg)
+                if not self.file_path.is_file():
+                    msg = f"Path is not a file: {source}"
+                    raise ValueError(msg)
+            case bytes() | bytearray() | memoryview():
+                pass
+            case _ if hasattr(source, "read"):
+                seekable = getattr(source, "seekable", lambda: False)()
+                self._start = source.tell() if seekable else None
+            case _:
+                msg = f"Unsupported GEDCOM source: {type(source).__name__}"
+                raise TypeError(msg)
 
     def line_groups(self) -> Iterator[list[GedcomLine]]:
         """Yield groups of related lines that form a complete record.
@@ -29,7 +225,11 @@ class GedcomReader:
         """
         current_group: list[GedcomLine] = []
 
-        for line in self._read_lines():
+        lines = self._read_lines()
+        if self.merge_continuations:
+            lines = merge_continuations(lines)
+
+        for line in lines:
             if line.level == 0 and current_group:
                 yield current_group
                 current_group = []
@@ -38,9 +238,98 @@ class GedcomReader:
         if current_group:
             yield current_group
 
+    def text_groups(self) -> Iterator[list[str]]:
+        """Yield the raw text lines of each record, without tokenizing them.
+
+        This is cheaper than ``line_groups`` when the lines are tokenized
+        elsewhere, e.g. by worker processes; see ``tokenize``.
+        """
+        current_group: list[str] = []
+
+        for line in self._text_lines():
+            if line.startswith("0 ") and current_group:
+                yield current_group
+                current_group = []
+            current_group.append(line)
+
+        if current_group:
+            yield current_group
+
+    def text_blocks(self) -> Iterator[str]:
+        """Yield the decoded text in large blocks of whole lines.
+
+        Line breaks are normalised to line feeds. Scanning blocks with a regex is
+        much faster than going through ``text_groups`` line by line, when
+        few lines are of interest. The projection isn't applied.
+        """
+        with self.open_binary() as stream:
+            if self.encoding is None:
+                self.encoding = detect_encoding(stream.peek(self.SNIFF_SIZE))
+            decoder = codecs.getincrementaldecoder(self.encoding)()
+            # A "\r" ending a block may start a "\r\n" finished in the next.
+            carry = ""
+            for block in line_blocks(stream, self.BUFFER_SIZE):
+                text = carry + decoder.decode(block)
+                carry = "\r" if text.endswith("\r") else ""
+                yield text.removesuffix(carry).replace("\r\n", "\n")
+            if tail := carry + decoder.decode(b"", final=True):
+                yield tail.replace("\r\n", "\n")
+
     def _read_lines(self) -> Iterator[GedcomLine]:
         """Read and parse individual GEDCOM lines."""
-        with self.file_path.open(encoding="utf-8-sig") as f:
-            for line in f:
-                if (line := line.strip()) and (parsed := GedcomLine.from_string(line)):
-                    yield parsed
+        for line in self._text_lines():
+            if parsed := GedcomLine.from_string(line):
+                yield parsed
+
+    def _text_lines(self) -> Iterator[str]:
+        """Read the non-blank lines kept by the projection, without terminators.
+
+        Leading whitespace is dropped, but not the trailing spaces of a value.
+        """
+        with self._open() as f:
+            lines = (
+                stripped for line in f if (stripped := line.lstrip().rstrip("\r\n"))
+            )
+            if self.projection is not None:
+                lines = self.projection.filter(lines)
+            yield from lines
+
+    @contextlib.contextmanager
+    def open_binary(self) -> Iterator[BinaryIO]:
+        """Open the raw GEDCOM data, decompressing it if needed."""
+        with contextlib.ExitStack() as stack:
+            stream = stack.enter_context(self._open_source())
+            magic = stream.peek(8)
+
+            if magic.startswith(_ZIP_MAGIC):
+                archive = stack.enter_context(zipfile.ZipFile(stream))
+                member = stack.enter_context(archive.open(GEDZIP_MEMBER))
+                stream = io.BufferedReader(member, self.BUFFER_SIZE)
+            else:
+                for prefix, decompressor in _DECOMPRESSORS:
+                    if magic.startswith(prefix):
+                        decompressed = stack.enter_context(decompressor(stream))
+                        stream = io.BufferedReader(decompressed, self.BUFFER_SIZE)
+                        break
+
+            yield stream
+
+    def _open_source(self) -> io.BufferedReader:
+        match self.source:
+            case str() | Path():
+                return self.file_path.open("rb", buffering=self.BUFFER_SIZE)
+            case bytes() | bytearray() | memoryview():
+                raw = _BufferStream(self.source)
+            case _:
+                if self._start is not None:
+                    self.source.seek(self._start)
+                raw = _FileObjectStream(self.source)
+        return io.BufferedReader(raw, self.BUFFER_SIZE)
+
+    @contextlib.contextmanager
+    def _open(self) -> Iterator[io.TextIOWrapper]:
+        """Open the file for decoding in a single buffered pass."""
+        with self.open_binary() as stream:
+            if self.encoding is None:
+                self.encoding = detect_encoding(stream.peek(self.SNIFF_SIZE))
+            yield io.TextIOWrapper(stream, encoding=self.encoding)
@@ -0,0 +1,116 @@
+"""Lazily parsed storage for records that other records point to."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import attrs
+
+from rootsy.adapters import GedcomRecord
+from rootsy.registry import get_parser_for_tag
+from rootsy.types import GedcomLine, ParsingContext
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from rootsy.models import Citation
+
+# Level-0 records that are cited rather than standing on their own.
+SHARED_TAGS = frozenset({"NOTE", "SNOTE", "SOUR", "OBJE"})
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class DeferredRecord(GedcomRecord):
+    """A shared record whose lines are kept until it is first resolved.
+
+    Once resolved, only its tag and xref are kept.
+    """
+
+    tag: ClassVar[str] = "*"
+
+    record_tag: str
+    xref: str
+    lines: tuple[GedcomLine, ...]
+
+    @classmethod
+    def from_group(cls, group: list[GedcomLine]) -> DeferredRecord:
+        return cls(record_tag=group[0].tag, xref=group[0].xref, lines=tuple(group))
+
+
+def is_shared(group: list[GedcomLine]) -> bool:
+    first = group[0]
+    return first.xref is not None and first.tag in SHARED_TAGS
+
+
+class SharedRecords:
+    """NOTE, SOUR and OBJE records by xref, parsed on first access.
+
+    A source cited by thousands of individuals is parsed once, the first time
+    one of the citations is resolved, and the result is cached. Records that
+    are never resolved are never parsed. Resolving the same record from
+    several threads at once may parse it more than once, but every caller gets
+    an equal record.
+    """
+
+    def __init__(self) -> None:
+        self._deferred: dict[str, DeferredRecord] = {}
+        self._resolved: dict[str, GedcomRecord] = {}
+
+    def __len__(self) -> int:
+        return len(self._deferred)
+
+    def __contains__(self, xref: object) -> bool:
+        return xref in self._deferred
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._deferred)
+
+    def add(self, record: DeferredRecord) -> None:
+        self._deferred[record.xref] = record
+        self._resolved.pop(record.xref, None)
+
+    def is_resolved(self, xref: str) -> bool:
+        return xref in self._resolved
+
+    def tag_of(self, xref: str) -> str | None:
+        """Return the tag of a record, e.g. "OBJE", without parsing it."""
+        deferred = self._deferred.get(xref)
+        return deferred.record_tag if deferred is not None else None
+
+    def resolve(
+        self,
+        reference: Citation | str,
+        *,
+        cache: bool = True,
+    ) -> GedcomRecord | None:
+        """Return the record a citation or xref points to, or None if missing.
+
+        Without ``cache``, a record that wasn't resolved yet is parsed but not
+        kept, so one pass over many records doesn't hold on to all of them.
+        """
+        xref = reference if isinstance(reference, str) else reference.xref
+        if (record := self._resolved.get(xref)) is not None:
+            return record
+        if (deferred := self._deferred.get(xref)) is None:
+            return None
+        if not deferred.lines:
+            # Another thread resolved it since the cache was checked.
+            return self._resolved.get(xref)
+        if (parser := get_parser_for_tag(deferred.record_tag)) is None:
+            return None
+
+        record, _ = parser.parse(deferred.lines, ParsingContext())
+        if not cache:
+            return record
+        self._resolved[xref] = record
+        # The parsed record replaces the lines, which are no longer needed.
+        self._deferred[xref] = attrs.evolve(deferred, lines=())
+        return record
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        """Resolve every record, keyed by xref."""
+        return {
+            xref: attrs.asdict(record)
+            for xref in self._deferred
+            if (record := self.resolve(xref)) is not None
+        }
@@ -1,42 +1,141 @@
+from __future__ import annotations
+
 import functools
 import importlib
-import inspect
-from collections.abc import Iterator
+import threading
+from typing import TYPE_CHECKING
 
 import attrs
 
-from rootsy.adapters import GedcomParser
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from importlib.metadata import EntryPoint
+
+    from rootsy.adapters import GedcomParser
+
+# Third-party packages register parsers under this entry point group. The
+# entry point name is the tag it handles (e.g. "_MILT") or the URI of a tag
+# declared in HEAD.SCHMA.
+ENTRY_POINT_GROUP = "rootsy.parsers"
+
+# Built-in parsers, imported the first time their tag is seen.
+BUILTIN_PARSERS = {
+    "ADDR": "rootsy.parsers.address:AddressParser",
+    "EVEN": "rootsy.parsers.event:EventParser",
+    "FAM": "rootsy.parsers.family:FamilyParser",
+    "HEAD": "rootsy.parsers.header:HeaderParser",
+    "INDI": "rootsy.parsers.individual:IndividualParser",
+    "NOTE": "rootsy.parsers.note:NoteParser",
+    "OBJE": "rootsy.parsers.multimedia:MultimediaParser",
+    "SNOTE": "rootsy.parsers.note:NoteParser",
+    "SOUR": "rootsy.parsers.source:SourceParser",
+}
+
+
+def load_parser_class(spec: str | EntryPoint) -> type[GedcomParser]:
+    """Import a parser class from a ``module:Class`` spec or an entry point."""
+    if not isinstance(spec, str):
+        return spec.load()
+
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def is_extension_tag(tag: str) -> bool:
+    return tag.startswith("_")
 
 
 @attrs.frozen
 class ParserRegistry:
-    """Registry of available parsers by tag."""
+    """Registry of available parsers by tag.
+
+    Parsers can be registered as classes or lazily, as an import spec that is
+    only loaded the first time its tag is looked up. Lookups of already loaded
+    tags take no lock, so the registry can be shared between threads.
+    """
 
     _parsers: dict[str, type[GedcomParser]] = attrs.field(factory=dict, init=False)
+    _lazy: dict[str, str | EntryPoint] = attrs.field(factory=dict, init=False)
+    _lock: threading.Lock = attrs.field(factory=threading.Lock, init=False)
 
     def register(self, parser_class: type[GedcomParser]) -> None:
         """Register a parser class."""
         self._parsers[parser_class.handles_tag] = parser_class
-
-    def get_parser_by_tag(self, tag: str) -> GedcomParser | None:
-        """Get parser instance for a tag."""
-        parser_class = self._parsers.get(tag)
-        return parser_class() if parser_class else None
-
-
-def discover_parsers() -> Iterator[type[GedcomParser]]:
-    """Discover all parser classes exported by rootsy.parsers."""
-    module = importlib.import_module("rootsy.parsers")
-
-    for _, obj in inspect.getmembers(module, inspect.isclass):
-        yield obj
+        self._lazy.pop(parser_class.handles_tag, None)
+
+    def register_lazy(self, key: str, spec: str | EntryPoint) -> None:
+        """Register a parser to import on first use.
+
+        ``key`` is a tag or, for extension tags, a schema URI.
+        """
+        self._lazy[key] = spec
+
+    def _load(self, key: str) -> type[GedcomParser] | None:
+        with self._lock:
+            if (parser_class := self._parsers.get(key)) is not None:
+                return parser_class
+            if (spec := self._lazy.get(key)) is None:
+                return None
+            parser_class = self._parsers[key] = load_parser_class(spec)
+            del self._lazy[key]
+            return parser_class
+
+    def get_parser_class(
+        self,
+        tag: str,
+        schema: Mapping[str, str] | None = None,
+    ) -> type[GedcomParser] | None:
+        """Look up a parser class, importing it if needed.
+
+        Extension tags are looked up by the URI ``schema`` declares for them
+        first, then by the tag itself.
+        """
+        if (
+            schema
+            and is_extension_tag(tag)
+            and (uri := schema.get(tag))
+            and (parser_class := self._parsers.get(uri) or self._load(uri))
+        ):
+            return parser_class
+        return self._parsers.get(tag) or self._load(tag)
+
+    def get_parser_by_tag(
+        self,
+        tag: str,
+        schema: Mapping[str, str] | None = None,
+    ) -> GedcomParser | None:
+        """Get parser instance for a tag.
+
+        Extension tags without a parser fall back to ``ExtensionParser``, which
+        keeps their subtree as is.
+        """
+        if parser_class := self.get_parser_class(tag, schema):
+            return parser_class()
+        if is_extension_tag(tag):
+            # Not at module level: the parser imports rootsy.models, which
+            # imports this module through rootsy.references.
+            from rootsy.parsers.extension import ExtensionParser  # noqa: PLC0415
+
+            return ExtensionParser(uri=schema.get(tag) if schema else None)
+        return None
+
+
+def _plugin_entry_points() -> Iterable[EntryPoint]:
+    # importlib.metadata takes longer to import than the rest of rootsy, so it
+    # is only imported when the registry is first built, not with rootsy.
+    from importlib.metadata import entry_points  # noqa: PLC0415
+
+    return entry_points(group=ENTRY_POINT_GROUP)
 
 
 def _build_registry() -> ParserRegistry:
     _registry = ParserRegistry()
 
-    for parser_class in discover_parsers():
-        _registry.register(parser_class)
+    for tag, spec in BUILTIN_PARSERS.items():
+        _registry.register_lazy(tag, spec)
+    # Plugins are registered after the built-in parsers so they can replace them.
+    for entry_point in _plugin_entry_points():
+        _registry.register_lazy(entry_point.name, entry_point)
     return _registry
 
 
@@ -45,6 +144,9 @@ def get_registry() -> ParserRegistry:
     return _build_registry()
 
 
-def get_parser_for_tag(tag: str) -> GedcomParser | None:
+def get_parser_for_tag(
+    tag: str,
+    schema: Mapping[str, str] | None = None,
+) -> GedcomParser | None:
     """Get a parser for a specific tag."""
-    return get_registry().get_parser_by_tag(tag)
+    return get_registry().get_parser_by_tag(tag, schema)
@@ -0,0 +1,104 @@
+"""Mergeable approximate counters for streaming statistics.
+
+Items are hashed with BLAKE2b rather than ``hash()``, whose results differ
+between processes, so sketches built from shards in separate processes can be
+merged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import operator
+from array import array
+
+# Two 64-bit hashes per item, combined as h1 + i * h2 for every row.
+_DIGEST_SIZE = 16
+_MASK_64 = (1 << 64) - 1
+
+
+def _hashes(item: str) -> tuple[int, int]:
+    digest = hashlib.blake2b(item.encode(), digest_size=_DIGEST_SIZE).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+class CountMinSketch:
+    """Approximate counts of items in fixed memory.
+
+    Estimates never undercount; with ``width`` w and ``depth`` d they overcount
+    by at most ``e / w`` of the total with probability ``1 - e^-d``.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._table = array("Q", bytes(8 * width * depth))
+
+    def _cells(self, item: str) -> list[int]:
+        first, second = _hashes(item)
+        return [
+            row * self.width + (first + row * second) % self.width
+            for row in range(self.depth)
+        ]
+
+    def add(self, item: str, count: int = 1) -> int:
+        """Count an item, and return its new estimate."""
+        cells = self._cells(item)
+        for cell in cells:
+            self._table[cell] += count
+        self.total += count
+        return min(self._table[cell] for cell in cells)
+
+    def estimate(self, item: str) -> int:
+        return min(self._table[cell] for cell in self._cells(item))
+
+    def merge(self, other: CountMinSketch) -> CountMinSketch:
+        """Combine two sketches of the same dimensions, as if of both inputs."""
+        if (self.width, self.depth) != (other.width, other.depth):
+            msg = "Cannot merge count-min sketches of different dimensions"
+            raise ValueError(msg)
+        merged = CountMinSketch(self.width, self.depth)
+        merged._table = array("Q", map(operator.add, self._table, other._table))
+        merged.total = self.total + other.total
+        return merged
+
+
+class HyperLogLog:
+    """Approximate number of distinct items in ``2 ** precision`` bytes.
+
+    The standard error is about ``1.04 / sqrt(2 ** precision)``, 1.6% for the
+    default precision.
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, item: str) -> None:
+        value, _ = _hashes(item)
+        register = value >> (64 - self.precision)
+        remaining = (value << self.precision) & _MASK_64
+        # Position of the first set bit of the remaining bits.
+        rank = min(65 - remaining.bit_length(), 65 - self.precision)
+        self._registers[register] = max(self._registers[register], rank)
+
+    def count(self) -> int:
+        registers = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / registers)
+        estimate = alpha * registers**2 / sum(2.0**-rank for rank in self._registers)
+
+        # Linear counting is more accurate while many registers are empty.
+        empty = self._registers.count(0)
+        if estimate <= 2.5 * registers and empty:
+            estimate = registers * math.log(registers / empty)
+        return round(estimate)
+
+    def merge(self, other: HyperLogLog) -> HyperLogLog:
+        """Combine two sketches of the same precision, as if of both inputs."""
+        if self.precision != other.precision:
+            msg = "Cannot merge HyperLogLog sketches of different precision"
+            raise ValueError(msg)
+        merged = HyperLogLog(self.precision)
+        merged._registers = bytearray(map(max, self._registers, other._registers))
+        return merged
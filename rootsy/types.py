@@ -1,7 +1,15 @@
-from typing import ClassVar, Self
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, ClassVar, Self
 
 import attrs
 
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from rootsy.compact import Compactor
+    from rootsy.events import EventTable
+
 
 @attrs.frozen(slots=True, kw_only=True)
 class GedcomLine:
@@ -17,7 +25,11 @@ class GedcomLine:
 
     @classmethod
     def from_string(cls, line: str) -> Self | None:
-        """Parse a GEDCOM line into its components."""
+        """Parse a GEDCOM line, without its terminator, into its components.
+
+        The value is everything after the single delimiter following the tag,
+        so the spaces at either end of a value split by CONC are kept.
+        """
         parts = line.split(maxsplit=2)
         if len(parts) < cls.MIN_PARTS:
             return None
@@ -28,13 +40,23 @@ class GedcomLine:
         # Handle cross-reference IDs
         if remainder[0].startswith("@") and remainder[0].endswith("@"):
             xref = remainder[0]
-            tag = remainder[1] if len(remainder) > 1 else ""
-            value = remainder[2] if len(remainder) > cls.MIN_PARTS else ""
+            # The tag and value still share the last part after an xref
+            text = remainder[1] if len(remainder) > 1 else ""
+            tag_and_value = text.split(maxsplit=1)
+            tag = tag_and_value[0] if tag_and_value else ""
+            value = tag_and_value[1] if len(tag_and_value) > 1 else ""
         else:
             xref = None
+            text = line
             tag = remainder[0]
             value = remainder[1] if len(remainder) > 1 else ""
 
+        # Splitting drops all the spaces before the value, not just the
+        # delimiter; put back the rest. Values of only spaces stay empty.
+        start = len(text) - len(value)
+        if value and text[start - 2] == " ":
+            value = text[len(text[:start].rstrip()) + 1 :]
+
         return cls(
             level=level,
             tag=tag,
@@ -42,14 +64,40 @@ class GedcomLine:
             xref=xref,
         )
 
+    def to_string(self) -> str:
+        """Format the line as it appears in a GEDCOM file."""
+        parts = [str(self.level), self.tag]
+        if self.xref:
+            parts.insert(1, self.xref)
+        if self.value:
+            parts.append(self.value)
+        return " ".join(parts)
+
+
+def is_pointer(value: str) -> bool:
+    """Whether a line value is a pointer to a record, e.g. "@S1@"."""
+    return len(value) > 2 and value[0] == value[-1] == "@"  # noqa: PLR2004
+
 
 class ParsingContext:
     """Manages parsing state and hierarchy tracking.
 
-    Shared across all parsers to maintain consistent state.
+    Shared across all parsers to maintain consistent state. With a
+    ``compactor``, record parsers build their records in compact form.
+    ``schema`` maps extension tags to the URIs declared in HEAD.SCHMA, for
+    looking up the parsers of nested structures. With an ``events`` table,
+    record parsers add their events to it and keep a view of them.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        compactor: Compactor | None = None,
+        schema: Mapping[str, str] | None = None,
+        events: EventTable | None = None,
+    ) -> None:
+        self.compactor = compactor
+        self.schema = schema
+        self.events = events
         self._current_level: int = -1
         self._current_path: list[str] = []
 
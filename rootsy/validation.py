@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from enum import Enum, auto
+from typing import TYPE_CHECKING
+
+import attrs
+
+from rootsy.reader import GedcomReader
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from rootsy.models import GedcomStructure
+    from rootsy.reader import GedcomSource
+    from rootsy.types import GedcomLine
+
+
+class IssueKind(Enum):
+    """Kinds of referential-integrity problems."""
+
+    DANGLING_XREF = auto()
+    NON_RECIPROCAL_LINK = auto()
+    DUPLICATE_XREF = auto()
+    ANCESTRY_CYCLE = auto()
+
+
+@attrs.frozen(slots=True, kw_only=True)
+class ValidationIssue:
+    kind: IssueKind
+    xref: str
+    target: str | None = None
+    message: str
+
+
+@attrs.define(slots=True, kw_only=True)
+class LinkIndex:
+    """Flat record of the xrefs and family links found in a file.
+
+    Indexes built from separate shards of a file can be combined with
+    ``merge``, so collection can run in parallel and be checked once.
+    """
+
+    records: dict[str, str] = attrs.field(factory=dict)
+    duplicates: list[str] = attrs.field(factory=list)
+    # (individual, family) pairs
+    famc: list[tuple[str, str]] = attrs.field(factory=list)
+    fams: list[tuple[str, str]] = attrs.field(factory=list)
+    # (family, individual) pairs
+    spouses: list[tuple[str, str]] = attrs.field(factory=list)
+    children: list[tuple[str, str]] = attrs.field(factory=list)
+    # A GedcomStructure doesn't keep FAMS links, so HUSB/WIFE can't be checked for
+    # reciprocity when the index is built from one.
+    spouse_links_recorded: bool = True
+
+    def add_record(self, xref: str, tag: str) -> None:
+        if xref in self.records:
+            self.duplicates.append(xref)
+        else:
+            self.records[xref] = tag
+
+    def add_group(self, group: list[GedcomLine]) -> None:
+        """Collect the xref and links of a level-0 record group."""
+        first = group[0]
+        if not first.xref:
+            return
+
+        xref = first.xref
+        self.add_record(xref, first.tag)
+
+        for line in group[1:]:
+            if line.level != 1:
+                continue
+            match line.tag:
+                case "FAMC":
+                    self.famc.append((xref, line.value))
+                case "FAMS":
+                    self.fams.append((xref, line.value))
+                case "HUSB" | "WIFE":
+                    self.spouses.append((xref, line.value))
+                case "CHIL":
+                    self.children.append((xref, line.value))
+
+    def merge(self, other: LinkIndex) -> LinkIndex:
+        """Combine two indexes, reporting xrefs defined in both as duplicates."""
+        merged = LinkIndex(
+            records=dict(self.records),
+            duplicates=[*self.duplicates, *other.duplicates],
+            famc=[*self.famc, *other.famc],
+            fams=[*self.fams, *other.fams],
+            spouses=[*self.spouses, *other.spouses],
+            children=[*self.children, *other.children],
+            spouse_links_recorded=(
+                self.spouse_links_recorded and other.spouse_links_recorded
+            ),
+        )
+        for xref, tag in other.records.items():
+            merged.add_record(xref, tag)
+        return merged
+
+    @classmethod
+    def from_line_groups(cls, groups: Iterable[list[GedcomLine]]) -> LinkIndex:
+        index = cls()
+        for group in groups:
+            index.add_group(group)
+        return index
+
+    @classmethod
+    def from_structure(cls, structure: GedcomStructure) -> LinkIndex:
+        index = cls(spouse_links_recorded=False)
+        for xref, individual in structure.individuals.items():
+            index.add_record(xref, individual.tag)
+            index.famc.extend((xref, family) for family in individual.families)
+        for xref, family in structure.families.items():
+            index.add_record(xref, family.tag)
+            index.spouses.extend(
+                (xref, spouse) for spouse in (family.husband, family.wife) if spouse
+            )
+            index.children.extend((xref, child) for child in family.children)
+        return index
+
+
+def _check_links(
+    links: list[tuple[str, str]],
+    backlinks: set[tuple[str, str]] | None,
+    records: dict[str, str],
+    target_tag: str,
+    description: str,
+) -> Iterator[ValidationIssue]:
+    for source, target in links:
+        if records.get(target) != target_tag:
+            yield ValidationIssue(
+                kind=IssueKind.DANGLING_XREF,
+                xref=source,
+                target=target,
+                message=f"{source} {description} {target}, which is not a {target_tag}",
+            )
+        elif backlinks is not None and (target, source) not in backlinks:
+            yield ValidationIssue(
+                kind=IssueKind.NON_RECIPROCAL_LINK,
+                xref=source,
+                target=target,
+                message=f"{source} {description} {target}, which doesn't link back",
+            )
+
+
+def _find_cycles(parents: dict[str, dict[str, None]]) -> Iterator[ValidationIssue]:
+    """Report each individual that is their own ancestor, once per cycle."""
+    done: set[str] = set()
+
+    for start in parents:
+        if start in done:
+            continue
+
+        # Iterative depth-first search; `path` holds the current ancestor chain.
+        path = [start]
+        on_path = {start}
+        stack = [iter(parents.get(start, ()))]
+        while stack:
+            parent = next(stack[-1], None)
+            if parent is None:
+                stack.pop()
+                done.add(on_path_node := path.pop())
+                on_path.discard(on_path_node)
+                continue
+            if parent in on_path:
+                cycle = [*path[path.index(parent) :], parent]
+                yield ValidationIssue(
+                    kind=IssueKind.ANCESTRY_CYCLE,
+                    xref=parent,
+                    message="Ancestry cycle: " + " -> ".join(cycle),
+                )
+            elif parent not in done:
+                path.append(parent)
+                on_path.add(parent)
+                stack.append(iter(parents.get(parent, ())))
+
+
+def check_links(index: LinkIndex) -> list[ValidationIssue]:
+    """Check an index for dangling, one-sided and cyclic links."""
+    issues = [
+        ValidationIssue(
+            kind=IssueKind.DUPLICATE_XREF,
+            xref=xref,
+            message=f"{xref} is defined more than once",
+        )
+        for xref in index.duplicates
+    ]
+
+    records = index.records
+    famc, children = set(index.famc), set(index.children)
+    issues.extend(_check_links(index.famc, children, records, "FAM", "is a child of"))
+    issues.extend(_check_links(index.children, famc, records, "INDI", "has child"))
+
+    fams = set(index.fams) if index.spouse_links_recorded else None
+    spouses = set(index.spouses)
+    issues.extend(_check_links(index.fams, spouses, records, "FAM", "is spouse in"))
+    issues.extend(_check_links(index.spouses, fams, records, "INDI", "has spouse"))
+
+    # Parents of each individual, through the families they are a child of.
+    spouses_by_family: defaultdict[str, list[str]] = defaultdict(list)
+    for family, spouse in index.spouses:
+        spouses_by_family[family].append(spouse)
+    # Dicts rather than sets keep the search, and so the report, in file order.
+    parents: defaultdict[str, dict[str, None]] = defaultdict(dict)
+    for family, child in [*index.children, *((f, i) for i, f in index.famc)]:
+        parents[child].update(dict.fromkeys(spouses_by_family.get(family, ())))
+    issues.extend(_find_cycles(parents))
+
+    return issues
+
+
+def validate_structure(structure: GedcomStructure) -> list[ValidationIssue]:
+    """Check the links of a parsed structure.
+
+    Duplicate xrefs can't be detected here, as the structure keeps one record
+    per xref; use ``validate_gedcom`` on the file for that.
+    """
+    return check_links(LinkIndex.from_structure(structure))
+
+
+def validate_gedcom(source: GedcomSource) -> list[ValidationIssue]:
+    """Check the links of a GEDCOM file in one streaming pass."""
+    reader = GedcomReader(source)
+    return check_links(LinkIndex.from_line_groups(reader.line_groups()))
@@ -0,0 +1,45 @@
+import datetime
+
+import pytest
+
+from rootsy.adapters import ParsingContext
+from rootsy.models import EventType
+from rootsy.parsers import EventParser
+from rootsy.types import GedcomLine
+
+
+@pytest.fixture
+def parser() -> EventParser:
+    """Return a fresh event parser instance."""
+    return EventParser()
+
+
+class TestEvent:
+    def test_exact_date_and_place(self, parser: EventParser) -> None:
+        lines = [
+            "1 BIRT",
+            "2 DATE 1 JAN 1970",
+            "2 PLAC Springfield, Illinois, USA",
+            "3 MAP",
+            "4 LATI N39.8",
+            "1 SEX M",
+        ]
+
+        gedcom_lines = [GedcomLine.from_string(line) for line in lines]
+        event, lines_consumed = parser.parse(gedcom_lines, ParsingContext())
+
+        assert event.type == EventType.BIRTH
+        assert event.date == datetime.date(1970, 1, 1)
+        assert event.date_value is None
+        assert event.place == "Springfield, Illinois, USA"
+        assert lines_consumed == 5  # noqa: PLR2004
+
+    def test_inexact_date_is_kept_as_written(self, parser: EventParser) -> None:
+        lines = ["1 RESI", "2 DATE ABT 1850"]
+
+        gedcom_lines = [GedcomLine.from_string(line) for line in lines]
+        event, _ = parser.parse(gedcom_lines, ParsingContext())
+
+        assert event.type == EventType.RESIDENCE
+        assert event.date is None
+        assert event.date_value == "ABT 1850"
@@ -0,0 +1,138 @@
+from collections.abc import ItemsView, Iterator
+
+from rootsy.aggregators import (
+    DateCoverage,
+    FamilySizes,
+    SexRatio,
+    SurnameFrequencies,
+    TagCounts,
+    UnhandledTags,
+    aggregate,
+    aggregate_gedcom,
+    merge_shards,
+    report,
+)
+from rootsy.reader import GedcomReader
+from rootsy.types import GedcomLine
+
+GEDCOM = b"""0 HEAD
+1 GEDC
+2 VERS 5.5.1
+0 @I1@ INDI
+1 NAME John /Doe/
+1 SEX M
+1 BIRT
+2 DATE 15 MAR 1900
+1 DEAT
+2 DATE ABT 1970
+1 _UID 1234
+0 @I2@ INDI
+1 NAME Jane /Roe/
+1 SEX F
+1 BIRT
+0 @I3@ INDI
+1 NAME Baby
+2 SURN Doe
+1 SEX F
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+1 MARR
+2 DATE BET 1920 AND 1925
+0 @F2@ FAM
+1 HUSB @I1@
+0 @X1@ _CUSTOM
+0 TRLR
+"""
+
+
+def test_aggregate_gedcom_reports_every_default_aggregator() -> None:
+    result = aggregate_gedcom(GEDCOM)
+
+    assert result["records"] == {
+        "INDI": 3,
+        "FAM": 2,
+        "HEAD": 1,
+        "_CUSTOM": 1,
+        "TRLR": 1,
+    }
+    assert result["surnames"]["top"] == [("Doe", 2), ("Roe", 1)]
+    assert result["surnames"]["distinct"] == 2  # noqa: PLR2004
+    assert result["sex"] == {"counts": {"M": 1, "F": 2}, "ratio": 50.0}
+    assert result["dates"] == {
+        "events": {
+            "BIRT": {"total": 2, "dated": 1, "exact": 1},
+            "DEAT": {"total": 1, "dated": 1, "exact": 0},
+            "MARR": {"total": 1, "dated": 1, "exact": 0},
+        },
+        "first_year": 1900,
+        "last_year": 1970,
+    }
+    assert result["family_sizes"] == {"distribution": {0: 1, 1: 1}, "mean": 0.5}
+    assert result["unhandled_tags"] == {"_UID": 1, "_CUSTOM": 1}
+
+
+def test_custom_aggregators_share_the_pass() -> None:
+    aggregators = aggregate(GedcomReader(GEDCOM).line_groups(), [TagCounts()])
+
+    assert report(aggregators) == {
+        "records": {"INDI": 3, "FAM": 2, "HEAD": 1, "_CUSTOM": 1, "TRLR": 1},
+    }
+
+
+def test_merged_shards_match_a_single_pass() -> None:
+    groups = list(GedcomReader(GEDCOM).line_groups())
+    factories = (
+        TagCounts,
+        SurnameFrequencies,
+        SexRatio,
+        DateCoverage,
+        FamilySizes,
+        UnhandledTags,
+    )
+
+    def run(part: list) -> list:
+        return list(aggregate(part, [factory() for factory in factories]))
+
+    shards = [run(groups[:3]), run(groups[3:5]), run(groups[5:])]
+
+    assert report(merge_shards(shards)) == report(run(groups))
+    assert merge_shards([]) == []
+
+
+class _CountingDict(dict[str, int]):
+    """A dict that counts how often it is scanned in full."""
+
+    scans = 0
+
+    def __iter__(self) -> Iterator[str]:
+        self.scans += 1
+        return super().__iter__()
+
+    def items(self) -> ItemsView[str, int]:
+        self.scans += 1
+        return super().items()
+
+
+def _person(surname: str) -> list[GedcomLine]:
+    return [
+        GedcomLine(level=0, tag="INDI", value=""),
+        GedcomLine(level=1, tag="NAME", value=f"A /{surname}/"),
+    ]
+
+
+def test_surname_candidates_are_not_scanned_per_record() -> None:
+    surnames = SurnameFrequencies(top=3, capacity=100)
+    surnames.candidates = _CountingDict()
+
+    # Many distinct surnames, with a frequent one turning up late.
+    records, late = 20_000, 15_000
+    for i in range(records):
+        surnames.add(_person(f"Rare{i}"))
+        if i >= late and i % 10 == 0:
+            surnames.add(_person("Late"))
+
+    assert surnames.candidates.scans <= records // surnames.capacity
+    assert len(surnames.candidates) == 100  # noqa: PLR2004
+    assert surnames.result()["top"][0][0] == "Late"
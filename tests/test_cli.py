@@ -0,0 +1,122 @@
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from rootsy.cli import expand_inputs, main
+
+GEDCOM = """0 HEAD
+1 GEDC
+2 VERS 5.5.1
+0 @I1@ INDI
+1 NAME John /Doe/
+1 FAMS @F1@
+0 @F1@ FAM
+1 HUSB @I1@
+1 CHIL @I2@
+0 @U1@ SUBM
+1 NAME Submitter
+0 TRLR
+"""
+
+
+@pytest.fixture
+def batch_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "uploads"
+    (directory / "nested").mkdir(parents=True)
+    (directory / "one.ged").write_text(GEDCOM)
+    (directory / "nested" / "two.ged").write_text(GEDCOM)
+    (directory / "broken.ged").write_text("0 HEAD\n1 GEDC\n2 VERS 6.0\n0 TRLR\n")
+    (directory / "notes.txt").write_text("not a GEDCOM file")
+    return directory
+
+
+def test_expand_inputs(batch_dir: Path) -> None:
+    assert expand_inputs([str(batch_dir)]) == [
+        str(batch_dir / "broken.ged"),
+        str(batch_dir / "nested" / "two.ged"),
+        str(batch_dir / "one.ged"),
+    ]
+    assert expand_inputs([str(batch_dir / "**" / "t*.ged")]) == [
+        str(batch_dir / "nested" / "two.ged"),
+    ]
+
+
+def test_cli_reports_each_file(
+    batch_dir: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    exit_code = main(["--jobs", "2", "--validate", str(batch_dir)])
+    thread_exit_code = main(["--jobs", "2", "--executor", "thread", str(batch_dir)])
+
+    out = capsys.readouterr().out.splitlines()
+    # Files are reported as they finish; each run ends with its summary.
+    reports, summary = sorted(out[:3]), out[3]
+    assert exit_code == thread_exit_code == 1
+    assert reports[0].startswith(f"{batch_dir / 'broken.ged'}: FAILED")
+    assert "UnsupportedGedcomVersionError" in reports[0]
+    assert reports[1].startswith(f"{batch_dir / 'nested' / 'two.ged'}: 1 individuals")
+    assert reports[1].endswith(", 1 integrity issues")
+    assert summary.startswith("2 files parsed, 1 failed: 2 individuals, 2 families")
+
+
+def test_cli_reports_files_that_are_not_gedcom(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    empty = tmp_path / "empty.ged"
+    empty.write_text("")
+    headless = tmp_path / "headless.ged"
+    headless.write_text("0 @I1@ INDI\n1 NAME John /Doe/\n0 TRLR\n")
+    valid = tmp_path / "valid.ged"
+    valid.write_text(GEDCOM)
+
+    exit_code = main(["--jobs", "1", str(empty), str(headless), str(valid)])
+
+    *reports, summary = capsys.readouterr().out.splitlines()
+    reports.sort()
+    assert exit_code == 1
+    assert reports[0] == (
+        f"{empty}: FAILED NotGedcomError: "
+        "Not a GEDCOM file: it doesn't start with a HEAD record"
+    )
+    assert reports[1].startswith(f"{headless}: FAILED NotGedcomError")
+    assert reports[2].startswith(f"{valid}: 1 individuals")
+    assert summary.startswith("1 files parsed, 2 failed")
+
+
+def test_cli_gives_up_on_files_past_the_timeout(
+    batch_dir: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    exit_code = main(["--jobs", "1", "--timeout", "0", str(batch_dir / "one.ged")])
+
+    out = capsys.readouterr().out.splitlines()
+    assert exit_code == 1
+    assert out[0].startswith(f"{batch_dir / 'one.ged'}: FAILED TimeoutError")
+
+
+def test_cli_writes_ndjson(tmp_path: Path, batch_dir: Path) -> None:
+    output = tmp_path / "records.ndjson"
+
+    exit_code = main(["--jobs", "1", "--summary", "-o", str(output), str(batch_dir)])
+
+    assert exit_code == 1
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [(record["tag"], record["xref"]) for record in records] == [
+        ("INDI", "@I1@"),
+        ("FAM", "@F1@"),
+    ] * 2
+    assert records[0]["data"]["name"] == "John /Doe/"
+
+
+def test_cli_writes_sqlite(tmp_path: Path, batch_dir: Path) -> None:
+    output = tmp_path / "records.sqlite"
+
+    main(["--jobs", "1", "-o", str(output), str(batch_dir / "one.ged")])
+
+    with sqlite3.connect(output) as connection:
+        rows = connection.execute("SELECT tag, xref FROM records").fetchall()
+    connection.close()
+    assert rows == [("INDI", "@I1@"), ("FAM", "@F1@")]
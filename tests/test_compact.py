@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+
+from rootsy.compact import Compactor, StringPool, measure_memory
+from rootsy.parser import parse_gedcom
+
+
+@pytest.fixture
+def family_file(tmp_path: Path) -> Path:
+    lines = ["0 HEAD", "1 GEDC", "2 VERS 5.5.1"]
+    for i in range(50):
+        lines += [f"0 @I{i}@ INDI", "1 SURN Smith", "1 SEX F", "1 FAMC @F1@"]
+    lines += ["0 @F1@ FAM", *(f"1 CHIL @I{i}@" for i in range(50)), "0 TRLR"]
+
+    path = tmp_path / "family.ged"
+    path.write_text("\n".join(lines))
+    return path
+
+
+def test_string_pool_returns_shared_instances() -> None:
+    pool = StringPool()
+    # Build equal strings at runtime so they are distinct objects.
+    first = pool.intern("SMITH".title())
+    second = pool.intern("smith".title())
+
+    assert first is second
+    assert pool.intern(None) is None
+    assert len(pool) == 1
+
+
+def test_compact_parse_uses_tuples_and_shared_strings(family_file: Path) -> None:
+    structure = parse_gedcom(family_file, compact=True)
+
+    first, second = structure.individuals["@I0@"], structure.individuals["@I1@"]
+    assert first.events == ()
+    assert first.families == ("@F1@",)
+    assert first.surname is second.surname
+    assert first.families[0] is second.families[0]
+
+    family = structure.families["@F1@"]
+    assert isinstance(family.children, tuple)
+    assert family.children[0] is first.id
+
+
+def test_records_are_built_compact(
+    family_file: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def built_twice(*_: object) -> None:
+        pytest.fail("Records were built in full before being compacted")
+
+    monkeypatch.setattr(Compactor, "compact", built_twice)
+    structure = parse_gedcom(family_file, compact=True)
+
+    assert structure.families["@F1@"].children[0] is structure.individuals["@I0@"].id
+
+
+def test_compact_parse_is_smaller(family_file: Path) -> None:
+    regular = measure_memory(parse_gedcom(family_file))
+    compact = measure_memory(parse_gedcom(family_file, compact=True))
+
+    assert compact.individual_count == regular.individual_count == 50  # noqa: PLR2004
+    assert compact.bytes_per_individual < regular.bytes_per_individual
@@ -0,0 +1,235 @@
+import io
+
+import pytest
+
+from rootsy.convert import age_to_v551, convert, date_to_v7, date_to_v551
+from rootsy.models import UnsupportedGedcomVersionError
+from rootsy.probe import NotGedcomError
+
+GEDCOM_551 = """0 HEAD
+1 SOUR MyApp
+2 VERS 1.0
+1 GEDC
+2 VERS 5.5.1
+2 FORM LINEAGE-LINKED
+1 CHAR ANSI
+1 SUBN @SN1@
+1 FILE tree.ged
+0 @SN1@ SUBN
+1 TEMP SLAKE
+0 @I1@ INDI
+1 NAME José /Doe/
+1 EMAI jose@@example.com
+1 BIRT
+2 DATE INT 1 JAN 1900 (new year's day)
+2 SOUR Family bible
+2 AGE INFANT
+1 DEAT
+2 DATE @#DJULIAN@ 30 JAN 1649/50
+1 NOTE @N1@
+1 FAMC @F1@
+2 PEDI birth
+1 OBJE
+2 FILE photo.jpg
+3 FORM jpg
+4 TYPE photo
+0 @I2@ INDI
+1 NAME Plain /Record/
+1 BIRT
+2 DATE ABT 1900
+0 @N1@ NOTE A long note th
+1 CONC at continues
+1 CONT on a new line
+0 TRLR
+"""
+
+GEDCOM_70 = """0 HEAD
+1 SOUR MyApp
+2 VERS 1.0
+1 GEDC
+2 VERS 7.0
+0 @I1@ INDI
+1 NAME José /Doe/
+1 EMAIL jose@example.com
+1 BIRT
+2 DATE 1 JAN 1900
+3 PHRASE new year's day
+2 SOUR @VOID@
+3 NOTE Family bible
+2 AGE < 1y
+3 PHRASE Infant
+1 DEAT
+2 DATE JULIAN 30 JAN 1650
+3 PHRASE JULIAN 30 JAN 1649/50
+1 SNOTE @N1@
+1 FAMC @F1@
+2 PEDI BIRTH
+1 OBJE
+2 FILE photo.jpg
+3 FORM image/jpeg
+4 MEDI PHOTO
+0 @I2@ INDI
+1 NAME Plain /Record/
+1 BIRT
+2 DATE ABT 1900
+0 @N1@ SNOTE A long note that continues
+1 CONT on a new line
+0 TRLR
+"""
+
+
+def run(source: bytes, version: str) -> str:
+    output = io.BytesIO()
+    convert(source, output, version=version)
+    return output.getvalue().decode("utf-8")
+
+
+def test_convert_to_v7() -> None:
+    assert run(GEDCOM_551.encode("cp1252"), "7.0") == GEDCOM_70
+
+
+GEDCOM_551_BACK = """0 HEAD
+1 SOUR MyApp
+2 VERS 1.0
+1 GEDC
+2 VERS 5.5.1
+2 FORM LINEAGE-LINKED
+1 CHAR UTF-8
+0 @I1@ INDI
+1 NAME José /Doe/
+1 EMAI jose@@example.com
+1 BIRT
+2 DATE INT 1 JAN 1900 (new year's day)
+2 SOUR Family bible
+2 AGE INFANT
+1 DEAT
+2 DATE INT @#DJULIAN@ 30 JAN 1650 (JULIAN 30 JAN 1649/50)
+1 NOTE @N1@
+1 FAMC @F1@
+2 PEDI birth
+1 OBJE
+2 FILE photo.jpg
+3 FORM jpg
+4 TYPE photo
+0 @I2@ INDI
+1 NAME Plain /Record/
+1 BIRT
+2 DATE ABT 1900
+0 @N1@ NOTE A long note that continues
+1 CONT on a new line
+0 TRLR
+"""
+
+
+def test_convert_to_v551() -> None:
+    assert run(GEDCOM_70.encode(), "5.5.1") == GEDCOM_551_BACK
+
+
+def test_conversion_across_block_boundaries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("rootsy.reader.GedcomReader.BUFFER_SIZE", 32)
+
+    # Too little is buffered to sniff HEAD.CHAR, so stick to the default.
+    source = GEDCOM_551.replace("CHAR ANSI", "CHAR UTF-8").encode()
+    assert run(source, "7.0") == GEDCOM_70
+    assert run(GEDCOM_70.encode(), "5.5.1") == GEDCOM_551_BACK
+
+
+def test_same_version_only_changes_the_charset() -> None:
+    source = GEDCOM_551.replace("\n", "\r\n").encode("cp1252")
+
+    assert run(source, "5.5.1") == GEDCOM_551.replace("CHAR ANSI", "CHAR UTF-8")
+    assert run(GEDCOM_70.encode(), "7.0") == GEDCOM_70
+
+
+def test_long_values_are_split_for_v551() -> None:
+    text = " ".join(["word"] * 100)
+    source = GEDCOM_70.replace("A long note that continues", text).encode()
+
+    converted = run(source, "5.5.1")
+
+    assert max(map(len, converted.splitlines())) <= 255  # noqa: PLR2004
+    assert "1 CONC " in converted
+    assert f"0 @N1@ SNOTE {text}\n" in run(converted.encode(), "7.0")
+
+
+HEAD_551 = "0 HEAD\n1 GEDC\n2 VERS 5.5.1\n2 FORM LINEAGE-LINKED\n1 CHAR UTF-8\n"
+HEAD_70 = "0 HEAD\n1 GEDC\n2 VERS 7.0\n"
+
+
+def test_continued_values_keep_their_spaces() -> None:
+    source = (
+        f"{HEAD_551}0 @N1@ NOTE This is a long \n1 CONC note with  spaces @@ \n"
+        "1 CONC  tail\n1 CONT    indented line\n0 TRLR\n"
+    )
+
+    assert run(source.encode(), "7.0") == (
+        f"{HEAD_70}0 @N1@ SNOTE This is a long note with  spaces @  tail\n"
+        "1 CONT    indented line\n0 TRLR\n"
+    )
+
+
+def test_void_pointers_are_removed_for_v551() -> None:
+    records = (
+        "0 @I1@ INDI\n1 BIRT\n2 SOUR Parish register\n3 CONT page 12\n"
+        "3 QUAY 2\n1 FAMC @VOID@\n2 PEDI BIRTH\n1 SEX M\n0 TRLR\n"
+    )
+
+    converted = run(f"{HEAD_551}{records}".encode(), "7.0")
+
+    assert "2 SOUR @VOID@\n3 NOTE Parish register\n4 CONT page 12\n" in converted
+    assert run(converted.encode(), "5.5.1") == (
+        f"{HEAD_551}0 @I1@ INDI\n1 BIRT\n2 SOUR Parish register\n"
+        "3 CONT page 12\n3 QUAY 2\n1 SEX M\n0 TRLR\n"
+    )
+
+
+def test_header_without_version() -> None:
+    with pytest.raises(NotGedcomError):
+        run(b"0 HEAD\n1 SOUR X\n0 TRLR\n", "7.0")
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1 JAN 1900", ("1 JAN 1900", None)),
+        ("ABT @#DGREGORIAN@ 1900", ("ABT GREGORIAN 1900", None)),
+        (
+            "FROM @#DFRENCH R@ 1 VEND 12 TO 1820",
+            ("FROM FRENCH_R 1 VEND 12 TO 1820", None),
+        ),
+        ("10 b.c.", ("10 BCE", None)),
+        ("(the spring)", ("", "the spring")),
+        ("@#DROMAN@ 1 JAN 100", ("", "@#DROMAN@ 1 JAN 100")),
+    ],
+)
+def test_date_to_v7(value: str, expected: tuple[str, str | None]) -> None:
+    assert date_to_v7(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "phrase", "expected"),
+    [
+        ("JULIAN 1 JAN 1700", None, ("@#DJULIAN@ 1 JAN 1700", False)),
+        ("GREGORIAN 1900", None, ("1900", False)),
+        ("", "the spring", ("(the spring)", True)),
+        ("1900", "maybe", ("INT 1900 (maybe)", True)),
+        ("BET 1900 AND 1910", "maybe", ("BET 1900 AND 1910", False)),
+    ],
+)
+def test_date_to_v551(
+    value: str,
+    phrase: str | None,
+    expected: tuple[str, bool],
+) -> None:
+    assert date_to_v551(value, phrase) == expected
+
+
+def test_age_to_v551() -> None:
+    assert age_to_v551("< 8y", "Child") == ("CHILD", True)
+    assert age_to_v551("> 1y 3w", None) == ("> 1y 21d", False)
+    assert age_to_v551("30y", "about") == ("30y", False)
+
+
+def test_unsupported_target_version() -> None:
+    with pytest.raises(UnsupportedGedcomVersionError):
+        run(GEDCOM_551.encode(), "5.5")
@@ -0,0 +1,36 @@
+import datetime
+
+import pytest
+
+from rootsy.dates import DateRange, parse_date_range, parse_exact_date
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1 JAN 1970", DateRange(19700101, 19700101)),
+        ("JAN 1970", DateRange(19700101, 19700131)),
+        ("APR 1970", DateRange(19700401, 19700430)),
+        ("FEB 1900", DateRange(19000201, 19000228)),
+        ("FEB 2000", DateRange(20000201, 20000229)),
+        ("1970", DateRange(19700101, 19701231)),
+        ("ABT 1850", DateRange(18500101, 18501231)),
+        ("BEF 1900", DateRange(0, 19001231)),
+        ("AFT MAR 1900", DateRange(19000301, 0)),
+        ("BET 1850 AND 1860", DateRange(18500101, 18601231)),
+        ("FROM 1 MAY 1901 TO 1905", DateRange(19010501, 19051231)),
+        ("@#DJULIAN@ 11 FEB 1731/32", DateRange(17310211, 17310211)),
+        ("INT 1900 (about the turn of the century)", DateRange(19000101, 19001231)),
+        ("(stillborn)", None),
+        ("32 FOO 1900", None),
+        ("", None),
+    ],
+)
+def test_parse_date_range(value: str, expected: DateRange | None) -> None:
+    assert parse_date_range(value) == expected
+
+
+def test_parse_exact_date() -> None:
+    assert parse_exact_date("5 jun 1944") == datetime.date(1944, 6, 5)
+    assert parse_exact_date("JUN 1944") is None
+    assert parse_exact_date("31 FEB 1900") is None
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+from rootsy.diff import FieldChange, diff_gedcom
+
+OLD_GEDCOM = """0 HEAD
+1 GEDC
+2 VERS 5.5.1
+0 @I1@ INDI
+1 NAME John /Doe/
+1 SEX M
+0 @I2@ INDI
+1 NAME Jane /Doe/
+0 @I3@ INDI
+1 NAME Old /Record/
+0 @F1@ FAM
+1 HUSB @I1@
+0 TRLR"""
+
+NEW_GEDCOM = """0 HEAD
+1 GEDC
+2 VERS 5.5.1
+0 @F1@ FAM
+1 HUSB @I1@
+0 @I1@ INDI
+1 NAME John /Doe/
+1 SEX M
+1 BIRT
+2 DATE 1 JAN 1970
+0 @I20@ INDI
+1 NAME Jane /Doe/
+0 @I4@ INDI
+1 NAME New /Record/
+0 TRLR"""
+
+
+def _write(tmp_path: Path, name: str, content: str) -> Path:
+    path = tmp_path / name
+    path.write_text(content)
+    return path
+
+
+def test_identical_files_have_no_diff(tmp_path: Path) -> None:
+    old = _write(tmp_path, "old.ged", OLD_GEDCOM)
+
+    assert diff_gedcom(old, old).is_empty
+
+
+def test_diff_reports_record_changes(tmp_path: Path) -> None:
+    old = _write(tmp_path, "old.ged", OLD_GEDCOM)
+    new = _write(tmp_path, "new.ged", NEW_GEDCOM)
+
+    diff = diff_gedcom(old, new)
+
+    # Moving F1 to another position in the file is not a change.
+    assert diff.added == ("@I4@",)
+    assert diff.removed == ("@I3@",)
+    assert diff.renamed == {"@I2@": "@I20@"}
+
+    assert len(diff.modified) == 1
+    change = diff.modified[0]
+    assert change.key == "@I1@"
+    assert change.tag == "INDI"
+    assert change.fields == (
+        FieldChange(path=("BIRT",), old=(), new=("",)),
+        FieldChange(path=("BIRT", "DATE"), old=(), new=("1 JAN 1970",)),
+    )
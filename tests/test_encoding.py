@@ -0,0 +1,42 @@
+import codecs
+
+import pytest
+
+from rootsy.encoding import detect_encoding
+
+
+class TestAnselCodec:
+    def test_decode_spacing_and_combining_characters(self) -> None:
+        assert b"\xa5gir \xe8Ulla Fran\xf0cois".decode("ansel") == "Ægir Ülla François"
+
+    def test_encode_round_trip(self) -> None:
+        text = "Łukasz Wałęsa, Ærø, Ångström"
+
+        assert text.encode("ansel").decode("ansel") == text
+
+    def test_incremental_decoder_holds_back_trailing_marks(self) -> None:
+        decoder = codecs.getincrementaldecoder("ansel")()
+
+        decoded = decoder.decode(b"Jos\xe2") + decoder.decode(b"e", final=True)
+
+        assert decoded == "José"
+
+    def test_undefined_byte(self) -> None:
+        with pytest.raises(UnicodeDecodeError):
+            b"\x80".decode("ansel")
+        assert b"a\x80".decode("ansel", "replace") == "a�"
+
+
+@pytest.mark.parametrize(
+    ("prefix", "expected"),
+    [
+        (codecs.BOM_UTF8 + b"0 HEAD\n1 CHAR ANSEL\n", "utf-8-sig"),
+        (codecs.BOM_UTF16_LE + "0 HEAD".encode("utf-16-le"), "utf-16"),
+        ("0 HEAD\n".encode("utf-16-be"), "utf-16-be"),
+        (b"0 HEAD\n1 SOUR X\n1 CHAR ANSEL\n0 @I1@ INDI\n", "ansel"),
+        (b"0 HEAD\n0 @N1@ NOTE\n1 CHAR ANSEL\n", "utf-8-sig"),
+        (b"0 HEAD\n1 GEDC\n2 VERS 7.0\n", "utf-8-sig"),
+    ],
+)
+def test_detect_encoding(prefix: bytes, expected: str) -> None:
+    assert detect_encoding(prefix) == expected
@@ -0,0 +1,133 @@
+import datetime
+
+import pytest
+
+from rootsy.models import EventType
+from rootsy.parser import parse_gedcom
+
+GEDCOM = b"""0 HEAD
+1 GEDC
+2 VERS 5.5.1
+0 @I1@ INDI
+1 NAME John /Doe/
+1 BIRT
+2 DATE 15 MAR 1900
+2 PLAC Springfield, Illinois, USA
+1 RESI
+2 DATE FROM 1920 TO 1930
+2 PLAC Chicago, Illinois, USA
+1 DEAT
+2 DATE 10 MAR 1970
+0 @I2@ INDI
+1 NAME Jane /Roe/
+1 BIRT
+2 DATE ABT 1905
+0 @I3@ INDI
+1 NAME Baby /Doe/
+1 BIRT
+2 DATE 1 JAN 1931
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+1 MARR
+2 DATE 1 JUN 1925
+2 PLAC Chicago, Illinois, USA
+0 TRLR
+"""
+
+
+def test_events_are_stored_column_wise() -> None:
+    structure = parse_gedcom(GEDCOM)
+    events = structure.events
+
+    assert len(events) == 6  # noqa: PLR2004
+    assert events.types.tolist() == [
+        EventType.BIRTH.value,
+        EventType.RESIDENCE.value,
+        EventType.DEATH.value,
+        EventType.BIRTH.value,
+        EventType.BIRTH.value,
+        EventType.MARRIAGE.value,
+    ]
+    assert events.starts[1] == 19200101  # noqa: PLR2004
+    assert events.ends[1] == 19301231  # noqa: PLR2004
+    # Places are shared with the structure's place table.
+    assert events.place_ids[1] == events.place_ids[5]
+    assert structure.places.full_name(events.place_ids[1]) == "Chicago, Illinois, USA"
+
+
+def test_events_are_materialised_on_access() -> None:
+    structure = parse_gedcom(GEDCOM)
+
+    birth, residence, death = structure.events.events_of("@I1@")
+    assert birth.type == EventType.BIRTH
+    assert birth.date == datetime.date(1900, 3, 15)
+    assert birth.place is None
+    assert structure.places.full_name(birth.place_id) == "Springfield, Illinois, USA"
+    assert residence.date is None
+    assert death.date == datetime.date(1970, 3, 10)
+    assert [event.type for event in structure.events.events_of("@F1@")] == [
+        EventType.MARRIAGE,
+    ]
+    assert structure.events.events_of("@I9@") == []
+
+
+def test_record_events_are_views_of_the_table() -> None:
+    structure = parse_gedcom(GEDCOM)
+    individual = structure.individuals["@I1@"]
+
+    assert individual.events == structure.events.events_of("@I1@")
+    assert [event.type for event in individual.events[1:]] == [
+        EventType.RESIDENCE,
+        EventType.DEATH,
+    ]
+    assert individual.events[1].date_value == "FROM 1920 TO 1930"
+    assert structure.individuals["@I2@"].events[0].date_value == "ABT 1905"
+    assert structure.families["@F1@"].marriage_event.date == datetime.date(1925, 6, 1)
+
+
+def test_records_are_built_with_their_event_views() -> None:
+    structure = parse_gedcom(GEDCOM, compact=True)
+    individual = structure.individuals["@I1@"]
+
+    rows = len(structure.events)
+
+    # The parsed record was stored as built, without being copied for its view.
+    structure.add_individual(individual)
+    assert structure.individuals["@I1@"] is individual
+    assert len(structure.events) == rows
+    assert [event.type for event in individual.events] == [
+        EventType.BIRTH,
+        EventType.RESIDENCE,
+        EventType.DEATH,
+    ]
+
+
+def test_generic_events() -> None:
+    source = GEDCOM.replace(b"1 RESI\n", b"1 EVEN\n2 TYPE Emigration\n")
+
+    structure = parse_gedcom(source)
+
+    events = structure.individuals["@I1@"].events
+    assert [event.type for event in events] == [
+        EventType.BIRTH,
+        EventType.EVENT,
+        EventType.DEATH,
+    ]
+    assert events[1].additional_details == {"type": "Emigration"}
+    assert events[0].additional_details == {}
+
+
+def test_vectorised_statistics() -> None:
+    np = pytest.importorskip("numpy")
+    structure = parse_gedcom(GEDCOM)
+    events = structure.events
+
+    records, ages = events.lifespans()
+    assert [events.record_ids[index] for index in records] == ["@I1@"]
+    assert ages.tolist() == [69]
+    assert events.births_per_decade() == {1900: 2, 1930: 1}
+    # 25 for the husband, 20 for the wife, whose birth is known to the year.
+    assert events.mean_age_at_marriage(structure.families) == pytest.approx(22.5)
+    assert events.columns()["start"].dtype == np.int32
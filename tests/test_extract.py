@@ -0,0 +1,136 @@
+import gzip
+import io
+from pathlib import Path
+
+import pytest
+
+from rootsy.extract import PointerIndex, extract, write_records
+from rootsy.parser import parse_gedcom
+
+GEDCOM = b"""0 HEAD
+1 SOUR Other
+2 VERS 1.0
+1 GEDC
+2 VERS 5.5.1
+2 FORM LINEAGE-LINKED
+1 CHAR UTF-8
+1 SUBM @U1@
+0 @U1@ SUBM
+1 NAME Submitter
+0 @I1@ INDI
+1 NAME Child /Doe/
+1 FAMC @F1@
+1 BIRT
+2 DATE 1 JAN 1950
+2 SOUR @S1@
+3 PAGE p. 4
+0 @I2@ INDI
+1 NAME Father /Doe/
+1 FAMS @F1@
+1 FAMS @F2@
+1 FAMC @F3@
+0 @I3@ INDI
+1 NAME Mother /Roe/
+1 FAMS @F1@
+1 NOTE @N1@
+0 @I4@ INDI
+1 NAME Grandfather /Doe/
+1 FAMS @F3@
+0 @I5@ INDI
+1 NAME Other /Wife/
+1 FAMS @F2@
+0 @I6@ INDI
+1 NAME Half /Doe/
+1 FAMC @F2@
+0 @F1@ FAM
+1 HUSB @I2@
+1 WIFE @I3@
+1 CHIL @I1@
+0 @F2@ FAM
+1 HUSB @I2@
+1 WIFE @I5@
+1 CHIL @I6@
+0 @F3@ FAM
+1 HUSB @I4@
+1 CHIL @I2@
+0 @S1@ SOUR
+1 TITL Census
+1 REPO @R1@
+0 @R1@ REPO
+1 NAME Archive
+0 @N1@ NOTE A shared note
+0 TRLR
+"""
+
+
+def test_ancestors_walk_up_through_families() -> None:
+    index = PointerIndex.from_source(GEDCOM)
+
+    assert index.ancestors("@I1@") == {"@I1@", "@F1@", "@I2@", "@I3@", "@F3@", "@I4@"}
+    assert index.ancestors("@I1@", generations=1) == {"@I1@", "@F1@", "@I2@", "@I3@"}
+
+
+def test_descendants_include_spouses() -> None:
+    index = PointerIndex.from_source(GEDCOM)
+
+    assert index.descendants("@I2@") == {
+        *("@I2@", "@I3@", "@I5@"),
+        *("@F1@", "@F2@"),
+        *("@I1@", "@I6@"),
+    }
+    assert index.descendants("@I4@", generations=1) == {"@I4@", "@F3@", "@I2@"}
+
+
+def test_closure_follows_references_transitively() -> None:
+    index = PointerIndex.from_source(GEDCOM)
+
+    assert index.closure({"@I1@", "@I3@"}) == {
+        *("@I1@", "@I3@"),
+        *("@S1@", "@R1@", "@N1@", "@U1@"),
+    }
+
+
+def test_extract_copies_records_and_drops_dangling_pointers() -> None:
+    output = io.BytesIO()
+
+    written = extract(GEDCOM, output, ancestors_of=["@I1@"], generations=1)
+
+    assert written == {
+        *("@I1@", "@I2@", "@I3@", "@F1@"),
+        *("@S1@", "@R1@", "@N1@", "@U1@"),
+    }
+    text = output.getvalue()
+    assert text.startswith(
+        b"0 HEAD\n1 SOUR rootsy\n1 GEDC\n2 VERS 5.5.1\n2 FORM LINEAGE-LINKED\n"
+        b"1 CHAR UTF-8\n1 SUBM @U1@\n0 @U1@ SUBM\n",
+    )
+    assert text.endswith(b"0 @N1@ NOTE A shared note\n0 TRLR\n")
+    # Unchanged records are copied as they are.
+    assert b"0 @I1@ INDI\n1 NAME Child /Doe/\n1 FAMC @F1@\n1 BIRT\n" in text
+    # The father's second family and his parents are left out.
+    assert b"0 @I2@ INDI\n1 NAME Father /Doe/\n1 FAMS @F1@\n0 @I3@ INDI" in text
+
+    structure = parse_gedcom(text)
+    assert set(structure.individuals) == {"@I1@", "@I2@", "@I3@"}
+    assert set(structure.families) == {"@F1@"}
+
+
+def test_write_records_from_a_compressed_file_keeps_line_endings(
+    tmp_path: Path,
+) -> None:
+    source = gzip.compress(GEDCOM.replace(b"\n", b"\r\n"))
+    destination = tmp_path / "subset.ged"
+
+    write_records(source, {"@I4@", "@F3@"}, destination)
+
+    assert destination.read_bytes() == (
+        b"0 HEAD\r\n1 SOUR rootsy\r\n1 GEDC\r\n2 VERS 5.5.1\r\n"
+        b"2 FORM LINEAGE-LINKED\r\n1 CHAR UTF-8\r\n"
+        b"0 @I4@ INDI\r\n1 NAME Grandfather /Doe/\r\n1 FAMS @F3@\r\n"
+        b"0 @F3@ FAM\r\n1 HUSB @I4@\r\n0 TRLR\r\n"
+    )
+
+
+def test_utf16_sources_are_rejected() -> None:
+    with pytest.raises(ValueError, match="ASCII-compatible"):
+        PointerIndex.from_source(GEDCOM.decode().encode("utf-16"))
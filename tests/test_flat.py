@@ -0,0 +1,104 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from rootsy.flat import FlatTree, export_tree, to_file, to_shared_memory
+from rootsy.models import Family, Individual
+from rootsy.parser import parse_gedcom
+
+GEDCOM = """0 HEAD
+1 GEDC
+2 VERS 5.5.1
+0 @I1@ INDI
+1 NAME John /Doe/
+1 SEX M
+0 @I2@ INDI
+1 NAME Zoë /Roe/
+1 SEX F
+0 @I3@ INDI
+1 NAME James /Doe/
+1 FAMC @F1@
+1 FAMC @F9@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+1 CHIL @I9@
+0 TRLR
+""".encode()
+
+
+def _children_of(name: str, xref: str) -> list[str]:
+    with FlatTree.from_shared_memory(name) as tree:
+        family = tree.find(xref)
+        return [child.name for child in family.children]
+
+
+def test_flat_tree_accessors() -> None:
+    tree = FlatTree(export_tree(parse_gedcom(GEDCOM)))
+
+    assert tree.individual_count == 3  # noqa: PLR2004
+    assert tree.family_count == 1
+    john, zoe, james = tree.individuals()
+    assert (john.id, john.name, john.sex) == ("@I1@", "John /Doe/", "M")
+    assert zoe.name == "Zoë /Roe/"
+    assert james.sex is None
+
+    [family] = tree.families()
+    assert family.husband == john
+    assert family.wife == zoe
+    # Links to records missing from the tree are left out.
+    assert family.children == (james,)
+    assert james.families == (family,)
+
+    assert tree.find("@I2@") == zoe
+    assert tree.find("@F1@") == family
+    assert tree.find("@X1@") is None
+
+
+def test_flat_records_round_trip() -> None:
+    structure = parse_gedcom(GEDCOM)
+    tree = FlatTree(export_tree(structure))
+
+    assert tree.find("@I1@").to_record() == Individual(
+        id="@I1@",
+        name="John /Doe/",
+        sex="M",
+    )
+    assert tree.find("@F1@").to_record() == Family(
+        id="@F1@",
+        husband="@I1@",
+        wife="@I2@",
+        children=["@I3@"],
+    )
+
+
+def test_flat_tree_rejects_other_buffers() -> None:
+    with pytest.raises(ValueError, match="Not a flat GEDCOM tree"):
+        FlatTree(b"\x00" * 64)
+
+
+def test_flat_tree_from_file(tmp_path: Path) -> None:
+    path = tmp_path / "tree.flat"
+    to_file(parse_gedcom(GEDCOM), path)
+
+    with FlatTree.from_file(path) as tree:
+        assert tree.find("@I3@").families[0].id == "@F1@"
+        assert tree.buffer.readonly
+
+
+def test_workers_read_from_shared_memory() -> None:
+    block = to_shared_memory(parse_gedcom(GEDCOM))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            children = executor.submit(_children_of, block.name, "@F1@").result()
+    finally:
+        block.close()
+        block.unlink()
+
+    assert children == ["James /Doe/"]
@@ -0,0 +1,125 @@
+import hashlib
+from pathlib import Path
+
+import attrs
+import pytest
+
+from rootsy.adapters import GedcomParser
+from rootsy.media import ManifestCache, build_manifest, hash_file, media_files
+from rootsy.models import MultimediaFile
+from rootsy.parser import parse_gedcom
+from rootsy.registry import get_parser_for_tag
+
+GEDCOM = b"""0 HEAD
+1 GEDC
+2 VERS 5.5.1
+0 @O1@ OBJE
+1 TITL Family portrait
+1 FILE scans/portrait.jpg
+2 FORM jpg
+3 TYPE photo
+2 TITL Front
+1 FILE scans/missing.tif
+2 FORM tif
+0 @O2@ OBJE
+1 FILE https://example.com/census.png
+2 FORM png
+0 @O3@ OBJE
+1 FILE scans/portrait.jpg
+2 FORM jpg
+0 @N1@ NOTE Scanned in 2020
+0 TRLR
+"""
+
+
+@pytest.fixture
+def media_dir(tmp_path: Path) -> Path:
+    (tmp_path / "scans").mkdir()
+    (tmp_path / "scans" / "portrait.jpg").write_bytes(b"\xff\xd8" * 1000)
+    return tmp_path
+
+
+def test_multimedia_files_are_parsed(monkeypatch: pytest.MonkeyPatch) -> None:
+    structure = parse_gedcom(GEDCOM)
+    parsed_tags = []
+
+    def get_parser(tag: str) -> GedcomParser | None:
+        parsed_tags.append(tag)
+        return get_parser_for_tag(tag)
+
+    monkeypatch.setattr("rootsy.references.get_parser_for_tag", get_parser)
+
+    portrait = structure.resolve("@O1@")
+    assert portrait.title == "Family portrait"
+    assert portrait.files == [
+        MultimediaFile(
+            reference="scans/portrait.jpg",
+            format="jpg",
+            media_type="photo",
+            title="Front",
+        ),
+        MultimediaFile(reference="scans/missing.tif", format="tif"),
+    ]
+    assert [xref for xref, _ in media_files(structure)] == [
+        "@O1@",
+        "@O1@",
+        "@O2@",
+        "@O3@",
+    ]
+    # Only the record resolved above is cached, and the note isn't parsed.
+    shared = structure.shared
+    assert [xref for xref in shared if shared.is_resolved(xref)] == ["@O1@"]
+    assert parsed_tags == ["OBJE", "OBJE", "OBJE"]
+
+
+def test_hash_file_reads_in_chunks(media_dir: Path) -> None:
+    path = media_dir / "scans" / "portrait.jpg"
+    expected = hashlib.sha256(path.read_bytes()).hexdigest()
+
+    assert hash_file(path, chunk_size=7) == expected
+
+
+def test_build_manifest(media_dir: Path) -> None:
+    structure = parse_gedcom(GEDCOM)
+
+    portrait, missing, remote, again = build_manifest(
+        structure,
+        media_dir,
+        workers=2,
+    )
+
+    assert portrait.exists
+    assert portrait.size == 2000  # noqa: PLR2004
+    assert portrait.sha256 == hashlib.sha256(b"\xff\xd8" * 1000).hexdigest()
+    assert again == attrs.evolve(portrait, xref="@O3@")
+    assert not missing.exists
+    assert missing.error is None
+    assert remote.path is None
+    assert remote.reference == "https://example.com/census.png"
+
+
+def test_cache_skips_unchanged_files(
+    media_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    structure = parse_gedcom(GEDCOM)
+    cache_file = media_dir / "manifest-cache.json"
+
+    cache = ManifestCache()
+    first = build_manifest(structure, media_dir, cache=cache)
+    cache.save(cache_file)
+
+    hashed = []
+    monkeypatch.setattr(
+        "rootsy.media.hash_file",
+        lambda path, _chunk_size: hashed.append(path) or "changed",
+    )
+    cache = ManifestCache.load(cache_file)
+    assert len(cache) == 1
+    assert build_manifest(structure, media_dir, cache=cache) == first
+    assert hashed == []
+
+    (media_dir / "scans" / "portrait.jpg").write_bytes(b"new scan")
+    [portrait, *_] = build_manifest(structure, media_dir, cache=cache)
+    assert portrait.sha256 == "changed"
+    assert hashed == [media_dir / "scans" / "portrait.jpg"]
@@ -0,0 +1,38 @@
+import pytest
+
+from rootsy.parallel import parse_gedcom_parallel
+from rootsy.parser import parse_gedcom
+
+
+@pytest.fixture(scope="module")
+def large_gedcom() -> bytes:
+    lines = ["0 HEAD", "1 GEDC", "2 VERS 5.5.1"]
+    for i in range(500):
+        lines += [f"0 @I{i}@ INDI", f"1 NAME Person{i} /Doe/", "1 FAMC @F1@"]
+    lines += ["0 @F1@ FAM", *(f"1 CHIL @I{i}@" for i in range(500)), "0 TRLR"]
+    return "\n".join(lines).encode()
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_parallel_parse_matches_serial_parse(large_gedcom: bytes, mode: str) -> None:
+    expected = parse_gedcom(large_gedcom)
+
+    structure = parse_gedcom_parallel(
+        large_gedcom,
+        mode=mode,
+        workers=2,
+        batch_size=64,
+    )
+
+    assert structure.header == expected.header
+    assert structure.individuals == expected.individuals
+    assert list(structure.individuals) == list(expected.individuals)
+    assert structure.families == expected.families
+
+
+def test_parallel_parse_compact(large_gedcom: bytes) -> None:
+    structure = parse_gedcom_parallel(large_gedcom, workers=2, compact=True)
+
+    first, second = structure.individuals["@I0@"], structure.individuals["@I1@"]
+    assert first.families == ("@F1@",)
+    assert first.families[0] is second.families[0]
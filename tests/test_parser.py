@@ -55,3 +55,12 @@ def test_invalid_gedcom_version(tmp_path: str) -> None:
     # Ensure validation fails
     with pytest.raises(UnsupportedGedcomVersionError):
         parse_gedcom(str(test_file))
+
+
+def test_parse_gedcom_from_bytes() -> None:
+    content = b"0 HEAD\n1 GEDC\n2 VERS 7.0\n0 @I1@ INDI\n1 NAME Jane /Doe/\n0 TRLR\n"
+
+    parsed_structure = parse_gedcom(content)
+
+    assert parsed_structure.header.version == "7.0"
+    assert parsed_structure.individuals["@I1@"].name == "Jane /Doe/"
@@ -0,0 +1,70 @@
+from rootsy.places import PlaceIndex, PlaceTable, split_place
+
+
+def test_split_place_normalises_jurisdictions() -> None:
+    assert split_place(" Springfield ,  Sangamon County, , USA ") == [
+        "USA",
+        "Sangamon County",
+        "Springfield",
+    ]
+
+
+class TestPlaceTable:
+    def test_intern_shares_common_jurisdictions(self) -> None:
+        table = PlaceTable()
+
+        springfield = table.intern("Springfield, Sangamon, Illinois, USA")
+        chicago = table.intern("Chicago, Cook, Illinois, USA")
+
+        assert len(table) == 6  # noqa: PLR2004
+        assert table[springfield].name == "Springfield"
+        assert table[springfield].level == 3  # noqa: PLR2004
+        illinois = table.find("illinois, usa")
+        assert table[table[springfield].parent_id].parent_id == illinois
+        assert table[table[chicago].parent_id].parent_id == illinois
+
+    def test_intern_is_case_insensitive_and_keeps_first_spelling(self) -> None:
+        table = PlaceTable()
+
+        first = table.intern("London, England")
+        second = table.intern("LONDON,england")
+
+        assert first == second
+        assert table.full_name(first) == "London, England"
+
+    def test_intern_empty_value(self) -> None:
+        table = PlaceTable()
+
+        assert table.intern(None) is None
+        assert table.intern(" , ") is None
+        assert table.find("Nowhere") is None
+
+    def test_text_cache_is_bounded(self) -> None:
+        table = PlaceTable()
+        table.TEXT_CACHE_SIZE = 2
+
+        ids = [table.intern(f"Town {number}, England") for number in range(3)]
+
+        assert len(table._by_text) == table.TEXT_CACHE_SIZE  # noqa: SLF001
+        assert table.intern("Town 0, England") == ids[0]
+
+
+def test_place_index_finds_items_under_a_place() -> None:
+    table = PlaceTable()
+    index = PlaceIndex[str](table)
+    index.update(
+        [
+            (table.intern("Springfield, Illinois, USA"), "birth of I1"),
+            (table.intern("Chicago, Illinois, USA"), "death of I1"),
+            (table.intern("London, England"), "birth of I2"),
+            (table.intern("Illinois, USA"), "residence of I2"),
+        ],
+    )
+
+    illinois = table.find("Illinois, USA")
+    assert sorted(index.under(illinois)) == [
+        "birth of I1",
+        "death of I1",
+        "residence of I2",
+    ]
+    assert index.at(illinois) == ["residence of I2"]
@@ -0,0 +1,75 @@
+import bz2
+
+import pytest
+
+from rootsy.models import UnsupportedGedcomVersionError
+from rootsy.probe import NotGedcomError, probe
+
+GEDCOM = b"""0 HEAD
+1 SOUR FamilyApp
+2 VERS 3.1
+2 NAME Family App
+1 GEDC
+2 VERS 5.5.1
+2 FORM LINEAGE-LINKED
+1 CHAR ANSEL
+0 @I1@ INDI
+1 NAME John /Doe/
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Jane /Roe/
+  0 @I3@ INDI
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+0 @S1@ SOUR
+1 TITL Census
+0 @R1@ REPO
+0 TRLR
+"""
+
+
+def test_probe_reads_the_header_and_counts_records() -> None:
+    result = probe(GEDCOM)
+
+    assert result.version == "5.5.1"
+    assert result.charset == "ANSEL"
+    assert result.source_system == "FamilyApp"
+    assert result.records == {
+        "HEAD": 1,
+        "INDI": 3,
+        "FAM": 1,
+        "SOUR": 1,
+        "REPO": 1,
+        "TRLR": 1,
+    }
+    assert (result.individuals, result.families, result.sources) == (3, 1, 1)
+    assert result.size == len(GEDCOM)
+
+
+def test_probe_scans_across_blocks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("rootsy.reader.GedcomReader.BUFFER_SIZE", 16)
+
+    assert probe(bz2.compress(GEDCOM)).records == probe(GEDCOM).records
+
+
+def test_probe_decodes_utf16_before_scanning() -> None:
+    result = probe(GEDCOM.replace(b"ANSEL", b"UNICODE").decode().encode("utf-16"))
+
+    assert result.codec == "utf-16"
+    assert result.charset == "UNICODE"
+    assert result.individuals == 3  # noqa: PLR2004
+
+
+def test_probe_validates_the_version() -> None:
+    with pytest.raises(UnsupportedGedcomVersionError):
+        probe(GEDCOM.replace(b"5.5.1", b"4.0"))
+
+
+def test_probe_needs_a_header() -> None:
+    with pytest.raises(NotGedcomError):
+        probe(b"0 @I1@ INDI\n0 TRLR\n")
+    with pytest.raises(NotGedcomError):
+        probe(b"")
+    with pytest.raises(NotGedcomError, match=r"GEDC\.VERS"):
+        probe(b"0 HEAD\n1 SOUR X\n0 TRLR\n")
@@ -0,0 +1,62 @@
+from rootsy.parser import parse_gedcom
+from rootsy.projection import Projection
+from rootsy.reader import GedcomReader
+
+GEDCOM = b"""0 HEAD
+1 GEDC
+2 VERS 5.5.1
+0 @I1@ INDI
+1 NAME John /Doe/
+2 GIVN John
+1 SEX M
+1 BIRT
+2 DATE 1 JAN 1970
+1 FAMC @F1@
+0 @S1@ SOUR
+1 TITL Parish register
+0 @F1@ FAM
+1 CHIL @I1@
+0 @N1@ NOTE A long
+1 CONT note
+0 TRLR
+"""
+
+
+def _tags(projection: Projection) -> list[list[str]]:
+    reader = GedcomReader(GEDCOM, projection=projection)
+    return [[line.tag for line in group] for group in reader.line_groups()]
+
+
+def test_projection_keeps_only_selected_records() -> None:
+    assert _tags(Projection(records={"INDI", "NOTE"})) == [
+        ["HEAD", "GEDC", "VERS"],
+        ["INDI", "NAME", "GIVN", "SEX", "BIRT", "DATE", "FAMC"],
+        ["NOTE"],
+        ["TRLR"],
+    ]
+
+
+def test_projection_keeps_only_selected_fields() -> None:
+    projection = Projection(
+        records={"INDI", "FAM"},
+        tags={"INDI": {"NAME", "FAMC"}},
+    )
+
+    assert _tags(projection) == [
+        ["HEAD", "GEDC", "VERS"],
+        ["INDI", "NAME", "GIVN", "FAMC"],
+        ["FAM", "CHIL"],
+        ["TRLR"],
+    ]
+
+
+def test_parse_gedcom_with_projection() -> None:
+    projection = Projection(records={"INDI"}, tags={"INDI": {"NAME", "FAMC"}})
+
+    structure = parse_gedcom(GEDCOM, projection=projection)
+
+    assert structure.families == {}
+    individual = structure.individuals["@I1@"]
+    assert individual.name == "John /Doe/"
+    assert individual.families == ["@F1@"]
+    assert individual.sex is None
@@ -0,0 +1,136 @@
+import pytest
+
+from rootsy.models import EventType, Individual
+from rootsy.parser import parse_gedcom
+from rootsy.query import (
+    Born,
+    ChildOf,
+    Died,
+    EventDate,
+    EventPlace,
+    InFamily,
+    Name,
+    ParentOf,
+    Plan,
+    Predicate,
+    Sex,
+    SpouseOf,
+    StructureIndex,
+    Surname,
+    Where,
+    select,
+)
+
+GEDCOM = b"""0 HEAD
+1 GEDC
+2 VERS 5.5.1
+0 @I1@ INDI
+1 NAME John /Doe/
+1 SEX M
+1 BIRT
+2 DATE 1 JAN 1850
+2 PLAC Springfield, Sangamon, Illinois, USA
+1 DEAT
+2 DATE 1910
+0 @I2@ INDI
+1 NAME Mary /Roe/
+1 SEX F
+1 BIRT
+2 DATE ABT 1855
+2 PLAC Dublin, Ireland
+0 @I3@ INDI
+1 NAME James /Doe/
+1 SEX M
+1 BIRT
+2 DATE 3 MAR 1880
+2 PLAC Chicago, Cook, Illinois, USA
+0 @I4@ INDI
+1 NAME Anne /Doe/
+1 SEX F
+1 BIRT
+2 DATE 1884
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+1 CHIL @I4@
+1 MARR
+2 DATE 1878
+2 PLAC Chicago, Cook, Illinois, USA
+0 TRLR
+"""
+
+
+@pytest.fixture(scope="module")
+def index() -> StructureIndex:
+    return StructureIndex(parse_gedcom(GEDCOM))
+
+
+def _ids(index: StructureIndex, predicate: Predicate) -> list[str]:
+    return [individual.id for individual in select(index, predicate)]
+
+
+@pytest.mark.parametrize(
+    ("predicate", "expected"),
+    [
+        (Surname("doe"), ["@I1@", "@I3@", "@I4@"]),
+        (Sex("f"), ["@I2@", "@I4@"]),
+        (Born(1850, 1860), ["@I1@", "@I2@"]),
+        (Born(start_year=1880), ["@I3@", "@I4@"]),
+        (Died(end_year=1950), ["@I1@"]),
+        (EventDate(EventType.MARRIAGE, 1870, 1879), ["@I1@", "@I2@"]),
+        (EventPlace("Illinois, USA"), ["@I1@", "@I2@", "@I3@"]),
+        (EventPlace("illinois, usa", EventType.BIRTH), ["@I1@", "@I3@"]),
+        (EventPlace("Paris, France"), []),
+        (ChildOf("@I2@"), ["@I3@", "@I4@"]),
+        (ParentOf("@I4@"), ["@I1@", "@I2@"]),
+        (SpouseOf("@I1@"), ["@I2@"]),
+        (InFamily("@F1@"), ["@I1@", "@I2@", "@I3@", "@I4@"]),
+        (Name("ann"), ["@I4@"]),
+        (Surname("Doe") & Sex("M") & Born(1870), ["@I3@"]),
+        (Surname("Roe") | Born(1884, 1884), ["@I2@", "@I4@"]),
+        (~Surname("Doe"), ["@I2@"]),
+        (ChildOf("@I1@") & ~Name("James"), ["@I4@"]),
+    ],
+)
+def test_select(
+    index: StructureIndex, predicate: Predicate, expected: list[str]
+) -> None:
+    assert _ids(index, predicate) == expected
+
+
+def test_planner_uses_indexes_before_scanning(index: StructureIndex) -> None:
+    checked = []
+
+    def spy(individual: Individual) -> bool:
+        checked.append(individual.id)
+        return True
+
+    plan = Plan.build(Surname("Doe") & Where(spy) & Sex("F"), index)
+    assert plan.candidates == {"@I4@"}
+
+    assert [individual.id for individual in plan.run(index)] == ["@I4@"]
+    # Only the indexed candidate was checked by the unindexed predicate.
+    assert checked == ["@I4@"]
+
+
+def test_predicates_must_check_individuals(index: StructureIndex) -> None:
+    class Indexed(Predicate):
+        def lookup(self, index: StructureIndex) -> set[str]:  # noqa: ARG002
+            return set()
+
+    with pytest.raises(TypeError, match="matches"):
+        Indexed()
+
+    # Indexed predicates check individuals against their index.
+    individuals = index.structure.individuals
+    assert Surname("Doe").matches(individuals["@I1@"], index)
+    assert not Surname("Doe").matches(individuals["@I2@"], index)
+
+
+def test_unindexed_query_scans_lazily(index: StructureIndex) -> None:
+    plan = Plan.build(Name("Doe"), index)
+    assert plan.candidates is None
+
+    results = select(index, Name("Doe"))
+    assert next(results).id == "@I1@"
@@ -0,0 +1,205 @@
+import bz2
+import gzip
+import io
+import lzma
+import zipfile
+from collections.abc import Buffer, Callable
+from pathlib import Path
+
+import pytest
+
+from rootsy.reader import GEDZIP_MEMBER, GedcomReader
+
+SAMPLE_GEDCOM = """0 HEAD
+1 CHAR {charset}
+0 @I1@ INDI
+1 NAME {name}
+0 TRLR
+"""
+
+
+def _names(reader: GedcomReader) -> list[str]:
+    return [
+        line.value
+        for group in reader.line_groups()
+        for line in group
+        if line.tag == "NAME"
+    ]
+
+
+@pytest.mark.parametrize(
+    ("charset", "encoding"),
+    [
+        ("UTF-8", "utf-8-sig"),
+        ("UNICODE", "utf-16"),
+        ("ANSI", "cp1252"),
+    ],
+)
+def test_reader_detects_encoding(
+    tmp_path: Path,
+    charset: str,
+    encoding: str,
+) -> None:
+    path = tmp_path / "sample.ged"
+    path.write_bytes(
+        SAMPLE_GEDCOM.format(charset=charset, name="José /Núñez/").encode(encoding),
+    )
+
+    reader = GedcomReader(path)
+
+    assert _names(reader) == ["José /Núñez/"]
+    assert reader.encoding == encoding
+
+
+def test_reader_decodes_ansel(tmp_path: Path) -> None:
+    path = tmp_path / "ansel.ged"
+    content = SAMPLE_GEDCOM.format(charset="ANSEL", name="Jos\xe2e /N\xe2u\xe4nez/")
+    path.write_bytes(content.encode("latin-1"))
+
+    reader = GedcomReader(path)
+
+    assert _names(reader) == ["José /Núñez/"]
+    assert reader.encoding == "ansel"
+
+
+def test_reader_explicit_encoding_overrides_detection(tmp_path: Path) -> None:
+    path = tmp_path / "latin1.ged"
+    path.write_bytes(
+        SAMPLE_GEDCOM.format(charset="UTF-8", name="Zoë /Ågren/").encode("latin-1"),
+    )
+
+    reader = GedcomReader(path, encoding="latin-1")
+
+    assert _names(reader) == ["Zoë /Ågren/"]
+
+
+NOTE_GEDCOM = """0 HEAD
+0 @N1@ NOTE First line
+1 CONT Second li
+1 CONC ne
+1 CONT
+1 CONT Fourth line
+1 SOUR @S1@
+2 PAGE 12
+0 TRLR
+"""
+
+
+def test_reader_merges_continuations(tmp_path: Path) -> None:
+    path = tmp_path / "note.ged"
+    path.write_text(NOTE_GEDCOM)
+
+    _, note, _ = GedcomReader(path).line_groups()
+
+    assert [line.tag for line in note] == ["NOTE", "SOUR", "PAGE"]
+    assert note[0].value == "First line\nSecond line\n\nFourth line"
+    assert note[0].xref == "@N1@"
+
+
+def test_reader_keeps_spaces_around_continuations(tmp_path: Path) -> None:
+    path = tmp_path / "note.ged"
+    path.write_text(
+        "0 HEAD\n"
+        "0 @N1@ NOTE This is a long \n"
+        "1 CONC note with  spaces \n"
+        "1 CONC   tail\n"
+        "1 CONT    indented line\n"
+        "0 @I1@ INDI\n"
+        "1 NAME  John /Smith/ \n"
+        "0 TRLR\n",
+    )
+
+    _, note, person, _ = GedcomReader(path).line_groups()
+
+    assert note[0].value == "This is a long note with  spaces   tail\n   indented line"
+    assert person[1].value == "John /Smith/"
+
+
+def test_reader_keeps_continuations_when_disabled(tmp_path: Path) -> None:
+    path = tmp_path / "note.ged"
+    path.write_text(NOTE_GEDCOM)
+
+    _, note, _ = GedcomReader(path, merge_continuations=False).line_groups()
+
+    assert [line.tag for line in note][:5] == ["NOTE", "CONT", "CONC", "CONT", "CONT"]
+
+
+@pytest.mark.parametrize(
+    ("suffix", "compress"),
+    [
+        (".ged.gz", gzip.compress),
+        (".ged.bz2", bz2.compress),
+        (".ged.xz", lzma.compress),
+    ],
+)
+def test_reader_streams_compressed_files(
+    tmp_path: Path,
+    suffix: str,
+    compress: Callable[[bytes], bytes],
+) -> None:
+    path = tmp_path / f"sample{suffix}"
+    content = SAMPLE_GEDCOM.format(charset="UNICODE", name="José /Núñez/")
+    path.write_bytes(compress(content.encode("utf-16")))
+
+    reader = GedcomReader(path)
+
+    assert _names(reader) == ["José /Núñez/"]
+    assert reader.encoding == "utf-16"
+
+
+def test_reader_streams_gedzip_archives(tmp_path: Path) -> None:
+    path = tmp_path / "sample.gdz"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            GEDZIP_MEMBER,
+            SAMPLE_GEDCOM.format(charset="UTF-8", name="José /Núñez/"),
+        )
+        archive.writestr("photos/portrait.jpg", b"\xff\xd8\xff")
+
+    assert _names(GedcomReader(path)) == ["José /Núñez/"]
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_reader_parses_in_memory_payloads(wrap: Callable[[bytes], Buffer]) -> None:
+    content = SAMPLE_GEDCOM.format(charset="UTF-8", name="José /Núñez/").encode()
+
+    reader = GedcomReader(wrap(content))
+
+    assert _names(reader) == ["José /Núñez/"]
+
+
+def test_reader_parses_compressed_payload() -> None:
+    content = SAMPLE_GEDCOM.format(charset="UTF-8", name="José /Núñez/").encode()
+
+    assert _names(GedcomReader(gzip.compress(content))) == ["José /Núñez/"]
+
+
+def test_reader_parses_file_objects_and_leaves_them_open() -> None:
+    content = SAMPLE_GEDCOM.format(charset="UTF-8", name="José /Núñez/").encode()
+    file = io.BytesIO(b"skipped" + content)
+    file.seek(len(b"skipped"))
+
+    reader = GedcomReader(file)
+
+    assert _names(reader) == ["José /Núñez/"]
+    # Seekable file objects can be read again.
+    assert _names(reader) == ["José /Núñez/"]
+    assert not file.closed
+
+
+def test_reader_parses_objects_with_only_a_read_method() -> None:
+    content = SAMPLE_GEDCOM.format(charset="UTF-8", name="José /Núñez/").encode()
+
+    class Pipe:
+        def __init__(self) -> None:
+            self._file = io.BytesIO(content)
+
+        def read(self, size: int = -1) -> bytes:
+            return self._file.read(size)
+
+    assert _names(GedcomReader(Pipe())) == ["José /Núñez/"]
+
+
+def test_reader_rejects_unsupported_sources() -> None:
+    with pytest.raises(TypeError, match="Unsupported GEDCOM source: int"):
+        GedcomReader(42)
@@ -0,0 +1,136 @@
+from rootsy.models import Citation, Multimedia, MultimediaFile, Note, Source
+from rootsy.parallel import parse_gedcom_parallel
+from rootsy.parser import parse_gedcom
+
+GEDCOM = b"""0 HEAD
+1 GEDC
+2 VERS 5.5.1
+1 SOUR MyGenealogyApp
+2 VERS 2.1
+0 @I1@ INDI
+1 NAME John /Doe/
+1 SOUR @S1@
+2 PAGE Folio 12
+1 NOTE @N1@
+1 OBJE @O1@
+0 @I2@ INDI
+1 NAME Jane /Doe/
+1 SOUR @S1@
+2 PAGE Folio 12
+0 @F1@ FAM
+1 HUSB @I1@
+1 SOUR @S1@
+0 @S1@ SOUR
+1 TITL Parish register of St Mary
+1 AUTH Rev. Smith
+1 REPO @R1@
+0 @N1@ NOTE Emigrated in 1850
+1 CONT and settled in Ohio.
+0 @O1@ OBJE
+1 TITL Portrait
+1 FILE portrait.jpg
+2 FORM jpg
+0 TRLR
+"""
+
+
+def test_citations_are_stored_as_references() -> None:
+    structure = parse_gedcom(GEDCOM)
+
+    assert structure.individuals["@I1@"].citations == [
+        Citation(tag="SOUR", xref="@S1@", page="Folio 12"),
+        Citation(tag="NOTE", xref="@N1@"),
+        Citation(tag="OBJE", xref="@O1@"),
+    ]
+    assert structure.families["@F1@"].citations == [
+        Citation(tag="SOUR", xref="@S1@"),
+    ]
+    # The header source isn't mistaken for a source record.
+    assert structure.header.source.system_id == "MyGenealogyApp"
+
+
+def test_shared_records_are_parsed_on_first_resolution() -> None:
+    structure = parse_gedcom(GEDCOM)
+    citation = structure.individuals["@I1@"].citations[0]
+
+    assert list(structure.shared) == ["@S1@", "@N1@", "@O1@"]
+    assert not structure.shared.is_resolved("@S1@")
+
+    source = structure.resolve(citation)
+    assert source == Source(
+        id="@S1@",
+        title="Parish register of St Mary",
+        author="Rev. Smith",
+        repositories=["@R1@"],
+    )
+    assert structure.shared.is_resolved("@S1@")
+    assert not structure.shared.is_resolved("@N1@")
+    # Resolving again returns the cached record.
+    assert structure.resolve("@S1@") is source
+
+    assert structure.resolve("@N1@") == Note(
+        id="@N1@",
+        text="Emigrated in 1850\nand settled in Ohio.",
+    )
+    assert structure.resolve("@O1@") == Multimedia(
+        id="@O1@",
+        title="Portrait",
+        files=[MultimediaFile(reference="portrait.jpg", format="jpg")],
+    )
+    assert structure.resolve("@S9@") is None
+
+
+def test_resolved_records_release_their_lines() -> None:
+    structure = parse_gedcom(GEDCOM)
+
+    source = structure.resolve("@S1@")
+
+    assert structure.shared._deferred["@S1@"].lines == ()  # noqa: SLF001
+    assert structure.resolve("@S1@") is source
+    assert structure.shared._deferred["@N1@"].lines  # noqa: SLF001
+
+
+def test_page_only_refines_citations() -> None:
+    source = GEDCOM.replace(
+        b"1 NAME Jane /Doe/\n",
+        b"1 NAME Jane /Doe/\n1 SOUR Family bible\n2 PAGE 3\n",
+    )
+
+    structure = parse_gedcom(source)
+
+    assert structure.individuals["@I2@"].citations == [
+        Citation(tag="SOUR", xref="@S1@", page="Folio 12"),
+    ]
+
+
+def test_event_citations() -> None:
+    source = GEDCOM.replace(
+        b"1 NAME John /Doe/\n",
+        b"1 NAME John /Doe/\n1 BIRT\n2 SOUR @S1@\n3 PAGE Entry 4\n2 NOTE @N1@\n",
+    )
+
+    for structure in parse_gedcom(source), parse_gedcom(source, compact=True):
+        (birth,) = structure.individuals["@I1@"].events
+        assert list(birth.citations) == [
+            Citation(tag="SOUR", xref="@S1@", page="Entry 4"),
+            Citation(tag="NOTE", xref="@N1@"),
+        ]
+        assert structure.resolve(birth.citations[0]).title == (
+            "Parish register of St Mary"
+        )
+    assert len(structure.individuals["@I1@"].citations) == 3  # noqa: PLR2004
+
+
+def test_compact_parse_shares_equal_citations() -> None:
+    structure = parse_gedcom(GEDCOM, compact=True)
+
+    first = structure.individuals["@I1@"].citations[0]
+    second = structure.individuals["@I2@"].citations[0]
+    assert first is second
+
+
+def test_parallel_parse_defers_shared_records() -> None:
+    structure = parse_gedcom_parallel(GEDCOM, workers=2, batch_size=2)
+
+    assert len(structure.shared) == 3  # noqa: PLR2004
+    assert structure.resolve("@S1@").title == "Parish register of St Mary"
@@ -0,0 +1,146 @@
+import subprocess
+import sys
+import textwrap
+from collections.abc import Iterator
+from importlib.metadata import EntryPoint
+from pathlib import Path
+
+import pytest
+
+from rootsy import registry
+from rootsy.models import ExtensionRecord
+from rootsy.parser import parse_gedcom
+from rootsy.parsers.address import AddressParser
+from rootsy.parsers.extension import ExtensionParser
+from rootsy.registry import ENTRY_POINT_GROUP, ParserRegistry, get_parser_for_tag
+
+GEDCOM = b"""0 HEAD
+1 GEDC
+2 VERS 7.0
+1 SCHMA
+2 TAG _MILT https://example.com/milt
+0 @I1@ INDI
+1 NAME John /Doe/
+0 @X1@ _MILT Navy
+1 _RANK Captain
+2 DATE 1944
+0 TRLR
+"""
+
+
+@pytest.fixture
+def fresh_registry() -> Iterator[None]:
+    registry.get_registry.cache_clear()
+    yield
+    registry.get_registry.cache_clear()
+
+
+def test_lazy_parser_is_loaded_on_first_lookup() -> None:
+    parsers = ParserRegistry()
+    parsers.register_lazy("ADDR", "rootsy.parsers.address:AddressParser")
+
+    assert parsers.get_parser_class("ADDR") is AddressParser
+    assert parsers.get_parser_class("NOTE") is None
+
+
+def test_schema_uri_takes_precedence_for_extension_tags() -> None:
+    parsers = ParserRegistry()
+    parsers.register_lazy(
+        "https://example.com/addr", AddressParser.__module__ + ":AddressParser"
+    )
+
+    assert parsers.get_parser_class("_ADDR", {"_ADDR": "https://example.com/addr"}) is (
+        AddressParser
+    )
+    assert parsers.get_parser_class("_ADDR") is None
+
+
+def test_unknown_extension_tags_fall_back_to_extension_parser() -> None:
+    parser = get_parser_for_tag("_MILT", {"_MILT": "https://example.com/milt"})
+
+    assert parser == ExtensionParser(uri="https://example.com/milt")
+    assert get_parser_for_tag("SUBM") is None
+
+
+@pytest.mark.usefixtures("fresh_registry")
+def test_plugins_are_registered_from_entry_points(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    entry_point = EntryPoint(
+        name="_HOME",
+        value="rootsy.parsers.address:AddressParser",
+        group=ENTRY_POINT_GROUP,
+    )
+    monkeypatch.setattr(registry, "_plugin_entry_points", lambda: [entry_point])
+
+    assert isinstance(get_parser_for_tag("_HOME"), AddressParser)
+
+
+@pytest.mark.usefixtures("fresh_registry")
+def test_extension_records_are_kept() -> None:
+    structure = parse_gedcom(GEDCOM)
+
+    assert structure.header.schema == {"_MILT": "https://example.com/milt"}
+    [extension] = structure.extensions
+    assert isinstance(extension, ExtensionRecord)
+    assert extension.extension_tag == "_MILT"
+    assert extension.xref == "@X1@"
+    assert extension.value == "Navy"
+    assert extension.uri == "https://example.com/milt"
+    assert [line.tag for line in extension.substructures] == ["_RANK", "DATE"]
+
+
+def test_extension_substructures_of_records_are_kept() -> None:
+    source = GEDCOM.replace(
+        b"1 NAME John /Doe/\n",
+        b"1 _MILT Army\n2 DATE 1916\n1 NAME John /Doe/\n",
+    )
+
+    individual = parse_gedcom(source).individuals["@I1@"]
+
+    assert individual.name == "John /Doe/"
+    [extension] = individual.extensions
+    assert extension.extension_tag == "_MILT"
+    assert extension.value == "Army"
+    assert [line.tag for line in extension.substructures] == ["DATE"]
+    # The tag is declared in HEAD.SCHMA, which applies to nested tags too.
+    assert extension.uri == "https://example.com/milt"
+
+
+@pytest.mark.usefixtures("fresh_registry")
+def test_nested_extensions_use_plugins_registered_by_uri(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    entry_point = EntryPoint(
+        name="https://example.com/milt",
+        value="rootsy.parsers.address:AddressParser",
+        group=ENTRY_POINT_GROUP,
+    )
+    monkeypatch.setattr(registry, "_plugin_entry_points", lambda: [entry_point])
+    source = GEDCOM.replace(
+        b"1 NAME John /Doe/\n",
+        b"1 NAME John /Doe/\n1 _MILT\n2 CITY Portsmouth\n",
+    )
+
+    [extension] = parse_gedcom(source).individuals["@I1@"].extensions
+
+    assert extension.city == "Portsmouth"
+
+
+def test_parsers_are_imported_on_demand(tmp_path: Path) -> None:
+    path = tmp_path / "tree.ged"
+    path.write_bytes(GEDCOM)
+    script = textwrap.dedent(f"""
+        import sys
+        import rootsy.parser
+
+        assert not any(name.startswith("rootsy.parsers.") for name in sys.modules)
+        # Plugin discovery waits for the first parse.
+        assert "importlib.metadata" not in sys.modules
+        rootsy.parser.parse_gedcom({str(path)!r})
+        assert "rootsy.parsers.individual" in sys.modules
+        assert "rootsy.parsers.multimedia" not in sys.modules
+        assert "rootsy.parsers.family" not in sys.modules
+    """)
+
+    subprocess.run([sys.executable, "-c", script], check=True)  # noqa: S603
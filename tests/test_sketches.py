@@ -0,0 +1,61 @@
+import pytest
+
+from rootsy.sketches import CountMinSketch, HyperLogLog
+
+
+def test_count_min_sketch_never_undercounts() -> None:
+    sketch = CountMinSketch(width=64, depth=4)
+    counts = {f"name{i}": i % 7 + 1 for i in range(200)}
+    for item, count in counts.items():
+        sketch.add(item, count)
+
+    assert sketch.total == sum(counts.values())
+    assert all(sketch.estimate(item) >= count for item, count in counts.items())
+
+
+def test_count_min_sketch_merge_equals_sketch_of_both() -> None:
+    left, right, both = CountMinSketch(), CountMinSketch(), CountMinSketch()
+    for item in ("Smith", "Doe", "Smith"):
+        left.add(item)
+        both.add(item)
+    for item in ("Smith", "Roe"):
+        right.add(item)
+        both.add(item)
+
+    merged = left.merge(right)
+
+    assert merged.total == both.total == 5  # noqa: PLR2004
+    assert [merged.estimate(item) for item in ("Smith", "Doe", "Roe")] == [3, 1, 1]
+    assert left.estimate("Smith") == 2  # noqa: PLR2004
+
+
+def test_count_min_sketch_merge_checks_dimensions() -> None:
+    with pytest.raises(ValueError, match="dimensions"):
+        CountMinSketch(width=16).merge(CountMinSketch(width=32))
+
+
+def test_hyperloglog_estimates_distinct_items() -> None:
+    sketch = HyperLogLog()
+    for i in range(20_000):
+        sketch.add(f"surname{i % 10_000}")
+
+    assert sketch.count() == pytest.approx(10_000, rel=0.05)
+
+
+def test_hyperloglog_is_exact_enough_for_few_items() -> None:
+    sketch = HyperLogLog()
+    for item in ("Smith", "Doe", "Roe", "Doe"):
+        sketch.add(item)
+
+    assert sketch.count() == 3  # noqa: PLR2004
+
+
+def test_hyperloglog_merge() -> None:
+    left, right = HyperLogLog(), HyperLogLog()
+    for i in range(5000):
+        left.add(f"a{i}")
+        right.add(f"a{i + 2500}")
+
+    assert left.merge(right).count() == pytest.approx(7500, rel=0.05)
+    with pytest.raises(ValueError, match="precision"):
+        left.merge(HyperLogLog(precision=10))
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+from rootsy.models import Family, GedcomStructure, Header, Individual
+from rootsy.validation import (
+    IssueKind,
+    LinkIndex,
+    check_links,
+    validate_gedcom,
+    validate_structure,
+)
+
+VALID_GEDCOM = """0 HEAD
+1 GEDC
+2 VERS 5.5.1
+0 @I1@ INDI
+1 FAMS @F1@
+0 @I2@ INDI
+1 FAMS @F1@
+0 @I3@ INDI
+1 FAMC @F1@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+0 TRLR"""
+
+BROKEN_GEDCOM = """0 HEAD
+0 @I1@ INDI
+1 FAMS @F1@
+1 FAMC @F2@
+0 @I2@ INDI
+1 FAMC @F1@
+0 @I2@ INDI
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I9@
+1 CHIL @I2@
+0 @F2@ FAM
+1 HUSB @I2@
+1 CHIL @I1@
+0 TRLR"""
+
+
+def _kinds(issues: list) -> list[tuple[IssueKind, str, str | None]]:
+    return sorted(
+        ((issue.kind, issue.xref, issue.target) for issue in issues),
+        key=lambda kind: (kind[0].value, kind[1], kind[2] or ""),
+    )
+
+
+def test_valid_file_has_no_issues(tmp_path: Path) -> None:
+    path = tmp_path / "valid.ged"
+    path.write_text(VALID_GEDCOM)
+
+    assert validate_gedcom(path) == []
+
+
+def test_broken_file_reports_issues(tmp_path: Path) -> None:
+    path = tmp_path / "broken.ged"
+    path.write_text(BROKEN_GEDCOM)
+
+    assert _kinds(validate_gedcom(path)) == [
+        (IssueKind.DANGLING_XREF, "@F1@", "@I9@"),
+        (IssueKind.NON_RECIPROCAL_LINK, "@F2@", "@I2@"),
+        (IssueKind.DUPLICATE_XREF, "@I2@", None),
+        (IssueKind.ANCESTRY_CYCLE, "@I2@", None),
+    ]
+
+
+def test_merged_shards_detect_duplicates() -> None:
+    first = LinkIndex()
+    first.add_record("@I1@", "INDI")
+    second = LinkIndex()
+    second.add_record("@I1@", "INDI")
+
+    issues = check_links(first.merge(second))
+
+    assert _kinds(issues) == [(IssueKind.DUPLICATE_XREF, "@I1@", None)]
+
+
+def test_validate_structure() -> None:
+    structure = GedcomStructure(header=Header(version="7.0"))
+    structure.add_individual(Individual(id="@I1@", families=["@F1@"]))
+    structure.add_family(Family(id="@F1@", husband="@I2@"))
+
+    assert _kinds(validate_structure(structure)) == [
+        (IssueKind.DANGLING_XREF, "@F1@", "@I2@"),
+        (IssueKind.NON_RECIPROCAL_LINK, "@I1@", "@F1@"),
+    ]